@@ -4,3 +4,22 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.contrib.auth.models import Group, User
+        from accounts.change_history import connect_change_history
+        from accounts.dashboard_stats import connect_dashboard_stats
+        from accounts.permissions import connect_permission_versions
+        from utilities.cache_versions import track_model_versions
+
+        # Cached counts and lists are keyed on these versions
+        track_model_versions(User, Group)
+
+        # Keep the dashboard counters row in step with writes
+        connect_dashboard_stats()
+
+        # Record field-level changes for the object history pages
+        connect_change_history()
+
+        # Cached permission sets and sidebar menus are keyed on this version
+        connect_permission_versions()
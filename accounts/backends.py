@@ -0,0 +1,37 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from accounts.permissions import PERMISSIONS_CACHE_TIMEOUT, get_permissions_version
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend that keeps each user's resolved permission set in the shared
+    cache, so has_perm costs no queries after the first request. Entries are
+    keyed on the permissions version from accounts.permissions, which is
+    bumped whenever group membership or granted permissions change.
+    """
+
+    def get_permission_cache_key(self, user_obj):
+        # Superusers get every permission, so the flag is part of the key
+        role = "superuser" if user_obj.is_superuser else "user"
+        return f"user_perms:{user_obj.pk}:{role}:{get_permissions_version()}"
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            key = self.get_permission_cache_key(user_obj)
+            permissions = cache.get(key)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                cache.set(key, permissions, PERMISSIONS_CACHE_TIMEOUT)
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
+
+    async def aget_all_permissions(self, user_obj, obj=None):
+        # ModelBackend's async variant queries every time, go through the cache
+        if hasattr(user_obj, "_perm_cache") and obj is None:
+            return user_obj._perm_cache
+        return await sync_to_async(self.get_all_permissions)(user_obj, obj)
@@ -0,0 +1,285 @@
+"""
+Field-level change history.
+
+Saves and deletes of tracked models (every BaseModel subclass and
+auth.User) are diffed against utilities.models.loaded_values(), the values
+the instance was loaded with, so capturing a change costs no query (one for
+auth.User, which is read back before the save). BaseQuerySet.bulk_update
+reports its changes through utilities.models.post_bulk_update; the bulk
+toggle and the enrollment CSV import call record_changes for their
+QuerySet.update and bulk_create upserts. Nothing is written during the
+request: once the transaction commits, the records are handed to the
+process-wide HistoryWriter, whose background thread stores them with one
+bulk_create every CHANGE_HISTORY_BATCH_SIZE records or
+CHANGE_HISTORY_FLUSH_INTERVAL milliseconds, whichever comes first. Pending
+records are flushed when the process exits.
+
+Other writes that bypass both paths (QuerySet.update, bulk_create, raw SQL)
+are not recorded.
+"""
+import atexit
+import logging
+import os
+import threading
+from functools import cache, partial
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from accounts.models import ChangeHistory
+from utilities.models import (
+    BaseModel,
+    current_user,
+    loaded_values,
+    post_bulk_update,
+    track_loaded_values,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bookkeeping and secrets, never recorded
+IGNORED_FIELDS = {
+    "id", "created_at", "created_by", "updated_at", "updated_by", "password", "last_login",
+}
+
+def tracked_models():
+    """Every model whose changes are recorded"""
+    models = [model for model in apps.get_models() if issubclass(model, BaseModel)]
+    return [*models, apps.get_model("auth.User")]
+
+
+@cache
+def _tracked_fields(model):
+    """(name, attname) of the recorded fields of a model"""
+    return [
+        (field.name, field.attname)
+        for field in model._meta.concrete_fields
+        if field.name not in IGNORED_FIELDS
+    ]
+
+
+def _values(instance):
+    """Recorded field values of an instance; deferred fields are left out"""
+    loaded = instance.__dict__
+    return {
+        name: loaded[attname]
+        for name, attname in _tracked_fields(type(instance))
+        if attname in loaded
+    }
+
+
+def _stored_values(instance):
+    """Recorded field values of an instance as stored; unknown fields are left out"""
+    stored = loaded_values(instance)
+    return {
+        name: stored[attname]
+        for name, attname in _tracked_fields(type(instance))
+        if attname in stored
+    }
+
+
+def _diff(old, new):
+    """{name: [old, new]} of the values that changed"""
+    return {
+        name: [old[name], value]
+        for name, value in new.items()
+        if name in old and old[name] != value
+    }
+
+
+def _record(model, pk, action, changes):
+    user = current_user()
+    return {
+        "model": model._meta.label_lower,
+        "object_id": pk,
+        "action": action,
+        "changes": changes,
+        "user_id": user.pk if user is not None else None,
+        "created_at": timezone.now(),
+    }
+
+
+def _enqueue(records):
+    if records:
+        # Rolled back changes never reach the writer
+        transaction.on_commit(partial(history_writer.put, records))
+
+
+def record_changes(model, changes_by_pk, action=ChangeHistory.UPDATE):
+    """
+    Record changes made without model instances, e.g. by QuerySet.update().
+    ``changes_by_pk`` maps each pk to {field name: [old value, new value]}.
+    """
+    _enqueue([
+        _record(model, pk, action, changes)
+        for pk, changes in changes_by_pk.items()
+        if changes
+    ])
+
+
+def _record_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    new = _values(instance)
+    if update_fields is not None:
+        new = {name: value for name, value in new.items() if name in update_fields}
+    if created:
+        changes = {
+            name: [None, value] for name, value in new.items() if value not in (None, "")
+        }
+        action = ChangeHistory.CREATE
+    else:
+        changes = _diff(_stored_values(instance), new)
+        action = ChangeHistory.UPDATE
+    if created or changes:
+        _enqueue([_record(sender, instance.pk, action, changes)])
+
+
+def _record_delete(sender, instance, **kwargs):
+    changes = {
+        name: [value, None]
+        for name, value in _values(instance).items()
+        if value not in (None, "")
+    }
+    _enqueue([_record(sender, instance.pk, ChangeHistory.DELETE, changes)])
+
+
+def _record_bulk_update(sender, objs, fields, **kwargs):
+    records = []
+    for obj in objs:
+        new = {name: value for name, value in _values(obj).items() if name in fields}
+        changes = _diff(_stored_values(obj), new)
+        if changes:
+            records.append(_record(sender, obj.pk, ChangeHistory.UPDATE, changes))
+    _enqueue(records)
+
+
+def connect_change_history():
+    """Connect the change capture handlers for every tracked model"""
+    for model in tracked_models():
+        uid = f"change_history:{model._meta.label_lower}"
+        track_loaded_values(model)
+        post_save.connect(_record_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(_record_delete, sender=model, dispatch_uid=uid)
+        post_bulk_update.connect(_record_bulk_update, sender=model, dispatch_uid=uid)
+
+
+class HistoryWriter:
+    """
+    Buffers history records in memory and stores them in batches from a
+    background thread, started on the first record.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def batch_size(self):
+        return getattr(settings, "CHANGE_HISTORY_BATCH_SIZE", 500)
+
+    @property
+    def flush_interval(self):
+        """Seconds between flushes"""
+        return getattr(settings, "CHANGE_HISTORY_FLUSH_INTERVAL", 1000) / 1000
+
+    def put(self, records):
+        with self._lock:
+            self._pending.extend(records)
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None or not self._thread.is_alive():
+                self._start()
+        if full:
+            self._wakeup.set()
+
+    def _start(self):
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="change-history-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            # The thread's connection outlives any request, close it like the
+            # request cycle would (also drops a connection left broken)
+            close_old_connections()
+
+    @staticmethod
+    def _build(record):
+        fields = {key: value for key, value in record.items() if key != "model"}
+        return ChangeHistory(
+            content_type=ContentType.objects.get_for_model(apps.get_model(record["model"])),
+            **fields,
+        )
+
+    def flush(self):
+        """Store every pending record now; returns how many were stored"""
+        with self._lock:
+            records, self._pending = self._pending, []
+        if not records:
+            return 0
+        try:
+            ChangeHistory.objects.bulk_create(
+                [self._build(record) for record in records], batch_size=self.batch_size
+            )
+            return len(records)
+        except Exception:
+            logger.warning(
+                f"Could not store {len(records)} change history records at once, "
+                f"storing them one by one",
+                exc_info=True,
+            )
+
+        # bulk_create is atomic, so nothing was stored: one bad record (e.g.
+        # its user was deleted meanwhile) only loses itself
+        stored = 0
+        for index, record in enumerate(records):
+            try:
+                self._build(record).save()
+            except (OperationalError, InterfaceError):
+                logger.exception(
+                    f"Change history database unavailable, "
+                    f"{len(records) - index} record(s) kept for the next flush"
+                )
+                self._requeue(records[index:])
+                break
+            except Exception:
+                logger.exception(f"Could not store change history record {record}")
+            else:
+                stored += 1
+        return stored
+
+    def _requeue(self, records):
+        with self._lock:
+            self._pending[:0] = records
+
+    def stop(self):
+        """Stop the background thread and store what is still pending"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _after_fork(self):
+        # The parent process stores its own records; the child starts empty
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+
+history_writer = HistoryWriter()
+atexit.register(history_writer.stop)
+os.register_at_fork(after_in_child=history_writer._after_fork)
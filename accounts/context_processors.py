@@ -1,174 +1,182 @@
-
-from django.urls import reverse
-
 # context_processors.py
-from django.urls import reverse
+import hashlib
+
+from django.core.cache import cache
+from django.urls import NoReverseMatch, reverse
+
+from accounts.permissions import PERMISSIONS_CACHE_TIMEOUT, get_group_permissions
+
+SIDEBAR_CONFIG = [
+    {
+        "name": "Dashboard",
+        "icon": "fas fa-tachometer-alt",
+        "url_name": "accounts:dashboard",
+        "permission": 'accounts.view_dashboard',
+        "is_header": False,
+    },
+    {
+        "name": "Account Management",
+        "icon": "",
+        "permission": "auth.view_user",
+        "is_header": True,
+        "children": [
+            {
+                "name": "Groups",
+                "icon": "far fa-user",
+                "url_name": "accounts:groups",
+                "permission": "auth.view_group",
+            },
+            {
+                "name": "Staffs",
+                "icon": "far fa-user",
+                "url_name": "accounts:staffs",
+                "permission": "auth.view_user",
+            },
+            {
+                "name": "Students",
+                "icon": "far fa-user",
+                "url_name": "students:students",
+                "permission": "students.view_student",
+            },
+            {
+                "name": "Instructor",
+                "icon": "far fa-user",
+                "url_name": "students:instructors",
+                "permission": "students.view_instructor",
+            },
+        ],
+    },
+    {
+        "name": "Course Management",
+        "icon": "",
+        "permission": "students.view_course",
+        "is_header": True,
+        "children": [
+            {
+                "name": "Courses",
+                "icon": "far fa-user",
+                "url_name": "students:courses",
+                "permission": "students.view_course",
+            },
+        ],
+    },
+    {
+        "name": "Enrollment Management",
+        "icon": "",
+        "permission": "students.view_enrollment",
+        "is_header": True,
+        "children": [
+            {
+                "name": "Enrollment",
+                "icon": "far fa-user",
+                "url_name": "students:enrollments",
+                "permission": "students.view_enrollment",
+            },
+        ],
+    },
+    {
+        "name": "MetaData Info",
+        "icon": "",
+        "permission": "students.view_metadata",
+        "is_header": True,
+        "children": [
+            {
+                "name": "Metadata",
+                "icon": "far fa-user",
+                "url_name": "students:metadata",
+                "permission": "students.view_metadata",
+            },
+        ],
+    },
+]
+
+
+def get_permission_fingerprint(user):
+    """Short hash identifying the set of permissions a user has"""
+    if user.is_superuser:
+        return "superuser"
+    permissions = "|".join(sorted(get_group_permissions(user)))
+    return hashlib.md5(permissions.encode()).hexdigest()
 
-def sidebar_processor(request):
+
+def build_sidebar_menu(user):
     """
-    Context processor to generate dynamic sidebar based on user roles and permissions
+    Filter SIDEBAR_CONFIG by the user's group permissions and resolve URLs.
+    The result depends only on the permission set, so it is cached per
+    permission fingerprint.
     """
-    if not request.user.is_authenticated:
-        return {"sidebar_menu": []}
+    permissions = None if user.is_superuser else get_group_permissions(user)
 
-    user = request.user
-
-    SIDEBAR_CONFIG = [
-        {
-            "name": "Dashboard",
-            "icon": "fas fa-tachometer-alt",
-            "url_name": "accounts:dashboard",
-            "permission": 'accounts.view_dashboard',
-            "is_header": False,
-        },
-        {
-            "name": "Account Management",
-            "icon": "",
-            "permission": "auth.view_user",
-            "is_header": True,
-            "children": [
-                {
-                    "name": "Groups",
-                    "icon": "far fa-user",
-                    "url_name": "accounts:groups",
-                    "permission": "auth.view_group",
-                },
-                {
-                    "name": "Staffs",
-                    "icon": "far fa-user",
-                    "url_name": "accounts:staffs",
-                    "permission": "auth.view_user",
-                },
-                {
-                    "name": "Students",
-                    "icon": "far fa-user",
-                    "url_name": "students:students",
-                    "permission": "students.view_student",
-                },
-                {
-                    "name": "Instructor",
-                    "icon": "far fa-user",
-                    "url_name": "students:instructors",
-                    "permission": "students.view_instructor",
-                },
-            ],
-        },
-        {
-            "name": "Course Management",
-            "icon": "",
-            "permission": "students.view_course",
-            "is_header": True,
-            "children": [
-                {
-                    "name": "Courses",
-                    "icon": "far fa-user",
-                    "url_name": "students:courses",
-                    "permission": "students.view_course",
-                },
-            ],
-        },
-        {
-            "name": "Enrollment Management",
-            "icon": "",
-            "permission": "students.view_enrollment",
-            "is_header": True,
-            "children": [
-                {
-                    "name": "Enrollment",
-                    "icon": "far fa-user",
-                    "url_name": "students:enrollments",
-                    "permission": "students.view_enrollment",
-                },
-            ],
-        },
-        {
-            "name": "MetaData Info",
-            "icon": "",
-            "permission": "students.view_metadata",
-            "is_header": True,
-            "children": [
-                {
-                    "name": "Metadata",
-                    "icon": "far fa-user",
-                    "url_name": "students:metadata",
-                    "permission": "students.view_metadata",
-                },
-            ],
-        },
-    ]
-
-    def has_permission_through_groups(user, permission_string):
-        """
-        Check if user has specific permission through their assigned groups
-        """
-        if not permission_string:
-            return True
-        
-        # Superuser always has all permissions
-        if user.is_superuser:
+    def has_permission(permission_string):
+        if not permission_string or permissions is None:
             return True
-        
-        
-        # Get all user's groups
-        user_groups = user.groups.all()
-        
-        # Check if any of the user's groups has the required permission
-        for group in user_groups:
-            group_permissions = group.permissions.all()
-            
-            # Check if the required permission exists in this group
-            for perm in group_permissions:
-                # Permission format is usually "app_label.permission_codename"
-                perm_string = f"{perm.content_type.app_label}.{perm.codename}"
-                
-                if perm_string == permission_string:
-                    return True
-        
-        return False
-
-    def process_menu_items(menu_config, request):
+        return permission_string in permissions
+
+    def process_menu_items(menu_config):
         """Recursively process menu items based on permissions"""
         accessible_items = []
 
         for item in menu_config:
-           
-            
-            # Check if user has permission for this item through groups
-            if not has_permission_through_groups(user, item.get("permission")):
+            if not has_permission(item.get("permission")):
                 continue
 
-            processed_item = item.copy()
-
-            # Process children if they exist
-            if "children" in item and item["children"]:
-                processed_children = process_menu_items(item["children"], request)
-                if processed_children: 
-                    processed_item["children"] = processed_children
-                    processed_item["has_children"] = True
+            processed_item = {key: value for key, value in item.items() if key != "children"}
 
-                    # Check if any child is active
-                    processed_item["active"] = any(
-                        child.get("active", False) for child in processed_children
-                    )
-                else:
+            if item.get("children"):
+                processed_children = process_menu_items(item["children"])
+                if not processed_children:
                     continue  # Skip this item if no children are accessible
+                processed_item["children"] = processed_children
+                processed_item["has_children"] = True
             else:
                 processed_item["has_children"] = False
-                # Check if this item is active
+                processed_item["url"] = None
                 if "url_name" in item:
                     try:
-                        resolved_url = reverse(item["url_name"])
-                        processed_item["active"] = request.path.startswith(resolved_url)
-                    except Exception as e:
-                        processed_item["active"] = False
+                        processed_item["url"] = reverse(item["url_name"])
+                    except NoReverseMatch:
+                        pass
 
             accessible_items.append(processed_item)
 
         return accessible_items
 
-    sidebar_menu = process_menu_items(SIDEBAR_CONFIG, request)
+    return process_menu_items(SIDEBAR_CONFIG)
+
+
+def get_sidebar_menu(user):
+    """Return the cached permission-filtered menu for a user"""
+    key = f"sidebar_menu:{get_permission_fingerprint(user)}"
+    menu = cache.get(key)
+    if menu is None:
+        menu = build_sidebar_menu(user)
+        cache.set(key, menu, PERMISSIONS_CACHE_TIMEOUT)
+    return menu
+
+
+def mark_active(menu_items, path):
+    """Copy the menu with the "active" flags set for the current path"""
+    marked = []
+    for item in menu_items:
+        item = dict(item)
+        if item["has_children"]:
+            item["children"] = mark_active(item["children"], path)
+            item["active"] = any(child["active"] for child in item["children"])
+        else:
+            item["active"] = bool(item["url"]) and path.startswith(item["url"])
+        marked.append(item)
+    return marked
+
+
+def sidebar_processor(request):
+    """
+    Context processor to generate dynamic sidebar based on user roles and permissions
+    """
+    if not request.user.is_authenticated:
+        return {"sidebar_menu": []}
 
-    return {"sidebar_menu": sidebar_menu}
+    menu = get_sidebar_menu(request.user)
+    return {"sidebar_menu": mark_active(menu, request.path)}
 
 
 def get_user_role_display(user):
@@ -0,0 +1,183 @@
+"""
+Incrementally maintained dashboard counters.
+
+Each tracked model contributes a total and an active counter to the single
+DashboardStats row. Saves and deletes (which includes the toggle views) move
+the counters by the difference between the row's state as stored
+(utilities.models.loaded_values) and its state after the write. The counter
+UPDATE is issued by the post_save/post_delete handler, so it only shares the
+write's transaction when the caller opened an atomic block (the toggle views
+do); in autocommit mode it is a separate statement, and a failure between
+the two leaves drift behind.
+
+Writes that bypass signals (QuerySet.update, bulk_create, raw SQL) must call
+adjust_stats or reconcile_stats; ``manage.py reconcile_dashboard_stats``
+repairs any drift.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from accounts.models import DashboardStats
+from utilities.models import loaded_values, track_loaded_values
+
+logger = logging.getLogger(__name__)
+
+# model label: (total counter, active counter, conditions for being counted)
+TRACKED_MODELS = {
+    "students.student": ("total_students", "active_students", {}),
+    "students.course": ("total_courses", "active_courses", {}),
+    "students.enrollment": ("total_enrollments", "active_enrollments", {}),
+    "auth.user": ("total_staff", "active_staff", {"is_staff": True}),
+}
+
+
+def _spec(model):
+    return TRACKED_MODELS[model._meta.label_lower]
+
+
+def _state_fields(model):
+    _, _, scope = _spec(model)
+    return [*scope, "is_active"]
+
+
+def _state(model, values):
+    """(counted, active) from {field: value}, or None if a field is missing"""
+    _, _, scope = _spec(model)
+    if any(field not in values for field in _state_fields(model)):
+        return None
+    counted = all(values[field] == value for field, value in scope.items())
+    return int(counted), int(counted and values["is_active"])
+
+
+def _row_state(instance):
+    """(counted, active) for an instance, or None if a field is not loaded"""
+    return _state(type(instance), instance.__dict__)
+
+
+def _stored_state(instance):
+    """(counted, active) of the stored row, or None if not known"""
+    return _state(type(instance), loaded_values(instance))
+
+
+def count_model(model):
+    """Exact counter values for one tracked model"""
+    total_field, active_field, scope = _spec(model)
+    counts = model._base_manager.filter(**scope).aggregate(
+        total=Count("pk"), active=Count("pk", filter=Q(is_active=True))
+    )
+    return {total_field: counts["total"], active_field: counts["active"]}
+
+
+def reconcile_stats():
+    """
+    Recount every counter and store the result.
+
+    Returns (stats, drift) where drift maps each counter that was wrong to
+    its (stored, actual) values.
+    """
+    actual = {}
+    for label in TRACKED_MODELS:
+        actual.update(count_model(apps.get_model(label)))
+
+    with transaction.atomic():
+        stats, created = DashboardStats.objects.select_for_update().get_or_create(
+            pk=DashboardStats.SINGLETON_PK
+        )
+        drift = {}
+        if not created:
+            drift = {
+                field: (getattr(stats, field), value)
+                for field, value in actual.items()
+                if getattr(stats, field) != value
+            }
+        for field, value in actual.items():
+            setattr(stats, field, value)
+        stats.reconciled_at = timezone.now()
+        stats.save()
+
+    if drift:
+        logger.warning(f"Dashboard stats drift repaired: {drift}")
+    return stats, drift
+
+
+def reconcile_model(model):
+    """Recount the counters of a single model"""
+    counts = count_model(model)
+    updated = DashboardStats.objects.filter(pk=DashboardStats.SINGLETON_PK).update(
+        **counts, updated_at=timezone.now()
+    )
+    if not updated:
+        reconcile_stats()
+
+
+def adjust_stats(**deltas):
+    """Add deltas to counters, e.g. adjust_stats(active_students=-3)"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = DashboardStats.objects.filter(pk=DashboardStats.SINGLETON_PK).update(
+        **{field: F(field) + delta for field, delta in deltas.items()},
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        # First write since install: the recount already includes this one
+        reconcile_stats()
+
+
+def get_dashboard_stats():
+    """Return the counters row, building it on first use"""
+    try:
+        return DashboardStats.objects.get(pk=DashboardStats.SINGLETON_PK)
+    except DashboardStats.DoesNotExist:
+        stats, _ = reconcile_stats()
+        return stats
+
+
+async def aget_dashboard_stats():
+    """get_dashboard_stats for async views"""
+    stats = await DashboardStats.objects.filter(pk=DashboardStats.SINGLETON_PK).afirst()
+    if stats is None:
+        stats, _ = await sync_to_async(reconcile_stats)()
+    return stats
+
+
+def _apply_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and update_fields.isdisjoint(_state_fields(sender)):
+        return  # e.g. the last_login update of every login
+    new_state = _row_state(instance)
+    old_state = (0, 0) if created else _stored_state(instance)
+
+    if new_state is None or old_state is None:
+        # Previous or new state unknown, fall back to a recount
+        reconcile_model(sender)
+    else:
+        total_field, active_field, _ = _spec(sender)
+        adjust_stats(**{
+            total_field: new_state[0] - old_state[0],
+            active_field: new_state[1] - old_state[1],
+        })
+
+
+def _apply_delete(sender, instance, **kwargs):
+    old_state = _stored_state(instance) or _row_state(instance)
+    if old_state is None:
+        reconcile_model(sender)
+        return
+    total_field, active_field, _ = _spec(sender)
+    adjust_stats(**{total_field: -old_state[0], active_field: -old_state[1]})
+
+
+def connect_dashboard_stats():
+    """Connect the counter maintenance handlers for every tracked model"""
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        uid = f"dashboard_stats:{label}"
+        track_loaded_values(model)
+        post_save.connect(_apply_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(_apply_delete, sender=model, dispatch_uid=uid)
@@ -0,0 +1,309 @@
+import json
+import math
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template.base import Template
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+from utilities.route_walker import iter_named_routes
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+URLCONFS = (('accounts.urls', 'accounts'), ('students.urls', 'students'))
+
+# Cold runs call cache.clear(), which must never reach a shared cache
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Route name prefix: model whose first row fills the <pk> of edit routes
+ROUTE_OBJECTS = {
+    'metadata': lambda: MetaData.objects.all(),
+    'student': lambda: Student.objects.all(),
+    'instructor': lambda: Instructor.objects.all(),
+    'course': lambda: Course.objects.all(),
+    'enrollment': lambda: Enrollment.objects.all(),
+    'staff': lambda: User.objects.filter(is_staff=True, is_superuser=False),
+    'group': lambda: Group.objects.all(),
+}
+
+
+class QueryTimer:
+    """Counts the queries run on a connection and the time spent in them"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.total += time.perf_counter() - start
+
+
+class RenderTimer:
+    """Accumulates the time spent rendering top-level templates"""
+
+    def __init__(self):
+        self.total = 0.0
+        self._depth = 0
+
+    @contextmanager
+    def patch(self):
+        original = Template.render
+        timer = self
+
+        def timed_render(template, context):
+            timer._depth += 1
+            start = time.perf_counter()
+            try:
+                return original(template, context)
+            finally:
+                timer._depth -= 1
+                if timer._depth == 0:
+                    timer.total += time.perf_counter() - start
+
+        with mock.patch.object(Template, 'render', timed_render):
+            yield self
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every page and JSON endpoint through the test client, with warm and cold caches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            choices=SCALES,
+            default='1k',
+            help='Dataset size in enrollments (default: 1k)',
+        )
+        parser.add_argument(
+            '--reseed',
+            action='store_true',
+            help=(
+                'Delete the staff, students, courses and enrollments and generate the sample '
+                'data; required whenever the current data is below the requested scale'
+            ),
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed requests per route and cache state (default: 20)',
+        )
+        parser.add_argument(
+            '--username',
+            help='Superuser to request the pages as (defaults to the first superuser)',
+        )
+        parser.add_argument(
+            '--route',
+            nargs='+',
+            help='Only benchmark these route names',
+        )
+        parser.add_argument(
+            '--output',
+            default=os.path.join(settings.LOGS_DIR, 'bench_pages.json'),
+            help='Where to write the JSON report (default: logs/bench_pages.json)',
+        )
+
+    def seed(self, enrollments, reseed):
+        """Reuse the current data if it is at scale, otherwise regenerate it"""
+        current = Enrollment.objects.count()
+        if not reseed:
+            if current >= enrollments // 2:
+                self.stdout.write(f'♻️  Reusing existing data ({current} enrollments)')
+                return
+            # Seeding clears the tables first, never do that unasked
+            raise CommandError(
+                f'The database has {current} enrollments, too few for the {enrollments} '
+                'requested. Pass --reseed to delete the staff, students, courses and '
+                'enrollments and generate sample data at that scale.'
+            )
+
+        self.stdout.write(self.style.WARNING(f'🌱 Seeding about {enrollments} enrollments...'))
+        # Courses are a fixed list; enough students for that many distinct pairs.
+        # A fixed seed makes every run of a scale benchmark the same dataset.
+        students = max(enrollments // 4, 100)
+        seed = ('--seed', '0')
+        with open(os.devnull, 'w') as devnull:
+            for command_name, *arguments in [
+                ('create_sample_groups',),
+                ('create_sample_staffs', '--clear'),
+                ('create_sample_metadatas', '--clear'),
+                ('create_sample_courses', '--clear'),
+                ('create_sample_students', '--clear', '--count', str(students), *seed),
+                ('create_sample_instructors', '--clear', *seed),
+                ('create_sample_enrollments', '--clear', '--count', str(enrollments), *seed),
+            ]:
+                call_command(command_name, *arguments, stdout=devnull)
+        self.stdout.write(self.style.SUCCESS(f'✅ Seeded {Enrollment.objects.count()} enrollments'))
+
+    def get_requests(self):
+        """(name, method, url) for every route worth benchmarking"""
+        requests = []
+        for urlconf, namespace in URLCONFS:
+            for name, arguments in iter_named_routes(urlconf):
+                kwargs = {}
+                if arguments:
+                    prefix = next((p for p in ROUTE_OBJECTS if name.startswith(p)), None)
+                    obj = ROUTE_OBJECTS[prefix]().order_by('pk').first() if prefix else None
+                    if obj is None or arguments != ('pk',):
+                        continue
+                    kwargs = {'pk': obj.pk}
+                url = reverse(f'{namespace}:{name}', kwargs=kwargs)
+                if name == 'check-enrollment':
+                    enrollment = Enrollment.objects.order_by('pk').first()
+                    if enrollment is None:
+                        continue
+                    url += f'?student={enrollment.student_id}&course={enrollment.course_id}'
+                requests.append((name, 'get', url))
+
+        # The toggled student is switched back once the run is over
+        student = Student.objects.order_by('pk').first()
+        if student:
+            url = reverse('accounts:generic_toggle_field', kwargs={'model_name': 'student', 'pk': student.pk})
+            requests.append(('generic_toggle_field', 'post', url))
+        return requests
+
+    def request(self, client, method, url):
+        response = getattr(client, method)(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, client, method, url, iterations, cold):
+        """Latency samples plus the queries, SQL and render time of one request"""
+        samples, result = [], {}
+        if not cold:
+            self.request(client, method, url)
+
+        for _ in range(iterations):
+            if cold:
+                cache.clear()
+            queries, renders = QueryTimer(), RenderTimer()
+            with renders.patch(), connection.execute_wrapper(queries):
+                start = time.perf_counter()
+                response = self.request(client, method, url)
+                elapsed = time.perf_counter() - start
+            samples.append(elapsed * 1000)
+            result = {
+                'status': response.status_code,
+                'queries': queries.count,
+                'sql_ms': queries.total * 1000,
+                'render_ms': renders.total * 1000,
+            }
+
+        result.update({
+            'p50_ms': percentile(samples, 50),
+            'p95_ms': percentile(samples, 95),
+            'p99_ms': percentile(samples, 99),
+            'mean_ms': statistics.fmean(samples),
+        })
+        return result
+
+    def handle(self, *args, **options):
+        backend = settings.CACHES['default']['BACKEND']
+        if backend not in LOCAL_CACHE_BACKENDS:
+            raise CommandError(
+                f'Cold-cache runs clear the whole cache and {backend} may be shared with '
+                'other processes. Benchmark with CACHE_BACKEND set to a local cache, '
+                'e.g. django.core.cache.backends.locmem.LocMemCache.'
+            )
+
+        iterations = max(options['iterations'], 1)
+        enrollments = SCALES[options['scale']]
+        self.seed(enrollments, options['reseed'])
+
+        users = User.objects.filter(is_superuser=True, is_active=True)
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.order_by('pk').first()
+        if user is None:
+            raise CommandError('No active superuser found, create one or pass --username')
+
+        setup_test_environment()
+        try:
+            client = Client()
+            client.force_login(user)
+
+            requests = self.get_requests()
+            if options['route']:
+                requests = [request for request in requests if request[0] in options['route']]
+
+            self.stdout.write(self.style.SUCCESS(
+                f'📊 Benchmarking {len(requests)} routes on {connection.vendor}, '
+                f'{Enrollment.objects.count()} enrollments, {iterations} requests each'
+            ))
+
+            report = {
+                'scale': options['scale'],
+                'enrollments': Enrollment.objects.count(),
+                'vendor': connection.vendor,
+                'iterations': iterations,
+                'routes': {},
+            }
+            toggled = Student.objects.order_by('pk').values_list('pk', 'is_active').first()
+            for name, method, url in requests:
+                report['routes'][name] = {
+                    'method': method.upper(),
+                    'url': url,
+                    'cold': self.measure(client, method, url, iterations, cold=True),
+                    'warm': self.measure(client, method, url, iterations, cold=False),
+                }
+            if toggled and Student.objects.filter(pk=toggled[0], is_active=not toggled[1]).exists():
+                client.post(reverse(
+                    'accounts:generic_toggle_field', kwargs={'model_name': 'student', 'pk': toggled[0]}
+                ))
+        finally:
+            teardown_test_environment()
+
+        self.write_table(report['routes'])
+
+        with open(options['output'], 'w') as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+            report_file.write('\n')
+        self.stdout.write(self.style.SUCCESS(f'\n💾 Report written to {options["output"]}'))
+
+    def write_table(self, routes):
+        header = (
+            f'{"route":<26} {"cache":<5} {"status":>6} {"queries":>7} {"sql ms":>8} '
+            f'{"render ms":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+        )
+        self.stdout.write('\n' + header)
+        self.stdout.write('-' * len(header))
+        for name, route in routes.items():
+            for state in ('cold', 'warm'):
+                row = route[state]
+                self.stdout.write(
+                    f'{name:<26} {state:<5} {row["status"]:>6} {row["queries"]:>7} '
+                    f'{row["sql_ms"]:>8.2f} {row["render_ms"]:>9.2f} {row["p50_ms"]:>8.2f} '
+                    f'{row["p95_ms"]:>8.2f} {row["p99_ms"]:>8.2f}'
+                )
@@ -0,0 +1,124 @@
+import time
+
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+from utilities.filters import filter_relation
+
+
+class Command(BaseCommand):
+    help = 'Compare JOIN + DISTINCT relation filters with EXISTS subqueries on the current data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metadata-key',
+            help='Metadata key to filter on (defaults to the most used key)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed runs per query',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Use EXPLAIN ANALYZE on PostgreSQL',
+        )
+        parser.add_argument(
+            '--no-plans',
+            action='store_true',
+            help='Only print timings',
+        )
+
+    def get_cases(self, metadata_key):
+        """(label, JOIN + DISTINCT queryset, EXISTS queryset) per list filter"""
+        cases = []
+        for model, ordering in [
+            (Student, '-created_at'),
+            (Course, 'course_code'),
+            (Instructor, '-created_at'),
+            (Enrollment, '-created_at'),
+        ]:
+            cases.append((
+                f'{model.__name__} metadata={metadata_key}',
+                model.objects.filter(metadata__key=metadata_key).distinct().order_by(ordering),
+                filter_relation(model.objects.all(), 'metadata__key', metadata_key).order_by(ordering),
+            ))
+
+        course = Course.objects.order_by('pk').first()
+        if course:
+            cases.append((
+                f'Instructor course={course.pk}',
+                Instructor.objects.filter(courses__id=course.pk).distinct().order_by('-created_at'),
+                filter_relation(Instructor.objects.all(), 'courses__id', course.pk).order_by('-created_at'),
+            ))
+
+        group = Group.objects.order_by('pk').first()
+        if group:
+            cases.append((
+                f'Staff group={group.name}',
+                User.objects.filter(is_staff=True, groups__name=group.name).distinct().order_by('-date_joined'),
+                filter_relation(User.objects.filter(is_staff=True), 'groups__name', group.name).order_by('-date_joined'),
+            ))
+        return cases
+
+    def time_query(self, func, repeat):
+        """Best wall time in milliseconds over several runs"""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def explain(self, queryset, analyze):
+        if analyze and connection.vendor == 'postgresql':
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def handle(self, *args, **options):
+        metadata_key = options['metadata_key']
+        if not metadata_key:
+            top = (
+                MetaData.objects.values('key')
+                .annotate(uses=Count('students'))
+                .order_by('-uses')
+                .first()
+            )
+            if not top:
+                self.stdout.write(self.style.ERROR('❌ No metadata found, run create_sample_datas first'))
+                return
+            metadata_key = top['key']
+
+        repeat = max(options['repeat'], 1)
+        self.stdout.write(self.style.SUCCESS(
+            f'📊 Benchmarking relation filters on {connection.vendor} ({repeat} runs each)'
+        ))
+
+        for label, joined, semi_join in self.get_cases(metadata_key):
+            self.stdout.write(self.style.SUCCESS(f'\n=== {label} ==='))
+
+            rows = {}
+            for name, queryset in [('JOIN + DISTINCT', joined), ('EXISTS', semi_join)]:
+                count_ms = self.time_query(queryset.count, repeat)
+                page_ms = self.time_query(lambda: list(queryset[:10]), repeat)
+                rows[name] = queryset.count()
+                self.stdout.write(
+                    f'{name:<16} rows={rows[name]:<8} count={count_ms:8.2f} ms  first page={page_ms:8.2f} ms'
+                )
+                if not options['no_plans']:
+                    self.stdout.write(self.explain(queryset, options['analyze']))
+
+            if rows['JOIN + DISTINCT'] != rows['EXISTS']:
+                self.stdout.write(self.style.ERROR('❌ Row counts differ'))
+
+        self.stdout.write(self.style.SUCCESS('\n🎉 Benchmark completed!'))
@@ -1,8 +1,54 @@
-from django.core.management.base import BaseCommand
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.contrib.auth.models import User
 from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+
+# stage: (command, stages it depends on)
+STAGES = {
+    'groups': ('create_sample_groups', []),
+    'staff': ('create_sample_staffs', ['groups']),
+    'metadata': ('create_sample_metadatas', []),
+    'courses': ('create_sample_courses', ['metadata']),
+    'students': ('create_sample_students', ['metadata']),
+    'instructors': ('create_sample_instructors', ['courses', 'metadata']),
+    'enrollments': ('create_sample_enrollments', ['students', 'courses', 'metadata']),
+}
+
+# Rows --clear deletes for a stage, in the order they are deleted: rows
+# referencing others go first so no delete has to cascade into another stage
+CLEAR_QUERYSETS = {
+    'enrollments': lambda: Enrollment.objects.all(),
+    'instructors': lambda: Instructor.objects.all(),
+    'students': lambda: Student.objects.all(),
+    'courses': lambda: Course.objects.all(),
+    'metadata': lambda: MetaData.objects.all(),
+    'staff': lambda: User.objects.filter(is_staff=True, is_superuser=False),
+}
+
+
+def run_stage(command_name, arguments):
+    """Run one sample command and return (seconds, its output)"""
+    output = io.StringIO()
+    start = time.perf_counter()
+    call_command(command_name, *arguments, stdout=output)
+    return time.perf_counter() - start, output.getvalue()
+
 
 class Command(BaseCommand):
-    help = 'Create all sample data in the correct order'
+    help = 'Create all sample data, running independent stages in parallel'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -13,38 +59,135 @@ class Command(BaseCommand):
         parser.add_argument(
             '--skip',
             nargs='+',
-            choices=['groups', 'staff', 'metadata', 'courses', 'students', 'instructors', 'enrollments'],
+            choices=list(STAGES),
             help='Skip specific data types (space separated)',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Worker processes (default: one per CPU, 1 on SQLite which allows a single writer)',
+        )
+
+    def get_workers(self, requested):
+        if requested:
+            return max(requested, 1)
+        if connection.vendor == 'sqlite':
+            return 1
+        return min(os.cpu_count() or 1, len(STAGES))
+
+    def get_dependents(self, stage):
+        """Every stage that directly or indirectly depends on ``stage``"""
+        dependents = set()
+        pending = [stage]
+        while pending:
+            current = pending.pop()
+            for name, (_, depends_on) in STAGES.items():
+                if current in depends_on and name not in dependents:
+                    dependents.add(name)
+                    pending.append(name)
+        return dependents
+
+    def clear(self, stages):
+        """
+        Delete the data of ``stages`` once, up front and in one transaction.
+        Parallel stages clearing their own tables would cascade into the same
+        enrollment and many-to-many rows from separate transactions.
+        """
+        with transaction.atomic():
+            for stage, queryset in CLEAR_QUERYSETS.items():
+                if stage in stages:
+                    self.stdout.write(f'🗑️  Deleting existing {stage}...')
+                    queryset().delete()
 
     def handle(self, *args, **options):
-        clear_flag = ['--clear'] if options['clear'] else []
-        skip_list = options['skip'] or []
-        
-        commands_order = [
-            ('groups', 'create_sample_groups'),
-            ('staff', 'create_sample_staffs'),
-            ('metadata', 'create_sample_metadatas'),
-            ('courses', 'create_sample_courses'),
-            ('students', 'create_sample_students'),
-            ('instructors', 'create_sample_instructors'),
-            ('enrollments', 'create_sample_enrollments'),
-        ]
-
-        self.stdout.write(self.style.SUCCESS('🚀 Starting sample data creation...'))
-        
-        for data_type, command_name in commands_order:
-            if data_type in skip_list:
-                self.stdout.write(self.style.WARNING(f'⏭️  Skipping {data_type}...'))
-                continue
-                
-            self.stdout.write(self.style.SUCCESS(f'📦 Creating {data_type}...'))
-            try:
-                call_command(command_name, *clear_flag)
-                self.stdout.write(self.style.SUCCESS(f'✅ {data_type.capitalize()} created successfully'))
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'❌ Failed to create {data_type}: {str(e)}'))
-                # Decide whether to continue or stop on error
-                continue
-        
-        self.stdout.write(self.style.SUCCESS('🎉 All sample data creation completed!'))
+        skip_list = set(options['skip'] or [])
+        workers = self.get_workers(options['workers'])
+
+        # Skipped stages count as done so their dependents still run
+        done = set(skip_list)
+        failed, blocked, timings = {}, {}, {}
+        pending = [stage for stage in STAGES if stage not in skip_list]
+
+        for stage in skip_list:
+            self.stdout.write(self.style.WARNING(f'⏭️  Skipping {stage}...'))
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Starting sample data creation with {workers} worker(s)...'
+        ))
+
+        def ready_stages():
+            return [
+                stage for stage in pending
+                if all(dependency in done for dependency in STAGES[stage][1])
+            ]
+
+        def finish(stage, result=None, error=None):
+            pending.remove(stage)
+            if error is None:
+                seconds, output = result
+                timings[stage] = seconds
+                done.add(stage)
+                self.stdout.write(output, ending='')
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ {stage.capitalize()} created successfully ({seconds:.1f}s)'
+                ))
+                return
+            failed[stage] = error
+            self.stdout.write(self.style.ERROR(f'❌ Failed to create {stage}: {error}'))
+            for dependent in sorted(self.get_dependents(stage), key=list(STAGES).index):
+                if dependent in pending:
+                    pending.remove(dependent)
+                    blocked[dependent] = stage
+                    self.stdout.write(self.style.WARNING(
+                        f'⛔ Not creating {dependent}, it depends on {stage}'
+                    ))
+
+        if options['clear']:
+            self.clear(pending)
+
+        if workers == 1:
+            while ready_stages():
+                stage = ready_stages()[0]
+                self.stdout.write(self.style.SUCCESS(f'📦 Creating {stage}...'))
+                try:
+                    finish(stage, result=run_stage(STAGES[stage][0], ()))
+                except Exception as e:
+                    finish(stage, error=e)
+        else:
+            # Spawned workers start clean and open their own DB connections
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=django.setup) as pool:
+                running = {}
+                while pending:
+                    for stage in ready_stages():
+                        if stage not in running.values():
+                            self.stdout.write(self.style.SUCCESS(f'📦 Creating {stage}...'))
+                            future = pool.submit(run_stage, STAGES[stage][0], ())
+                            running[future] = stage
+                    if not running:
+                        break
+                    completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        stage = running.pop(future)
+                        try:
+                            finish(stage, result=future.result())
+                        except Exception as e:
+                            finish(stage, error=e)
+
+        self.stdout.write('\n⏱️  Stage timings:')
+        for stage in STAGES:
+            if stage in timings:
+                status = f'{timings[stage]:.1f}s'
+            elif stage in failed:
+                status = 'failed'
+            elif stage in blocked:
+                status = f'not run ({blocked[stage]} failed)'
+            else:
+                status = 'skipped'
+            self.stdout.write(f'   {stage:<12} {status}')
+
+        if failed:
+            self.stdout.write(self.style.ERROR(
+                f'⚠️  Sample data creation finished with {len(failed)} failed stage(s)'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('🎉 All sample data creation completed!'))
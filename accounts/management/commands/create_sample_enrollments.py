@@ -4,8 +4,20 @@ from students.models.enrollment_model import Enrollment
 from students.models.metadata_model import MetaData
 from students.models.student_model import Student
 from students.models.course_model import Course
-import random
+from accounts.dashboard_stats import reconcile_model
+from utilities.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader
+from utilities.synthetic import SyntheticData
 from datetime import datetime, timedelta
+from decimal import Decimal
+import numpy as np
+
+# Score range of each final grade; 'I' and 'W' are never generated
+GRADE_SCORE_MAP = {
+    'A+': (95, 100), 'A': (90, 94), 'A-': (85, 89),
+    'B+': (80, 84), 'B': (75, 79), 'B-': (70, 74),
+    'C+': (65, 69), 'C': (60, 64), 'C-': (55, 59),
+    'D+': (50, 54), 'D': (45, 49), 'F': (0, 44),
+}
 
 class Command(BaseCommand):
     help = 'Create sample enrollments with random assignments and metadata'
@@ -22,11 +34,25 @@ class Command(BaseCommand):
             default=200,
             help='Number of enrollments to create (default: 200)',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per insert batch (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed, the same seed generates the same enrollments',
+        )
 
     def handle(self, *args, **options):
+        loader = BulkLoader(batch_size=options['batch_size'])
+        synthetic = SyntheticData(options['seed'])
+
         # Get existing data
-        students = list(Student.objects.filter(is_active=True))
-        courses = list(Course.objects.all())
+        students = list(Student.objects.filter(is_active=True).only('id', 'first_name').order_by('pk'))
+        courses = list(Course.objects.order_by('pk'))
         
         if not students or not courses:
             self.stdout.write(
@@ -41,89 +67,67 @@ class Command(BaseCommand):
             "special_approval", "learning_goals"
         ]
         
-        enrollment_metadata = list(MetaData.objects.filter(key__in=enrollment_metadata_keys))
+        enrollment_metadata = list(MetaData.objects.filter(key__in=enrollment_metadata_keys).order_by('pk'))
 
         if options['clear']:
             self.stdout.write('Deleting all existing enrollments...')
             Enrollment.objects.all().delete()
             self.stdout.write(self.style.SUCCESS('All enrollments deleted successfully'))
 
+        # Distinct (student, course) pairs, drawn together with every other column
+        student_indexes, course_indexes = synthetic.unique_pairs(
+            options['count'], np.arange(len(students)), np.arange(len(courses))
+        )
+        enrollment_count = len(student_indexes)
+
+        # Semester starts in January or August, enrollment within two weeks
+        current_year = timezone.now().year
+        semester_months = synthetic.pick([1, 8], enrollment_count)
+        enrollment_days = synthetic.rng.integers(0, 15, size=enrollment_count)
+        # 80% completed, 20% current
+        completed = synthetic.booleans(enrollment_count, 0.8)
+        course_days = synthetic.rng.integers(90, 121, size=enrollment_count)
+        grades, scores = synthetic.grades_and_scores(enrollment_count, GRADE_SCORE_MAP)
+
         enrollments_to_create = []
-        existing_enrollments = set()
-        
-        enrollment_count = options['count']
-        
         for i in range(enrollment_count):
-            # Select random student and course
-            student = random.choice(students)
-            course = random.choice(courses)
-            
-            # Avoid duplicate enrollments
-            enrollment_key = (student.id, course.id)
-            if enrollment_key in existing_enrollments:
-                continue
-                
-            existing_enrollments.add(enrollment_key)
-            
-            # Determine enrollment status and dates
-            current_year = timezone.now().year
-            semester_start = datetime(current_year, random.choice([1, 8]), 1)
-            enrollment_date = semester_start + timedelta(days=random.randint(0, 14))
-            
-            # 80% completed, 20% current
-            is_completed = random.random() < 0.8
-            
-            if is_completed:
-                completion_date = enrollment_date + timedelta(days=random.randint(90, 120))
-                grade = random.choice([g[0] for g in Enrollment.GRADE_CHOICES if g[0] not in ['I', 'W']])
-                
-                # Calculate score based on grade
-                grade_score_map = {
-                    'A+': (95, 100), 'A': (90, 94), 'A-': (85, 89),
-                    'B+': (80, 84), 'B': (75, 79), 'B-': (70, 74),
-                    'C+': (65, 69), 'C': (60, 64), 'C-': (55, 59),
-                    'D+': (50, 54), 'D': (45, 49), 'F': (0, 44),
-                }
-                score_range = grade_score_map.get(grade, (0, 100))
-                score = random.uniform(score_range[0], score_range[1])
-            else:
-                completion_date = None
-                grade = ''
-                score = None
-            
-            # Create enrollment
-            enrollment = Enrollment(
-                student=student,
-                course=course,
-                grade=grade,
-                score=score,
-                completion_date=completion_date,
+            enrollment_date = datetime(current_year, int(semester_months[i]), 1) + timedelta(
+                days=int(enrollment_days[i])
+            )
+            is_completed = completed[i]
+            enrollments_to_create.append(Enrollment(
+                student=students[student_indexes[i]],
+                course=courses[course_indexes[i]],
+                grade=grades[i] if is_completed else '',
+                score=Decimal(f'{scores[i]:.2f}') if is_completed else None,
+                completion_date=(
+                    enrollment_date + timedelta(days=int(course_days[i])) if is_completed else None
+                ),
                 created_at=enrollment_date,
                 created_by_id=1,
                 updated_by_id=1,
-            )
-            
-            enrollments_to_create.append(enrollment)
+            ))
 
         # Bulk create enrollments
-        created_enrollments = Enrollment.objects.bulk_create(enrollments_to_create)
+        created_enrollments = loader.create(Enrollment, enrollments_to_create)
+        # Bulk inserts send no signals, recount the dashboard counters
+        reconcile_model(Enrollment)
         
         # Assign random metadata to enrollments (0-8 items)
-        metadata_stats = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
-        
-        for enrollment in created_enrollments:
-            # Random number of metadata items
-            num_metadata = random.choices(
-                range(len(enrollment_metadata) + 1),
-                weights=[5, 10, 15, 20, 20, 15, 10, 5, 5],
-                k=1
-            )[0]
-            
-            metadata_stats[num_metadata] += 1
-            
-            if num_metadata > 0:
-                selected_metadata = random.sample(enrollment_metadata, num_metadata)
-                enrollment.metadata.set(selected_metadata)
+        rows, picks = synthetic.subsets(
+            len(created_enrollments),
+            len(enrollment_metadata),
+            count_weights=[5, 10, 15, 20, 20, 15, 10, 5, 5],
+        )
+        metadata_links = [
+            (created_enrollments[row].pk, enrollment_metadata[pick].pk)
+            for row, pick in zip(rows, picks)
+        ]
+        per_enrollment = np.bincount(rows, minlength=len(created_enrollments))
+        metadata_stats = dict(enumerate(np.bincount(per_enrollment, minlength=9).tolist()))
+
+        # Write all the enrollment/metadata links in batches
+        loader.add_m2m(Enrollment, 'metadata', metadata_links)
         
         # Calculate statistics
         student_enrollments = {}
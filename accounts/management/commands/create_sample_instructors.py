@@ -1,10 +1,13 @@
 from django.core.management.base import BaseCommand
-from faker import Faker
+from django.db.models import Max
+import numpy as np
+
 from students.models.course_model import Course
-import random
 
 from students.models.instructor_model import Instructor
 from students.models.metadata_model import MetaData
+from utilities.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader
+from utilities.synthetic import SyntheticData
 
 class Command(BaseCommand):
     help = 'Create 100 sample instructors with realistic data and random associations'
@@ -21,10 +24,22 @@ class Command(BaseCommand):
             default=100,
             help='Number of instructors to create (default: 100)',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per insert batch (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed, the same seed generates the same instructors',
+        )
 
     def handle(self, *args, **options):
-        fake = Faker()
+        synthetic = SyntheticData(options['seed'])
         instructor_count = options['count']
+        loader = BulkLoader(batch_size=options['batch_size'])
         
         if options['clear']:
             self.stdout.write('Deleting all existing instructors...')
@@ -34,62 +49,75 @@ class Command(BaseCommand):
             )
 
         # Get existing courses and metadata
-        courses = list(Course.objects.all())
+        courses = list(Course.objects.order_by('pk'))
         instructor_metadata = list(MetaData.objects.filter(
             key__in=[
                 "office_hours", "office_location", "teaching_specialties", 
                 "years_experience", "phd_university", "research_interests",
                 "preferred_communication", "available_for_advising"
             ]
-        ))
+        ).order_by('pk'))
 
-        instructors_to_create = []
-        
-        for i in range(instructor_count):
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            
-            instructors_to_create.append(Instructor(
+        # Email numbers continue after the existing rows, so a re-run with the
+        # same seed adds instructors instead of repeating the same emails
+        first_index = (Instructor.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+        # Draw every column at once, then build the rows
+        first_names, last_names = synthetic.names(instructor_count)
+        phone_numbers = synthetic.phone_numbers(instructor_count)
+
+        instructors_to_create = [
+            Instructor(
                 first_name=first_name,
                 last_name=last_name,
-                email=f"{first_name.lower()}.{last_name.lower()}{i}@university.edu",
-                phone_number=fake.phone_number()[:15],
+                email=f"{first_name.lower()}.{last_name.lower()}{first_index + i}@university.edu",
+                phone_number=phone_number,
                 created_by_id=1,
-            ))
+            )
+            for i, (first_name, last_name, phone_number) in enumerate(
+                zip(first_names, last_names, phone_numbers)
+            )
+        ]
 
         # Bulk create instructors
-        created_instructors = Instructor.objects.bulk_create(instructors_to_create)
+        created_instructors = loader.create(Instructor, instructors_to_create)
         
         # Statistics tracking
-        course_stats = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0}
-        metadata_stats = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
-        
-        for instructor in created_instructors:
-            # Random course assignment (0-4 courses)
-            if courses:
-                num_courses = random.choices(
-                    [0, 1, 2, 3, 4],
-                    weights=[10, 20, 30, 25, 15],  # Weighted probabilities
-                    k=1
-                )[0]
-                course_stats[num_courses] += 1
-                
-                if num_courses > 0:
-                    instructor_courses = random.sample(courses, min(num_courses, len(courses)))
-                    instructor.courses.set(instructor_courses)
-            
-            # Random metadata assignment (0-8 metadata items)
-            if instructor_metadata:
-                num_metadata = random.choices(
-                    range(len(instructor_metadata) + 1),
-                    weights=[5, 10, 15, 20, 20, 15, 10, 5, 5],  # Weighted probabilities
-                    k=1
-                )[0]
-                metadata_stats[num_metadata] += 1
-                
-                if num_metadata > 0:
-                    selected_metadata = random.sample(instructor_metadata, num_metadata)
-                    instructor.metadata.set(selected_metadata)
+        course_stats = {}
+        metadata_stats = {}
+        course_links = []
+        metadata_links = []
+
+        # Random course assignment (0-4 courses)
+        if courses:
+            rows, picks = synthetic.subsets(
+                len(created_instructors),
+                len(courses),
+                count_weights=[10, 20, 30, 25, 15],  # Weighted probabilities
+            )
+            course_links = [
+                (created_instructors[row].pk, courses[pick].pk) for row, pick in zip(rows, picks)
+            ]
+            per_instructor = np.bincount(rows, minlength=len(created_instructors))
+            course_stats = dict(enumerate(np.bincount(per_instructor).tolist()))
+
+        # Random metadata assignment (0-8 metadata items)
+        if instructor_metadata:
+            rows, picks = synthetic.subsets(
+                len(created_instructors),
+                len(instructor_metadata),
+                count_weights=[5, 10, 15, 20, 20, 15, 10, 5, 5],  # Weighted probabilities
+            )
+            metadata_links = [
+                (created_instructors[row].pk, instructor_metadata[pick].pk)
+                for row, pick in zip(rows, picks)
+            ]
+            per_instructor = np.bincount(rows, minlength=len(created_instructors))
+            metadata_stats = dict(enumerate(np.bincount(per_instructor).tolist()))
+
+        # Write all the links in batches
+        loader.add_m2m(Instructor, 'courses', course_links)
+        loader.add_m2m(Instructor, 'metadata', metadata_links)
         
         # Print statistics
         self.stdout.write(
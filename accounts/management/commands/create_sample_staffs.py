@@ -1,8 +1,12 @@
 from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User, Group
 from django.utils import timezone
 from faker import Faker
 import random
+from accounts.dashboard_stats import reconcile_model
+from accounts.permissions import bump_permissions_version
+from utilities.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader
 
 class Command(BaseCommand):
     help = "Create 50 sample staff users with different roles"
@@ -19,10 +23,17 @@ class Command(BaseCommand):
             default=50,
             help="Number of staff users to create (default: 50)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per insert batch (default: {DEFAULT_BATCH_SIZE})",
+        )
 
     def handle(self, *args, **options):
         fake = Faker()
         user_count = options["count"]
+        loader = BulkLoader(batch_size=options["batch_size"])
 
         if options["clear"]:
             self.stdout.write("Deleting all non-superuser staff users...")
@@ -74,34 +85,29 @@ class Command(BaseCommand):
                 'password': "staff123"  # Will be hashed later
             })
 
-        # Create users in bulk without saving passwords yet
+        # Hash each distinct password once; hashing dominates the run time
+        # otherwise. Sharing a salt is fine for sample accounts.
+        password_hashes = {}
         users_to_create = []
         for user_data in users_data:
-            user = User(
+            password = user_data['password']
+            if password not in password_hashes:
+                password_hashes[password] = make_password(password)
+            users_to_create.append(User(
                 username=user_data['username'],
                 email=user_data['email'],
                 first_name=user_data['first_name'],
                 last_name=user_data['last_name'],
+                password=password_hashes[password],
                 is_staff=True,
                 is_active=True,
                 is_superuser=False,
                 date_joined=timezone.now()
-            )
-            # Store plain password temporarily for bulk password setting
-            user._plain_password = user_data['password']
-            users_to_create.append(user)
+            ))
 
-        # Bulk create users (without passwords)
-        created_users = User.objects.bulk_create(users_to_create)
-        
-        # Set passwords in bulk using update() for better performance
-        for user in created_users:
-            user.set_password(user._plain_password)
-            # Clear temporary attribute
-            delattr(user, '_plain_password')
-        
-        # Update passwords in bulk (this is more efficient than individual saves)
-        User.objects.bulk_update(created_users, ['password'])
+        created_users = loader.create(User, users_to_create)
+        # Bulk inserts send no signals, recount the dashboard counters
+        reconcile_model(User)
 
         # Prepare role assignments using bulk operations
         role_assignments = []
@@ -142,11 +148,12 @@ class Command(BaseCommand):
             
             # Add role assignments
             for role_name in roles_to_assign:
-                role_assignments.append(user.groups.through(user_id=user.id, group_id=groups[role_name].id))
+                role_assignments.append((user.pk, groups[role_name].pk))
 
-        # Bulk create role assignments
-        if role_assignments:
-            user.groups.through.objects.bulk_create(role_assignments)
+        # Write all the role assignments in batches
+        loader.add_m2m(User, "groups", role_assignments)
+        # Membership changed without m2m_changed, drop cached permissions
+        bump_permissions_version()
 
         # Print statistics
         self.stdout.write(
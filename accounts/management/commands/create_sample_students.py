@@ -1,11 +1,12 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from faker import Faker
-from datetime import timedelta
-import random
+from django.db.models import Max
+import numpy as np
 
 from students.models.metadata_model import MetaData
 from students.models.student_model import Student
+from accounts.dashboard_stats import reconcile_model
+from utilities.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader
+from utilities.synthetic import SyntheticData
 
 class Command(BaseCommand):
     help = "Create 100 sample students with realistic data and random metadata"
@@ -22,10 +23,22 @@ class Command(BaseCommand):
             default=100,
             help="Number of students to create (default: 100)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per insert batch (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Random seed, the same seed generates the same students",
+        )
 
     def handle(self, *args, **options):
-        fake = Faker()
+        synthetic = SyntheticData(options["seed"])
         student_count = options["count"]
+        loader = BulkLoader(batch_size=options["batch_size"])
 
         if options["clear"]:
             self.stdout.write("Deleting all existing students...")
@@ -39,52 +52,55 @@ class Command(BaseCommand):
             "campus_residence", "graduation_track"
         ]
         
-        metadata_templates = list(MetaData.objects.filter(key__in=student_metadata_keys))
+        metadata_templates = list(MetaData.objects.filter(key__in=student_metadata_keys).order_by("pk"))
         
         if not metadata_templates:
             self.stdout.write(self.style.ERROR("❌ No student metadata templates found!"))
             self.stdout.write(self.style.WARNING("Run create_sample_metadata command first"))
             return
 
-        # Create students in bulk
-        students_to_create = []
-        for i in range(student_count):
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            
-            student = Student(
+        # Email numbers continue after the existing rows, so a re-run with the
+        # same seed adds students instead of repeating the same emails
+        first_index = (Student.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+        # Draw every column at once, then build the rows
+        first_names, last_names = synthetic.names(student_count)
+        dates_of_birth = synthetic.dates_of_birth(student_count, min_age=18, max_age=25)
+        active = synthetic.booleans(student_count, 0.75)  # 75% active
+
+        students_to_create = [
+            Student(
                 first_name=first_name,
                 last_name=last_name,
-                email=f"{first_name.lower()}.{last_name.lower()}{i}@example.com",
-                date_of_birth=fake.date_between_dates(
-                    timezone.now().date() - timedelta(days=25 * 365),
-                    timezone.now().date() - timedelta(days=18 * 365)
-                ),
-                is_active=random.choice([True, True, True, False]),  # 75% active
+                email=f"{first_name.lower()}.{last_name.lower()}{first_index + i}@example.com",
+                date_of_birth=date_of_birth,
+                is_active=bool(is_active),
                 created_by_id=1,
             )
-            students_to_create.append(student)
+            for i, (first_name, last_name, date_of_birth, is_active) in enumerate(
+                zip(first_names, last_names, dates_of_birth, active)
+            )
+        ]
 
-        created_students = Student.objects.bulk_create(students_to_create)
+        created_students = loader.create(Student, students_to_create)
+        # Bulk inserts send no signals, recount the dashboard counters
+        reconcile_model(Student)
 
-        # Assign random metadata templates to students
-        metadata_stats = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
-        
-        for student in created_students:
-            # Random number of metadata items (0 to all available)
-            num_metadata = random.choices(
-                range(len(metadata_templates) + 1),
-                weights=[10, 15, 20, 25, 15, 10, 5, 3, 2],  # Weighted probabilities
-                k=1
-            )[0]
-            
-            metadata_stats[num_metadata] += 1
-            
-            if num_metadata > 0:
-                # Select random metadata templates
-                selected_metadata = random.sample(metadata_templates, num_metadata)
-                # Assign the templates to student (this creates the relationship)
-                student.metadata.set(selected_metadata)
+        # Assign random metadata templates to students (0 to all available)
+        rows, picks = synthetic.subsets(
+            len(created_students),
+            len(metadata_templates),
+            count_weights=[10, 15, 20, 25, 15, 10, 5, 3, 2],  # Weighted probabilities
+        )
+        metadata_links = [
+            (created_students[row].pk, metadata_templates[pick].pk)
+            for row, pick in zip(rows, picks)
+        ]
+        per_student = np.bincount(rows, minlength=len(created_students))
+        metadata_stats = dict(enumerate(np.bincount(per_student, minlength=9).tolist()))
+
+        # Write all the student/metadata links in batches
+        loader.add_m2m(Student, "metadata", metadata_links)
 
         # Print statistics
         self.stdout.write(self.style.SUCCESS(f"✅ Successfully created {len(created_students)} students"))
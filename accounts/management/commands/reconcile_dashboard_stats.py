@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from accounts.dashboard_stats import reconcile_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard counters and repair any drift'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🔄 Recounting dashboard statistics...'))
+        stats, drift = reconcile_stats()
+
+        if drift:
+            for field, (stored, actual) in drift.items():
+                self.stdout.write(self.style.WARNING(f'⚠️  {field}: {stored} -> {actual}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ No drift found'))
+
+        for field, value in stats.as_dict().items():
+            self.stdout.write(f'   {field}: {value}')
+        self.stdout.write(self.style.SUCCESS('🎉 Dashboard statistics reconciled!'))
@@ -1,24 +1,52 @@
 # middleware.py
-from threading import local
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# The request being handled. A context variable rather than a thread-local:
+# every request (and every task under ASGI) gets its own value, and asgiref
+# carries it into sync_to_async/async_to_sync calls. The request is stored
+# rather than its lazy user because asgiref compares the values when it
+# restores a context, which would load the user from async code.
+_current_request = ContextVar("current_request", default=None)
 
-_thread_locals = local()
 
 def get_current_user():
     """Ultra-fast user lookup"""
-    return getattr(_thread_locals, 'user', None)
+    request = _current_request.get()
+    if request is None:
+        return None
+    return getattr(request, "user", None)
+
 
 class CurrentUserMiddleware:
+    """Make request.user available to get_current_user() while the request is handled"""
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Only store user if authenticated (saves memory)
-        if request.user.is_authenticated:
-            _thread_locals.user = request.user
-        else:
-            _thread_locals.user = None
-        
-        response = self.get_response(request)
-        
-        
-        return response
\ No newline at end of file
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            # Don't stamp writes made after the request with its user
+            _current_request.reset(token)
+
+    async def __acall__(self, request):
+        # The user is only loaded if a write asks for it, which happens in
+        # sync code (a thread under ASGI)
+        token = _current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_request.reset(token)
@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 class Dashboard(models.Model):
     """Dummy model to hold dashboard permissions"""
@@ -7,4 +11,87 @@ class Dashboard(models.Model):
             ("view_dashboard", "Can view dashboard"),
         ]
         # Hide this model from admin if you don't want it visible
-        default_permissions = ()
\ No newline at end of file
+        default_permissions = ()
+
+
+class DashboardStats(models.Model):
+    """
+    Single-row table of dashboard counters, kept up to date by the signal
+    handlers in accounts.dashboard_stats.
+    """
+    SINGLETON_PK = 1
+
+    total_students = models.IntegerField(default=0)
+    active_students = models.IntegerField(default=0)
+    total_courses = models.IntegerField(default=0)
+    active_courses = models.IntegerField(default=0)
+    total_enrollments = models.IntegerField(default=0)
+    active_enrollments = models.IntegerField(default=0)
+    total_staff = models.IntegerField(default=0)
+    active_staff = models.IntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNTER_FIELDS = [
+        "total_students",
+        "active_students",
+        "total_courses",
+        "active_courses",
+        "total_enrollments",
+        "active_enrollments",
+        "total_staff",
+        "active_staff",
+    ]
+
+    class Meta:
+        db_table = "dashboard_stats"
+        default_permissions = ()
+
+    def __str__(self):
+        return f"Dashboard stats (updated {self.updated_at})"
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.COUNTER_FIELDS}
+
+
+class ChangeHistory(models.Model):
+    """
+    One recorded change of a tracked object: the fields it touched with
+    their old and new values. Written in batches by accounts.change_history.
+    """
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    ACTION_CHOICES = [
+        (CREATE, "Created"),
+        (UPDATE, "Updated"),
+        (DELETE, "Deleted"),
+    ]
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # {field name: [old value, new value]}
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    # When the change was made, not when the record was written
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "change_history"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id", "-created_at"],
+                name="change_history_object_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.content_type_id}:{self.object_id}"
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete
+
+from utilities.cache_versions import bump_version, get_version
+
+PERMISSIONS_VERSION = "permissions"
+PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_permissions_version():
+    """Version that changes whenever any group membership or grant changes"""
+    return get_version(PERMISSIONS_VERSION)
+
+
+def bump_permissions_version(**kwargs):
+    bump_version(PERMISSIONS_VERSION)
+
+
+def _bump_on_m2m_change(action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_permissions_version()
+
+
+def get_group_permissions(user):
+    """
+    Return the "app_label.codename" permissions a user gets through their
+    groups, resolved in one query and cached until permissions change.
+    """
+    key = f"group_perms:{user.pk}:{get_permissions_version()}"
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = frozenset(
+            f"{app_label}.{codename}"
+            for app_label, codename in Permission.objects.filter(
+                group__user=user
+            ).values_list("content_type__app_label", "codename")
+        )
+        cache.set(key, permissions, PERMISSIONS_CACHE_TIMEOUT)
+    return permissions
+
+
+def connect_permission_versions():
+    """Bump the permissions version on membership and grant changes"""
+    for through in (
+        User.groups.through,
+        User.user_permissions.through,
+        Group.permissions.through,
+    ):
+        m2m_changed.connect(
+            _bump_on_m2m_change,
+            sender=through,
+            dispatch_uid=f"permissions_version:{through._meta.label_lower}",
+        )
+    for model in (Group, Permission):
+        post_delete.connect(
+            bump_permissions_version,
+            sender=model,
+            dispatch_uid=f"permissions_version:{model._meta.label_lower}",
+        )
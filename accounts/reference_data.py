@@ -0,0 +1,6 @@
+"""Reference lists shared by the accounts views, cached per process"""
+from django.contrib.auth.models import Group
+
+from utilities.reference_cache import ReferenceList
+
+group_list = ReferenceList(Group.objects.order_by("name"))
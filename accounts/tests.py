@@ -1,3 +1,512 @@
-from django.test import TestCase
+import json
+import os
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import DatabaseError, OperationalError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from accounts.change_history import history_writer
+from accounts.dashboard_stats import get_dashboard_stats
+from accounts.middleware import CurrentUserMiddleware, get_current_user
+from accounts.models import ChangeHistory, DashboardStats
+from accounts.views.group_views import GroupView
+from accounts.views.staff_views import StaffView
+from accounts.views.toggle_views import GenericBulkToggleView
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+from utilities.async_mixins import AsyncLoginRequiredMixin
+from utilities.route_walker import walk_routes, write_report
+from utilities.test_mixins import ListQueryCountMixin
+
+
+class ListQueryCountTests(ListQueryCountMixin, TestCase):
+    """List pages must cost the same number of queries whatever their size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        permissions = list(Permission.objects.all()[:5])
+        groups = []
+        for index in range(25):
+            group = Group.objects.create(name=f"Group {index}")
+            group.permissions.set(permissions)
+            groups.append(group)
+        for index in range(25):
+            staff = User.objects.create_user(f"staff{index}", is_staff=True)
+            staff.groups.set(groups[:3])
+
+    def test_staff_list(self):
+        self.assertConstantQueries(StaffView, "/staffs/")
+
+    def test_group_list(self):
+        self.assertConstantQueries(GroupView, "/groups/")
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Walk every named route of accounts/ and students/ at two data scales, as
+    a superuser and as a view-only staff user, and require the same number
+    of queries at both. Set $QUERY_COUNT_REPORT to a file path to have the
+    per-route counts written there for diffing between releases.
+    """
+
+    scales = (3, 30)
+    urlconfs = (("accounts.urls", "accounts"), ("students.urls", "students"))
+
+    # Route name prefix: queryset the pk of an edit/permissions route comes from
+    route_objects = {
+        "metadata": lambda: MetaData.objects.all(),
+        "student": lambda: Student.objects.all(),
+        "instructor": lambda: Instructor.objects.all(),
+        "course": lambda: Course.objects.all(),
+        "enrollment": lambda: Enrollment.objects.all(),
+        "staff": lambda: User.objects.filter(is_staff=True, is_superuser=False),
+        "group": lambda: Group.objects.all(),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        viewers = Group.objects.create(name="viewers")
+        viewers.permissions.set(
+            Permission.objects.filter(
+                content_type__app_label__in=["students", "auth", "accounts"],
+                codename__startswith="view_",
+            )
+        )
+        cls.staff = User.objects.create_user("viewer", is_staff=True)
+        cls.staff.groups.add(viewers)
+
+    def seed(self, scale):
+        """Top the tables up to ``scale`` rows each, with related rows"""
+        metadata = list(MetaData.objects.all()[:3])
+        while len(metadata) < 3:
+            metadata.append(
+                MetaData.objects.create(key=f"key{len(metadata)}", value="value")
+            )
+
+        for index in range(Course.objects.count(), scale):
+            course = Course.objects.create(name=f"Course {index}", course_code=f"CS{100 + index}")
+            course.metadata.set(metadata)
+        courses = list(Course.objects.order_by("pk")[:3])
+
+        for index in range(Student.objects.count(), scale):
+            student = Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+            )
+            student.metadata.set(metadata)
+            for course in courses:
+                enrollment = Enrollment.objects.create(student=student, course=course)
+                enrollment.metadata.set(metadata)
+
+        for index in range(Instructor.objects.count(), scale):
+            instructor = Instructor.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"instructor{index}@example.com",
+            )
+            instructor.courses.set(courses)
+            instructor.metadata.set(metadata)
+
+        groups = list(Group.objects.order_by("pk")[:3])
+        for index in range(Group.objects.count(), scale):
+            group = Group.objects.create(name=f"Group {index}")
+            group.permissions.set(Permission.objects.all()[:5])
+        for index in range(User.objects.filter(is_staff=True).count(), scale):
+            staff = User.objects.create_user(f"staff{index}", is_staff=True)
+            staff.groups.set(groups)
+
+    def route_kwargs(self, name, arguments):
+        for prefix, queryset in self.route_objects.items():
+            if name.startswith(prefix) and arguments == ("pk",):
+                obj = queryset().order_by("pk").first()
+                return {"pk": obj.pk} if obj else None
+        return None
+
+    def walk(self, user):
+        self.client.force_login(user)
+        cache.clear()
+        report = {}
+        for urlconf, namespace in self.urlconfs:
+            report.update(walk_routes(self.client, urlconf, namespace, self.route_kwargs))
+        return report
+
+    def test_query_counts_stay_flat(self):
+        users = {"superuser": self.superuser, "staff": self.staff}
+        reports = {}
+        for scale in self.scales:
+            self.seed(scale)
+            reports[scale] = {label: self.walk(user) for label, user in users.items()}
+
+        # Only written on request, a test run must not change the working tree
+        report_path = os.environ.get("QUERY_COUNT_REPORT")
+        if report_path:
+            write_report(report_path, {str(scale): report for scale, report in reports.items()})
+
+        small, large = (reports[scale] for scale in self.scales)
+        for label in users:
+            for name, result in small[label].items():
+                with self.subTest(user=label, route=name):
+                    self.assertLess(result["status"], 500)
+                    self.assertEqual(
+                        result["queries"],
+                        large[label][name]["queries"],
+                        f"{result['url']} query count grows with the data",
+                    )
+
+
+class CurrentUserMiddlewareTests(SimpleTestCase):
+    """The request's user is visible while it is handled, and only then"""
+
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        self.request.user = User(username="clerk")
+        self.seen = []
+
+    def test_no_user_outside_a_request(self):
+        self.assertIsNone(get_current_user())
+
+    def test_sync_request(self):
+        def get_response(request):
+            self.seen.append(get_current_user())
+            return HttpResponse()
+
+        CurrentUserMiddleware(get_response)(self.request)
+        self.assertEqual(self.seen, [self.request.user])
+        self.assertIsNone(get_current_user())
+
+    def test_sync_request_that_raises(self):
+        def get_response(request):
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            CurrentUserMiddleware(get_response)(self.request)
+        self.assertIsNone(get_current_user())
+
+    async def test_async_request(self):
+        async def get_response(request):
+            self.seen.append(get_current_user())
+            return HttpResponse()
+
+        await CurrentUserMiddleware(get_response)(self.request)
+        self.assertEqual(self.seen, [self.request.user])
+        self.assertIsNone(get_current_user())
+
+    async def test_async_request_that_raises(self):
+        async def get_response(request):
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            await CurrentUserMiddleware(get_response)(self.request)
+        self.assertIsNone(get_current_user())
+
+
+class BulkToggleTests(TestCase):
+    """/toggle/<model>/bulk/ changes many rows with one UPDATE, within limits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.clerk = User.objects.create_user("clerk", "clerk@example.com", "pw", is_staff=True)
+        cls.students = [
+            Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+                is_active=index < 2,
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def toggle(self, payload, model_name="student"):
+        return self.client.post(
+            f"/toggle/{model_name}/bulk/", json.dumps(payload), content_type="application/json"
+        )
+
+    def active(self, model=Student):
+        return set(model.objects.filter(is_active=True).values_list("pk", flat=True))
+
+    def test_ids(self):
+        active, _, inactive = self.students
+        response = self.toggle({"ids": [active.pk, inactive.pk, 999999], "value": False})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual(
+            data["results"],
+            {str(active.pk): "updated", str(inactive.pk): "unchanged", "999999": "not_found"},
+        )
+        self.assertEqual(self.active(), {self.students[1].pk})
+
+    def test_filter(self):
+        response = self.toggle({"filter": "active_status=true", "value": "false"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 2)
+        self.assertEqual(self.active(), set())
+
+    def test_own_account_is_skipped(self):
+        response = self.toggle({"ids": [self.admin.pk, self.clerk.pk], "value": False}, "user")
+        self.assertEqual(
+            response.json()["results"],
+            {str(self.admin.pk): "skipped", str(self.clerk.pk): "updated"},
+        )
+        self.assertEqual(self.active(User), {self.admin.pk})
+
+    def test_max_objects(self):
+        with mock.patch.object(GenericBulkToggleView, "max_objects", 1):
+            by_ids = self.toggle({"ids": [student.pk for student in self.students], "value": True})
+            by_filter = self.toggle({"filter": "", "value": True})
+        self.assertEqual(by_ids.status_code, 400)
+        self.assertEqual(by_filter.status_code, 400)
+        self.assertEqual(len(self.active()), 2)
+
+    def test_permission_denied(self):
+        self.client.force_login(self.clerk)
+        response = self.toggle({"ids": [self.students[0].pk], "value": False})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(self.active()), 2)
+
+    def test_invalid_requests(self):
+        for payload in (
+            {"filter": 5, "value": False},
+            {"ids": ["x"], "value": False},
+            {"ids": [self.students[0].pk], "value": "maybe"},
+            {"value": False},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.toggle(payload).status_code, 400)
+
+    def test_counters_and_audit_fields(self):
+        before = get_dashboard_stats().active_students
+        student = self.students[0]
+        last_updated = student.updated_at
+        self.toggle({"ids": [student.pk], "value": False})
+
+        stats = DashboardStats.objects.get(pk=DashboardStats.SINGLETON_PK)
+        self.assertEqual(stats.active_students, before - 1)
+        student.refresh_from_db()
+        self.assertEqual(student.updated_by, self.admin)
+        self.assertGreater(student.updated_at, last_updated)
+
+
+class ChangeHistoryTests(TestCase):
+    """Writes are diffed into history records, stored once committed"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.clerk = User.objects.create_user("clerk", "clerk@example.com", "pw", is_staff=True)
+        cls.student = Student.objects.create(
+            first_name="First",
+            last_name="Last",
+            email="student@example.com",
+            date_of_birth=date(2000, 1, 1),
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Records are stored by the test calling flush(), not by the thread
+        patcher = mock.patch.object(history_writer, "_start")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        history_writer._pending = []
+
+    def history(self, obj):
+        history_writer.flush()
+        return list(
+            ChangeHistory.objects.filter(
+                content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk
+            )
+            .order_by("id")
+            .values_list("action", "changes")
+        )
+
+    def record(self, **overrides):
+        return {
+            "model": "students.student",
+            "object_id": self.student.pk,
+            "action": ChangeHistory.UPDATE,
+            "changes": {"remarks": [None, "x"]},
+            "user_id": None,
+            "created_at": timezone.now(),
+            **overrides,
+        }
+
+    def test_save_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            student = Student.objects.create(
+                first_name="New", last_name="Student", email="new@example.com",
+                date_of_birth=date(2001, 2, 3),
+            )
+            student.first_name = "Renamed"
+            student.save()
+            loaded = Student.objects.get(pk=student.pk)
+            loaded.save()  # Nothing changed, nothing recorded
+            loaded.last_name = "Changed"
+            loaded.save(update_fields=["last_name"])
+            loaded.delete()
+
+        records = self.history(student)
+        self.assertEqual(
+            [action for action, _ in records],
+            [ChangeHistory.CREATE, ChangeHistory.UPDATE, ChangeHistory.UPDATE, ChangeHistory.DELETE],
+        )
+        self.assertEqual(records[0][1]["first_name"], [None, "New"])
+        self.assertEqual(records[1][1], {"first_name": ["New", "Renamed"]})
+        self.assertEqual(records[2][1], {"last_name": ["Student", "Changed"]})
+        self.assertEqual(records[3][1]["last_name"], ["Changed", None])
+
+    def test_bulk_update(self):
+        students = list(Student.objects.all())
+        for student in students:
+            student.first_name = "Bulk"
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.bulk_update(students, ["first_name"])
+        self.assertEqual(
+            self.history(self.student),
+            [(ChangeHistory.UPDATE, {"first_name": ["First", "Bulk"]})],
+        )
+
+    def test_rolled_back_changes_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                self.student.first_name = "Rolled back"
+                self.student.save()
+                raise DatabaseError
+        self.assertEqual(self.history(self.student), [])
+
+    def test_ignored_fields(self):
+        user = User.objects.get(pk=self.clerk.pk)
+        user.set_password("new password")
+        user.last_login = timezone.now()
+        user.first_name = "Clerk"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertEqual(self.history(user), [(ChangeHistory.UPDATE, {"first_name": ["", "Clerk"]})])
+
+    def test_failed_batch_is_stored_one_by_one(self):
+        history_writer.put([
+            self.record(),
+            self.record(model="students.nosuchmodel"),
+            self.record(changes={"remarks": ["x", "y"]}),
+        ])
+        with self.assertLogs("accounts.change_history", "WARNING") as logs:
+            self.assertEqual(history_writer.flush(), 2)
+        self.assertEqual(len(logs.records), 2)  # The batch, then the bad record
+        self.assertEqual(len(self.history(self.student)), 2)
+
+    def test_unavailable_database_keeps_the_records(self):
+        records = [self.record(), self.record()]
+        history_writer.put(records)
+        with mock.patch.object(
+            ChangeHistory.objects, "bulk_create", side_effect=OperationalError
+        ), mock.patch.object(ChangeHistory, "save", side_effect=OperationalError):
+            with self.assertLogs("accounts.change_history", "WARNING"):
+                self.assertEqual(history_writer.flush(), 0)
+        self.assertEqual(history_writer._pending, records)
+        self.assertEqual(history_writer.flush(), 2)
+
+    def test_history_page_permission(self):
+        url = f"/history/student/{self.student.pk}/"
+        self.client.force_login(self.clerk)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.clerk.user_permissions.add(Permission.objects.get(codename="view_student"))
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get("/history/nosuchmodel/1/").status_code, 404)
+
+
+class AsyncViewTests(TestCase):
+    """The async endpoints keep their login, permission and write behaviour"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.clerk = User.objects.create_user("clerk", "clerk@example.com", "pw", is_staff=True)
+        cls.student = Student.objects.create(
+            first_name="First",
+            last_name="Last",
+            email="student@example.com",
+            date_of_birth=date(2000, 1, 1),
+        )
+        cls.course = Course.objects.create(name="Course", course_code="CS100")
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_anonymous_users_are_redirected(self):
+        for method, url in (
+            ("get", "/dashboard/stats/"),
+            ("post", f"/toggle/student/{self.student.pk}/"),
+            ("get", f"/check-enrollment/?student={self.student.pk}&course={self.course.pk}"),
+        ):
+            with self.subTest(url=url):
+                response = await getattr(self.async_client, method)(url)
+                self.assertEqual(response.status_code, 302)
+                self.assertIn("login", response["Location"])
+
+    async def test_dashboard_stats(self):
+        with mock.patch.object(
+            AsyncLoginRequiredMixin,
+            "ahas_perms",
+            autospec=True,
+            side_effect=AsyncLoginRequiredMixin.ahas_perms,
+        ) as ahas_perms:
+            await self.async_client.aforce_login(self.clerk)
+            denied = await self.async_client.get("/dashboard/stats/")
+            await self.async_client.aforce_login(self.admin)
+            allowed = await self.async_client.get("/dashboard/stats/")
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(allowed.status_code, 200)
+        self.assertEqual(ahas_perms.call_count, 2)
+        self.assertEqual(ahas_perms.call_args.args[1:], ("accounts.view_dashboard",))
+        self.assertEqual(json.loads(allowed.content)["stats"]["active_students"], 1)
+
+    async def test_toggle(self):
+        url = f"/toggle/student/{self.student.pk}/"
+        with mock.patch.object(
+            User, "ahas_perm", autospec=True, side_effect=User.ahas_perm
+        ) as ahas_perm:
+            await self.async_client.aforce_login(self.clerk)
+            denied = await self.async_client.post(url)
+        self.assertEqual(denied.status_code, 403)
+        ahas_perm.assert_called_with(mock.ANY, "students.change_student")
+
+        before = (await sync_to_async(get_dashboard_stats)()).active_students
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(json.loads(response.content)["is_active"], False)
+
+        # Moved by the post_save handler, in _save_toggle's worker thread
+        stats = await DashboardStats.objects.aget(pk=DashboardStats.SINGLETON_PK)
+        self.assertEqual(stats.active_students, before - 1)
+        student = await Student.objects.aget(pk=self.student.pk)
+        self.assertFalse(student.is_active)
+        self.assertEqual(student.updated_by_id, self.admin.pk)
+
+    async def test_check_enrollment(self):
+        await self.async_client.aforce_login(self.clerk)
+        response = await self.async_client.get(
+            "/check-enrollment/", {"student": self.student.pk, "course": self.course.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {"exists": False, "enrollment_details": None})
@@ -1,10 +1,11 @@
 from django.urls import path
 
 from accounts.views.authentication_views import LoginView, LogoutView
-from accounts.views.dashboard_views import DashboardView
+from accounts.views.dashboard_views import DashboardStatsView, DashboardView
 from accounts.views.group_views import GroupView
+from accounts.views.history_views import ObjectHistoryView
 from accounts.views.staff_views import StaffView
-from accounts.views.toggle_views import GenericToggleWithObjectPermissionView
+from accounts.views.toggle_views import GenericBulkToggleView, GenericToggleWithObjectPermissionView
 
 
 app_name = "accounts"
@@ -16,6 +17,7 @@ urlpatterns = [
 
     # DASHBOARD
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("dashboard/stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
 
     # STAFF MANAGEMENT
     path("staffs/", StaffView.as_view(), name="staffs"),
@@ -31,6 +33,10 @@ urlpatterns = [
     path("groups/<int:pk>/permissions/", GroupView.as_view(), name="group-manage-permissions"),
 
 
+    # CHANGE HISTORY
+    path("history/<str:model_name>/<int:pk>/", ObjectHistoryView.as_view(), name="object-history"),
+
     # toggle
      path('toggle/<str:model_name>/<int:pk>/', GenericToggleWithObjectPermissionView.as_view(), name='generic_toggle_field'),
+     path('toggle/<str:model_name>/bulk/', GenericBulkToggleView.as_view(), name='generic_bulk_toggle'),
 ]
@@ -1,10 +1,12 @@
 import logging
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.shortcuts import render
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from students.models import Student, Course, Enrollment
-from django.contrib.auth.models import User
+from accounts.dashboard_stats import aget_dashboard_stats, get_dashboard_stats
+from utilities.async_mixins import AsyncLoginRequiredMixin
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
 
@@ -29,34 +31,17 @@ class DashboardView(LoginRequiredMixin, View):
         return render(request, "dashboard.html", context)
 
     def get_system_stats(self):
-        """Calculate and return system statistics"""
-        # Student statistics
-        total_students = Student.objects.count()
-        active_students = Student.objects.filter(is_active=True).count()
-
-        # Course statistics
-        total_courses = Course.objects.count()
-        active_courses = Course.objects.filter(is_active=True).count()
-
-        # Enrollment statistics
-        total_enrollments = Enrollment.objects.count()
-        active_enrollments = Enrollment.objects.filter(is_active=True).count()
-     
-
-        # Staff/Instructor statistics (assuming User model has is_staff or similar field)
-        total_staff = User.objects.filter(is_staff=True).count()
-        active_staff = User.objects.filter(is_staff=True, is_active=True).count()
-
-     
-       
-       
-        return {
-            "total_students": total_students,
-            "active_students": active_students,
-            "total_courses": total_courses,
-            "active_courses": active_courses,
-            "total_enrollments": total_enrollments,
-            "active_enrollments": active_enrollments,
-            "total_staff": total_staff,
-            "active_staff": active_staff,
-        }
+        """Return system statistics from the maintained counters row"""
+        return get_dashboard_stats().as_dict()
+
+
+class DashboardStatsView(AsyncLoginRequiredMixin, View):
+    """Dashboard counters as JSON, served without holding a worker"""
+
+    async def get(self, request):
+        if not await self.ahas_perms("accounts.view_dashboard"):
+            raise PermissionDenied
+        stats = await aget_dashboard_stats()
+        return JsonResponse(
+            {"success": True, "stats": stats.as_dict(), "updated_at": stats.updated_at}
+        )
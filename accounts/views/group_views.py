@@ -5,10 +5,11 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Prefetch
 from django.contrib.auth.models import Group, Permission
 
 from accounts.forms.group_form import GroupForm
+from utilities.filters import filter_relation
 from utilities.pagination_mixin import PaginatedListMixin
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
@@ -23,6 +24,7 @@ class GroupView(LoginRequiredMixin, PaginatedListMixin, View):
     login_url = "/login/"
     redirect_field_name = "next"
     paginate_by = 15  # Override default pagination
+    list_prefetch = (Prefetch("permissions", queryset=Permission.objects.only("id")),)
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -79,11 +81,11 @@ class GroupView(LoginRequiredMixin, PaginatedListMixin, View):
         permission_filter = request.GET.get("has_permissions")
         if permission_filter:
             if permission_filter.lower() == "true":
-                queryset = queryset.filter(permissions__isnull=False)
+                queryset = filter_relation(queryset, "permissions__isnull", False)
             elif permission_filter.lower() == "false":
-                queryset = queryset.filter(permissions__isnull=True)
+                queryset = filter_relation(queryset, "permissions__isnull", True)
 
-        return queryset.distinct().order_by("name")
+        return queryset.order_by("name")
 
     def group_list(self, request):
         """Display paginated list of groups"""
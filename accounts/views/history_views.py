@@ -0,0 +1,65 @@
+import logging
+from django.apps import apps
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.shortcuts import render
+from django.views import View
+
+from accounts.change_history import history_writer
+from accounts.models import ChangeHistory
+from utilities.pagination_mixin import PaginatedListMixin
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectHistoryView(LoginRequiredMixin, PaginatedListMixin, View):
+    """
+    Recorded changes of one object, newest first.
+    URL pattern: /history/<str:model_name>/<int:pk>/
+    """
+
+    login_url = "/login/"
+    redirect_field_name = "next"
+    paginate_by = 25
+    pagination_mode = "keyset"  # Walks the (content type, object, created_at) index
+    keyset_ordering = ("-created_at", "-id")
+
+    # URL model name: (model label, list page url name)
+    HISTORY_MODELS = {
+        "user": ("auth.User", "accounts:staffs"),
+        "student": ("students.Student", "students:students"),
+        "instructor": ("students.Instructor", "students:instructors"),
+        "course": ("students.Course", "students:courses"),
+        "enrollment": ("students.Enrollment", "students:enrollments"),
+        "metadata": ("students.MetaData", "students:metadata"),
+    }
+
+    def get(self, request, model_name, pk):
+        if model_name not in self.HISTORY_MODELS:
+            raise Http404(f"No history for {model_name}")
+        label, list_url_name = self.HISTORY_MODELS[model_name]
+        model = apps.get_model(label)
+        opts = model._meta
+        if not request.user.has_perm(f"{opts.app_label}.view_{opts.model_name}"):
+            raise PermissionDenied
+
+        # Records of this process still waiting for the background writer
+        history_writer.flush()
+
+        obj = model._base_manager.filter(pk=pk).first()
+        queryset = ChangeHistory.objects.filter(
+            content_type=ContentType.objects.get_for_model(model), object_id=pk
+        ).select_related("user")
+        pagination_context = self.get_pagination_context(request, queryset)
+
+        context = {
+            **pagination_context,
+            "object": obj,  # None once deleted, the history remains
+            "object_id": pk,
+            "model_name": model_name,
+            "verbose_name": opts.verbose_name.title(),
+            "list_url_name": list_url_name,
+        }
+        return render(request, "accounts/history/object_history.html", context)
@@ -5,9 +5,11 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.contrib.auth.models import User, Group
-from django.db.models import Q
+from django.contrib.auth.models import Group, User
+from django.db.models import Prefetch, Q
 from accounts.forms.staff_form import StaffForm
+from accounts.reference_data import group_list
+from utilities.filters import filter_relation
 from utilities.pagination_mixin import PaginatedListMixin
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
@@ -22,6 +24,10 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
     login_url = "/login/"
     redirect_field_name = "next"
     paginate_by = 10  # Override default pagination
+    pagination_mode = "keyset"  # Seek pagination keeps deep pages cheap
+    keyset_ordering = ("-date_joined", "id")
+    count_strategy = "cached"  # Exact count, cached until the model is written
+    list_prefetch = (Prefetch("groups", queryset=Group.objects.only("name")),)
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -64,7 +70,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
         # Group filter
         group_filter = request.GET.get("group")
         if group_filter:
-            queryset = queryset.filter(groups__name=group_filter)
+            queryset = filter_relation(queryset, "groups__name", group_filter)
 
         # Status filter
         status_filter = request.GET.get("active_status")
@@ -82,7 +88,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
                 | Q(email__icontains=search_query)
             )
 
-        return queryset.distinct().order_by("-date_joined")
+        return queryset.order_by("-date_joined")
 
     @method_decorator(permission_required("auth.view_user", raise_exception=True))
     def staff_list(self, request):
@@ -94,7 +100,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
         pagination_context = self.get_pagination_context(request, filtered_queryset)
 
         # Additional context
-        groups = Group.objects.all()
+        groups = group_list.all()
 
         context = {
             **pagination_context,
@@ -112,7 +118,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
     def add_staff(self, request):
         """Display add staff form"""
         form = StaffForm(is_editing=False)  # Pass is_editing=False for new staff
-        groups = Group.objects.all()
+        groups = group_list.all()
 
         context = {
             "form": form,
@@ -189,7 +195,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
 
         # If we reach here and it's not AJAX, render the form with errors
         if not is_ajax:
-            groups = Group.objects.all()
+            groups = group_list.all()
             context = {
                 "form": form,
                 "groups": groups,
@@ -205,7 +211,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
 
         form = StaffForm(instance=user, is_editing=True)  
        
-        groups = Group.objects.all()
+        groups = group_list.all()
 
         context = {
             "form": form,
@@ -278,7 +284,7 @@ class StaffView(LoginRequiredMixin, PaginatedListMixin, View):
 
         # If we reach here and it's not AJAX, render the form with errors
         if not is_ajax:
-            groups = Group.objects.all()
+            groups = group_list.all()
             context = {
                 "form": form,
                 "groups": groups,
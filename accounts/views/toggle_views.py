@@ -1,12 +1,22 @@
 # views.py
+import copy
+import json
+
+from asgiref.sync import sync_to_async
 from django.apps import apps
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+from django.http import JsonResponse, QueryDict
+from django.utils.module_loading import import_string
 from django.views import View
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 import logging
 
+from accounts.change_history import record_changes
+from accounts.dashboard_stats import TRACKED_MODELS, adjust_stats
+from utilities.async_mixins import AsyncLoginRequiredMixin
+from utilities.cache_versions import bump_model_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,37 +26,43 @@ class GenericToggleView(LoginRequiredMixin, View):
     URL pattern: /api/toggle/<str:model_name>/<int:pk>/<str:field_name>/
     """
 
-    # Define which models and fields are allowed to be toggled
+    # Define which models and fields are allowed to be toggled. "list_view"
+    # is the list page whose filters a bulk toggle can select rows with.
     ALLOWED_TOGGLES = {
         "user": {
             "model": "auth.User",  # app_label.ModelName
             "fields": ["is_active"],
             "permission_required": "auth.change_user",
             "display_name_field": "username",
+            "list_view": "accounts.views.staff_views.StaffView",
         },
         "student": {
             "model": "students.Student",
             "fields": ["is_active"],
             "permission_required": "students.change_student",
             "display_name_field": "first_name",
+            "list_view": "students.views.student_views.StudentView",
         },
          "instructor": {
             "model": "students.Instructor",
             "fields": ["is_active"],
             "permission_required": "students.change_instructor",
             "display_name_field": "first_name",  
+            "list_view": "students.views.instructor_views.InstructorView",
         },
         "course": {
             "model": "students.Course",
             "fields": ["is_active"],
             "permission_required": "students.change_course",
             "display_name_field": "name",
+            "list_view": "students.views.course_views.CourseView",
         },
         "enrollment": {
             "model": "students.Enrollment",
             "fields": ["is_active"],
             "permission_required": "students.change_enrollment",
             "display_name_field": "Enrollment Name",
+            "list_view": "students.views.enrollment_views.EnrollmentView",
         },
        
         "metadata": {
@@ -54,6 +70,7 @@ class GenericToggleView(LoginRequiredMixin, View):
             "fields": ["is_active"],
             "permission_required": "students.change_metadata",
             "display_name_field": "key",  
+            "list_view": "students.views.metadata_views.MetaDataView",
         },
     }
 
@@ -82,29 +99,37 @@ class GenericToggleView(LoginRequiredMixin, View):
         return model_class.objects.get(pk=pk)
 
 
-class GenericToggleWithObjectPermissionView(GenericToggleView):
+class GenericToggleWithObjectPermissionView(AsyncLoginRequiredMixin, GenericToggleView):
     """
     Extended version that also checks object-level permissions
     Useful if you have object-level permissions set up
+
+    Async: the toggle buttons of every list call it, so it shouldn't hold a
+    worker while it waits on the database. The write itself, with its
+    signal handlers, runs in one transaction in a worker thread.
     """
 
-    def _check_permissions(self, user, model_name, instance=None):
+    async def _check_permissions(self, user, model_name, instance=None):
         """Check both model-level and object-level permissions"""
+        permission_required = self.ALLOWED_TOGGLES[model_name]["permission_required"]
         # Check model-level permission first
-        if not super()._check_permissions(user, model_name):
+        if not await user.ahas_perm(permission_required):
             return False
 
         # If instance is provided, check object-level permissions
-        if instance and hasattr(user, "has_perm"):
-            permission_required = self.ALLOWED_TOGGLES[model_name][
-                "permission_required"
-            ]
-
-            return user.has_perm(permission_required)
+        if instance and hasattr(user, "ahas_perm"):
+            return await user.ahas_perm(permission_required)
 
         return True
 
-    def post(self, request, model_name, pk, field_name="is_active"):
+    @staticmethod
+    @sync_to_async
+    def _save_toggle(instance, field_name, value):
+        with transaction.atomic():
+            setattr(instance, field_name, value)
+            instance.save(update_fields=[field_name])
+
+    async def post(self, request, model_name, pk, field_name="is_active"):
         """Override to include object-level permission check"""
         try:
             if not self._is_toggle_allowed(model_name, field_name):
@@ -117,9 +142,9 @@ class GenericToggleWithObjectPermissionView(GenericToggleView):
                 )
 
             model_class = self._get_model_class(model_name)
-            instance = self._get_instance(model_class, pk)
+            instance = await model_class.objects.aget(pk=pk)
 
-            if not self._check_permissions(request.user, model_name, instance):
+            if not await self._check_permissions(request.user, model_name, instance):
                 return JsonResponse(
                     {
                         "success": False,
@@ -132,9 +157,7 @@ class GenericToggleWithObjectPermissionView(GenericToggleView):
             display_name = getattr(instance, display_name_field, f"{model_name} #{pk}")
             old_value = getattr(instance, field_name)
             new_value = not old_value
-            with transaction.atomic():
-                setattr(instance, field_name, new_value)
-                instance.save(update_fields=[field_name])
+            await self._save_toggle(instance, field_name, new_value)
 
             action = "activated" if new_value else "deactivated"
             logger.info(
@@ -170,3 +193,164 @@ class GenericToggleWithObjectPermissionView(GenericToggleView):
                 },
                 status=500,
             )
+
+
+class GenericBulkToggleView(GenericToggleView):
+    """
+    Set a boolean field on many objects at once.
+    URL pattern: /toggle/<str:model_name>/bulk/
+
+    POST (JSON or form data) either "ids", a list of primary keys, or
+    "filter", the query string of the model's list page, plus "value"
+    (true/false) and optionally "field" (default is_active). Permissions are
+    checked once and the rows are written with a single UPDATE; the
+    response maps every ID to "updated", "unchanged", "not_found" or
+    "skipped".
+    """
+
+    max_objects = 10000  # Larger selections must be narrowed down first
+
+    def _get_payload(self, request):
+        if request.content_type == "application/json":
+            try:
+                payload = json.loads(request.body or b"{}")
+            except ValueError:
+                return None
+            return payload if isinstance(payload, dict) else None
+        return {
+            "ids": request.POST.getlist("ids"),
+            "filter": request.POST.get("filter"),
+            "value": request.POST.get("value"),
+            "field": request.POST.get("field"),
+        }
+
+    def _parse_value(self, value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ("true", "1"):
+            return True
+        if isinstance(value, str) and value.lower() in ("false", "0"):
+            return False
+        return None
+
+    def _get_filtered_queryset(self, request, model_name, filter_string):
+        """The rows the model's list page shows for a filter query string"""
+        list_view = import_string(self.ALLOWED_TOGGLES[model_name]["list_view"])()
+        filter_request = copy.copy(request)
+        filter_request.GET = QueryDict(filter_string)
+        filtered = list_view.get_filtered_queryset(filter_request)
+        # Re-select by pk so the rows can be locked whatever the filters joined
+        return filtered.model._base_manager.filter(pk__in=filtered.order_by().values("pk"))
+
+    def _error(self, message, status):
+        return JsonResponse({"success": False, "message": message}, status=status)
+
+    def post(self, request, model_name):
+        payload = self._get_payload(request)
+        if payload is None:
+            return self._error("Invalid request body", 400)
+
+        field_name = payload.get("field") or "is_active"
+        if not self._is_toggle_allowed(model_name, field_name):
+            return self._error(f"Toggle not allowed for {model_name}.{field_name}", 403)
+        if not self._check_permissions(request.user, model_name):
+            return self._error("You do not have permission to perform this action", 403)
+
+        value = self._parse_value(payload.get("value"))
+        if value is None:
+            return self._error("value must be true or false", 400)
+
+        ids = payload.get("ids") or []
+        filter_string = payload.get("filter")
+        if filter_string is not None and not isinstance(filter_string, str):
+            return self._error("filter must be a query string", 400)
+        if not isinstance(ids, list) or (not ids and filter_string is None):
+            return self._error("Send a list of ids or a list filter", 400)
+
+        model_class = self._get_model_class(model_name)
+        try:
+            if ids:
+                requested = {int(pk) for pk in ids}
+                queryset = model_class._base_manager.filter(pk__in=requested)
+            else:
+                requested = set()
+                queryset = self._get_filtered_queryset(request, model_name, filter_string)
+        except (TypeError, ValueError):
+            return self._error("ids must be integers", 400)
+
+        if len(requested) > self.max_objects:
+            return self._error(f"At most {self.max_objects} objects can be changed at once", 400)
+
+        try:
+            results = self._bulk_update(request.user, model_class, queryset, field_name, value)
+        except ValueError as e:
+            return self._error(str(e), 400)
+        except Exception as e:
+            logger.error(f"Error bulk toggling {model_name}: {str(e)}")
+            return self._error("An error occurred while updating the status", 500)
+
+        for pk in requested - results.keys():
+            results[pk] = "not_found"
+
+        updated = sum(result == "updated" for result in results.values())
+        action = "activated" if value else "deactivated"
+        if field_name != "is_active":
+            action = f"set {field_name} to {value} on"
+        logger.info(
+            f"User {request.user.username} {action} {updated} {model_name} object(s)"
+        )
+
+        return JsonResponse(
+            {
+                "success": True,
+                "message": f"{updated} {model_name}(s) {action}.",
+                "model_name": model_name,
+                field_name: value,
+                "updated": updated,
+                "results": {str(pk): result for pk, result in sorted(results.items())},
+            }
+        )
+
+    def _bulk_update(self, user, model_class, queryset, field_name, value):
+        """Set the field on every row of the queryset with one UPDATE"""
+        label = model_class._meta.label_lower
+        _, active_field, scope = TRACKED_MODELS.get(label, (None, None, {}))
+
+        with transaction.atomic():
+            rows = list(
+                queryset.order_by()
+                .select_for_update()
+                .values_list("pk", field_name, *scope)[: self.max_objects + 1]
+            )
+            if len(rows) > self.max_objects:
+                raise ValueError(
+                    f"The filter matches more than {self.max_objects} objects, narrow it down first"
+                )
+
+            results, to_update, counted = {}, [], 0
+            for pk, current, *scope_values in rows:
+                if current == value:
+                    results[pk] = "unchanged"
+                elif label == "auth.user" and pk == user.pk and field_name == "is_active":
+                    # Nobody deactivates their own account from a bulk action
+                    results[pk] = "skipped"
+                else:
+                    results[pk] = "updated"
+                    to_update.append(pk)
+                    counted += scope_values == list(scope.values())
+
+            if to_update:
+                # The default manager of BaseModel subclasses stamps
+                # updated_at/updated_by, see utilities.models.BaseQuerySet
+                model_class._default_manager.filter(pk__in=to_update).update(**{field_name: value})
+
+                # QuerySet.update() sends no signals
+                if active_field and field_name == "is_active":
+                    adjust_stats(**{active_field: counted if value else -counted})
+                record_changes(
+                    model_class, {pk: {field_name: [not value, value]} for pk in to_update}
+                )
+
+        if to_update:
+            bump_model_version(model_class)
+        return results
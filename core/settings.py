@@ -18,6 +18,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Local apps
     "students",
     "accounts",
@@ -72,6 +73,20 @@ DATABASES = {
         },
     }
 }
+# -------------------------------------------------------------------
+# CACHE CONFIG
+# -------------------------------------------------------------------
+# Point this at a shared backend (e.g. Redis) in production so cached counts
+# and their invalidation are seen by every worker process.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="student-management-system"),
+    }
+}
+
 # -------------------------------------------------------------------
 # AUTH & PASSWORD VALIDATION
 # -------------------------------------------------------------------
@@ -82,6 +97,11 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# Permission sets are cached across requests, see accounts.backends
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.CachedPermissionBackend",
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -101,6 +121,16 @@ STATIC_ROOT = BASE_DIR / "staticfiles"   # for collectstatic in production
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# A full gradebook page posts 5 fields for each of its 500 rows
+DATA_UPLOAD_MAX_NUMBER_FIELDS = 3000
+
+# Change history records are written in batches by a background thread,
+# every CHANGE_HISTORY_BATCH_SIZE records or CHANGE_HISTORY_FLUSH_INTERVAL
+# milliseconds, see accounts.change_history
+CHANGE_HISTORY_BATCH_SIZE = config("CHANGE_HISTORY_BATCH_SIZE", default=500, cast=int)
+CHANGE_HISTORY_FLUSH_INTERVAL = config("CHANGE_HISTORY_FLUSH_INTERVAL", default=1000, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
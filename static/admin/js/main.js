@@ -174,6 +174,67 @@ async function toggleInstance(modelType, instanceId, instanceName, fieldName, co
     }
 }
 
+/**
+ * Activate or deactivate every row matching the current list filters
+ * @param {Event} event - The click event
+ * @param {string} modelType - The type of model (student, course, etc.)
+ * @param {boolean} value - true to activate, false to deactivate
+ * @param {string} filterString - The list filters as a query string
+ */
+function confirmBulkToggle(event, modelType, value, filterString) {
+    event.preventDefault();
+
+    const actionText = value ? 'activate' : 'deactivate';
+
+    Swal.fire({
+        title: 'Are you sure?',
+        text: `You are about to ${actionText} every ${modelType} matching the current filters. Do you want to continue?`,
+        icon: 'question',
+        showCancelButton: true,
+        confirmButtonColor: value ? '#28a745' : '#dc3545',
+        cancelButtonColor: '#6c757d',
+        confirmButtonText: `Yes, ${actionText} them!`,
+        cancelButtonText: 'Cancel',
+        showLoaderOnConfirm: true,
+        preConfirm: async () => {
+            try {
+                const response = await fetch(`/toggle/${modelType}/bulk/`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCSRFToken(),
+                        'X-Requested-With': 'XMLHttpRequest'
+                    },
+                    body: JSON.stringify({ filter: filterString, value: value })
+                });
+                return await response.json();
+            } catch (error) {
+                return { success: false, message: 'Failed to update status. Please try again.' };
+            }
+        },
+        allowOutsideClick: () => !Swal.isLoading()
+    }).then((result) => {
+        if (result.isConfirmed) {
+            const response = result.value;
+            if (response && response.success) {
+                Swal.fire({
+                    title: 'Updated!',
+                    text: response.message,
+                    icon: 'success',
+                    timer: 2000,
+                    showConfirmButton: false
+                }).then(() => window.location.reload());
+            } else {
+                Swal.fire({
+                    title: 'Error!',
+                    text: (response && response.message) || 'Failed to update status. Please try again.',
+                    icon: 'error'
+                });
+            }
+        }
+    });
+}
+
 /**
  * Update the status badge in the UI after successful toggle
  * @param {string} instanceId - The instance ID
@@ -0,0 +1,60 @@
+/**
+ * Select2 remote autocomplete for selects rendered by the Autocomplete
+ * widgets (students/forms/widgets.py) and the list filters.
+ *
+ * Any <select class="select2-autocomplete" data-autocomplete-url="..."> is
+ * initialised on page load. Only the selected options are in the HTML; the
+ * rest are fetched page by page with ?q=&limit=&cursor= from the endpoint.
+ */
+function initAutocompleteSelects(container) {
+    if (!$.fn.select2) {
+        console.error('Select2 plugin is required for autocomplete selects');
+        return;
+    }
+
+    $(container || document).find('select.select2-autocomplete[data-autocomplete-url]').each(function () {
+        const $select = $(this);
+        if ($select.hasClass('select2-hidden-accessible')) {
+            return; // already initialised
+        }
+
+        $select.select2({
+            theme: 'bootstrap4',
+            width: '100%',
+            placeholder: $select.data('placeholder') || 'Select...',
+            allowClear: true,
+            minimumInputLength: 0,
+            ajax: {
+                url: $select.data('autocomplete-url'),
+                dataType: 'json',
+                delay: 250,
+                data: function (params) {
+                    const query = {
+                        q: params.term || '',
+                        limit: $select.data('limit') || 20,
+                    };
+                    if ($select.data('autocomplete-field')) {
+                        query.field = $select.data('autocomplete-field');
+                    }
+                    // Select2 counts pages; the endpoint pages by cursor
+                    if (params.page && params.page > 1) {
+                        query.cursor = $select.data('nextCursor') || '';
+                    }
+                    return query;
+                },
+                processResults: function (data) {
+                    $select.data('nextCursor', data.next_cursor);
+                    return {
+                        results: data.results,
+                        pagination: { more: data.pagination.more },
+                    };
+                },
+                cache: true,
+            },
+        });
+    });
+}
+
+$(document).ready(function () {
+    initAutocompleteSelects(document);
+});
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from utilities.cache_versions import track_model_versions
+        from utilities.search import install_search_indexes
+
+        # Cached counts and lists are keyed on these versions
+        track_model_versions(*self.get_models())
+
+        # Search column and trigram indexes live outside the migrations
+        post_migrate.connect(install_search_indexes, sender=self)
@@ -0,0 +1,256 @@
+"""
+CSV import of enrollments.
+
+The upload is read as a stream of rows and handled in batches: the student
+emails and course codes of a batch are resolved with one query each, every
+row is validated, and the valid rows are upserted with a single
+bulk_create against the unique (student, course) constraint, whose changes
+to existing enrollments are recorded in the change history. Rows that fail
+validation are skipped and reported with their line number; the rest of the
+file is still imported.
+
+Expected columns (header names are case-insensitive, extra columns are
+ignored, so an enrollment CSV export can be imported back):
+
+    student_email, course_code  required
+    grade, score, completion_date (YYYY-MM-DD), active (true/false)  optional
+"""
+import codecs
+import csv
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from accounts.change_history import record_changes
+from accounts.dashboard_stats import reconcile_model
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from students.models.student_model import Student
+from utilities.bulk_loader import DEFAULT_BATCH_SIZE, batched
+from utilities.cache_versions import bump_model_version
+
+REQUIRED_COLUMNS = ("student_email", "course_code")
+GRADES = {code for code, _ in Enrollment.GRADE_CHOICES}
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n"}
+# Columns an import may change on an existing enrollment; the audit fields
+# are added by BaseQuerySet.bulk_create
+UPSERT_FIELDS = ["grade", "score", "completion_date", "is_active"]
+
+
+def normalize_header(name):
+    return name.strip().lower().replace(" ", "_")
+
+
+class ImportResult:
+    """Counts of an import and the errors of every rejected row"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []  # [{"line": n, "errors": [message, ...]}]
+
+    @property
+    def imported(self):
+        return self.created + self.updated
+
+    def add_error(self, line, *messages):
+        self.errors.append({"line": line, "errors": list(messages)})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+class EnrollmentImporter:
+    """Validate and upsert enrollments from a CSV upload"""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = max(int(batch_size), 1)
+        # email / course code: (pk, is_active), or None when unknown
+        self._students = {}
+        self._courses = {}
+        # (student id, course id): line of the row that already claimed it
+        self._seen = {}
+
+    def read_rows(self, upload):
+        """Yield (line number, row dict) from an uploaded file, one at a time"""
+        try:
+            reader = csv.reader(codecs.iterdecode(upload, "utf-8-sig"))
+            header = [normalize_header(name) for name in next(reader, [])]
+            missing = [column for column in REQUIRED_COLUMNS if column not in header]
+            if missing:
+                raise ValidationError(f"Missing required column(s): {', '.join(missing)}")
+            for values in reader:
+                if not any(value.strip() for value in values):
+                    continue
+                # Short rows leave the trailing columns blank
+                values += [""] * (len(header) - len(values))
+                yield reader.line_num, dict(zip(header, values))
+        except UnicodeDecodeError:
+            raise ValidationError("The file must be UTF-8 encoded CSV.")
+        except csv.Error as e:
+            raise ValidationError(f"Invalid CSV: {e}")
+
+    def import_file(self, upload):
+        """Import every valid row of the upload and return an ImportResult"""
+        result = ImportResult()
+        with transaction.atomic():
+            for batch in batched(self.read_rows(upload), self.batch_size):
+                result.rows += len(batch)
+                self.import_batch(batch, result)
+        if result.imported:
+            # bulk_create sends no signals
+            bump_model_version(Enrollment)
+            reconcile_model(Enrollment)
+        return result
+
+    def resolve(self, model, field, values, known):
+        """Add the (pk, is_active) of unseen ``values`` to ``known``, in one query"""
+        unseen = {value for value in values if value and value not in known}
+        if not unseen:
+            return
+        lookup = f"{field}__in"
+        for value, pk, is_active in model.objects.filter(**{lookup: unseen}).values_list(
+            field, "pk", "is_active"
+        ):
+            known[value] = (pk, is_active)
+        for value in unseen:
+            known.setdefault(value, None)
+
+    def import_batch(self, batch, result):
+        rows = [
+            (line, {key: (value or "").strip() for key, value in row.items()})
+            for line, row in batch
+        ]
+        self.resolve(Student, "email", {row["student_email"] for _, row in rows}, self._students)
+        self.resolve(Course, "course_code", {row["course_code"] for _, row in rows}, self._courses)
+
+        enrollments = []
+        for line, row in rows:
+            enrollment, errors = self.build(line, row)
+            if errors:
+                result.add_error(line, *errors)
+            else:
+                enrollments.append(enrollment)
+        if not enrollments:
+            return
+
+        # One query tells which of the pairs already exist, and what the
+        # upsert will overwrite
+        student_ids = {enrollment.student_id for enrollment in enrollments}
+        course_ids = {enrollment.course_id for enrollment in enrollments}
+        existing = {
+            (student_id, course_id): (pk, dict(zip(UPSERT_FIELDS, values)))
+            for student_id, course_id, pk, *values in Enrollment.objects.filter(
+                student_id__in=student_ids, course_id__in=course_ids
+            ).values_list("student_id", "course_id", "pk", *UPSERT_FIELDS)
+        }
+        changes_by_pk = {}
+        for enrollment in enrollments:
+            match = existing.get((enrollment.student_id, enrollment.course_id))
+            if match is not None:
+                pk, old = match
+                changes_by_pk[pk] = {
+                    name: [value, getattr(enrollment, name)]
+                    for name, value in old.items()
+                    if value != getattr(enrollment, name)
+                }
+        updated = len(changes_by_pk)
+
+        Enrollment.objects.bulk_create(
+            enrollments,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["student", "course"],
+            update_fields=UPSERT_FIELDS,
+        )
+        # bulk_create sends no signals
+        record_changes(Enrollment, changes_by_pk)
+        result.updated += updated
+        result.created += len(enrollments) - updated
+
+    def build(self, line, row):
+        """An unsaved Enrollment for a row, and the row's validation errors"""
+        errors = []
+
+        student_id = self.lookup(
+            self._students, row["student_email"], "student_email", "Student", errors
+        )
+        course_id = self.lookup(
+            self._courses, row["course_code"], "course_code", "Course", errors
+        )
+
+        grade = row.get("grade", "").upper()
+        if grade and grade not in GRADES:
+            errors.append(f"Unknown grade '{row['grade']}'.")
+
+        score = None
+        if row.get("score"):
+            try:
+                score = Decimal(row["score"])
+            except InvalidOperation:
+                errors.append(f"Score '{row['score']}' is not a number.")
+            else:
+                if not score.is_finite() or score < 0 or score > 100:
+                    errors.append("Score must be between 0 and 100.")
+                else:
+                    score = score.quantize(Decimal("0.01"))
+
+        completion_date = None
+        if row.get("completion_date"):
+            try:
+                completion_date = date.fromisoformat(row["completion_date"][:10])
+            except ValueError:
+                errors.append(
+                    f"Completion date '{row['completion_date']}' is not a YYYY-MM-DD date."
+                )
+            else:
+                if not grade:
+                    errors.append("A grade is required when a completion date is provided.")
+
+        is_active = True
+        active = row.get("active", "").lower()
+        if active in FALSE_VALUES:
+            is_active = False
+        elif active and active not in TRUE_VALUES:
+            errors.append(f"Active must be true or false, got '{row['active']}'.")
+
+        if errors:
+            return None, errors
+
+        # A second row for the same pair would hit the same row twice in one upsert
+        first_line = self._seen.setdefault((student_id, course_id), line)
+        if first_line != line:
+            return None, [f"Duplicate of line {first_line}."]
+        return Enrollment(
+            student_id=student_id,
+            course_id=course_id,
+            grade=grade,
+            score=score,
+            completion_date=completion_date,
+            is_active=is_active,
+        ), []
+
+    def lookup(self, known, value, column, label, errors):
+        """The pk for ``value`` or None, recording why it can't be used"""
+        if not value:
+            errors.append(f"{column} is required.")
+            return None
+        match = known.get(value)
+        if match is None:
+            errors.append(f"{label} '{value}' does not exist.")
+            return None
+        pk, is_active = match
+        if not is_active:
+            errors.append(f"{label} '{value}' is inactive.")
+            return None
+        return pk
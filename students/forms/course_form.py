@@ -3,13 +3,16 @@ from django.core.exceptions import ValidationError
 import re
 
 from students.models.metadata_model import MetaData
+from students.forms.widgets import AutocompleteSelectMultiple
 from students.models.course_model import Course
 
 
 class CourseForm(forms.ModelForm):
     metadata = forms.ModelMultipleChoiceField(
         queryset=MetaData.objects.filter(is_active=True),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2bs4'}),
+        widget=AutocompleteSelectMultiple(
+            "students:autocomplete-metadata", placeholder="Select metadata..."
+        ),
         required=False,
         help_text="Select applicable metadata for this course."
     )
@@ -6,12 +6,15 @@ from students.models.enrollment_model import Enrollment
 from students.models.student_model import Student
 from students.models.course_model import Course
 from students.models.metadata_model import MetaData
+from students.forms.widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class EnrollmentForm(forms.ModelForm):
     metadata = forms.ModelMultipleChoiceField(
         queryset=MetaData.objects.filter(is_active=True),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2bs4'}),
+        widget=AutocompleteSelectMultiple(
+            "students:autocomplete-metadata", placeholder="Select metadata..."
+        ),
         required=False,
         help_text="Select applicable metadata for this enrollment."
     )
@@ -20,8 +23,12 @@ class EnrollmentForm(forms.ModelForm):
         model = Enrollment
         fields = ['student', 'course', 'grade', 'score', 'completion_date', 'is_active', 'metadata']
         widgets = {
-            'student': forms.Select(attrs={'class': 'form-control select2bs4'}),
-            'course': forms.Select(attrs={'class': 'form-control select2bs4'}),
+            'student': AutocompleteSelect(
+                "students:autocomplete-students", placeholder="Select a student..."
+            ),
+            'course': AutocompleteSelect(
+                "students:autocomplete-courses", placeholder="Select a course..."
+            ),
             'grade': forms.Select(attrs={'class': 'form-control'}),
             'score': forms.NumberInput(attrs={
                 'class': 'form-control',
@@ -49,6 +56,7 @@ class EnrollmentForm(forms.ModelForm):
         # Set initial values
         if not self.instance.pk:  # New enrollment
             self.fields['is_active'].initial = True
+        # Only used to validate the submitted id; options are loaded remotely
         self.fields['course'].queryset = Course.objects.filter(is_active=True)
         self.fields['student'].queryset = Student.objects.filter(is_active=True)
         # Make student and course required
@@ -145,4 +153,17 @@ class EnrollmentForm(forms.ModelForm):
         if commit:
             enrollment.save()
             self.save_m2m()  # Save many-to-many data (metadata)
-        return enrollment
\ No newline at end of file
+        return enrollment
+
+
+class EnrollmentImportForm(forms.Form):
+    file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control-file', 'accept': '.csv,text/csv'}),
+        help_text='CSV with student_email and course_code columns, and optionally grade, score, completion_date and active.'
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data.get('file')
+        if upload and not upload.name.lower().endswith('.csv'):
+            raise ValidationError('Please upload a .csv file.')
+        return upload
@@ -0,0 +1,61 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from students.models.enrollment_model import Enrollment
+
+
+class GradebookRowForm(forms.Form):
+    """
+    One enrollment row of a course gradebook. The cells post their rendered
+    values back as hidden initial inputs, so has_changed() tells the rows the
+    user edited from the ones they left alone.
+    """
+
+    EDITABLE_FIELDS = ("grade", "score", "completion_date")
+
+    id = forms.IntegerField(widget=forms.HiddenInput)
+    # updated_at of the row when the grid was rendered, for conflict detection
+    version = forms.CharField(widget=forms.HiddenInput)
+    grade = forms.ChoiceField(
+        choices=[('', '—')] + Enrollment.GRADE_CHOICES,
+        required=False,
+        show_hidden_initial=True,
+        widget=forms.Select(attrs={'class': 'form-control form-control-sm'}),
+    )
+    score = forms.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        min_value=0,
+        max_value=100,
+        required=False,
+        show_hidden_initial=True,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control form-control-sm',
+            'min': '0',
+            'max': '100',
+            'step': '0.01'
+        }),
+    )
+    completion_date = forms.DateField(
+        required=False,
+        show_hidden_initial=True,
+        widget=forms.DateInput(attrs={
+            'class': 'form-control form-control-sm',
+            'type': 'date'
+        }),
+    )
+
+    def has_changed(self):
+        """Whether a cell was edited; id and version carry no initial value"""
+        return any(name in self.changed_data for name in self.EDITABLE_FIELDS)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('completion_date') and not cleaned_data.get('grade'):
+            raise ValidationError({
+                'grade': 'A grade is required when a completion date is provided.'
+            })
+        return cleaned_data
+
+
+GradebookFormSet = forms.formset_factory(GradebookRowForm, extra=0)
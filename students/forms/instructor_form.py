@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 import re
 
 from students.models.metadata_model import MetaData
+from students.forms.widgets import AutocompleteSelectMultiple
 from students.models.instructor_model import Instructor
 from students.models.course_model import Course
 
@@ -10,14 +11,18 @@ from students.models.course_model import Course
 class InstructorForm(forms.ModelForm):
     metadata = forms.ModelMultipleChoiceField(
         queryset=MetaData.objects.filter(is_active=True),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2bs4'}),
+        widget=AutocompleteSelectMultiple(
+            "students:autocomplete-metadata", placeholder="Select metadata..."
+        ),
         required=False,
         help_text="Select applicable metadata for this instructor."
     )
     
     courses = forms.ModelMultipleChoiceField(
         queryset=Course.objects.filter(is_active=True),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2bs4'}),
+        widget=AutocompleteSelectMultiple(
+            "students:autocomplete-courses", placeholder="Select courses..."
+        ),
         required=False,
         help_text="Select courses this instructor will teach."
     )
@@ -5,13 +5,16 @@ import re
 from datetime import date
 
 from students.models.metadata_model import MetaData
+from students.forms.widgets import AutocompleteSelectMultiple
 from students.models.student_model import Student
 
 
 class StudentForm(forms.ModelForm):
     metadata = forms.ModelMultipleChoiceField(
         queryset=MetaData.objects.filter(is_active=True),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2bs4'}),
+        widget=AutocompleteSelectMultiple(
+            "students:autocomplete-metadata", placeholder="Select metadata..."
+        ),
         required=False,
         help_text="Select applicable metadata for this student."
     )
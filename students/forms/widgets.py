@@ -0,0 +1,65 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """
+    Select widget that only renders the selected options. The rest are loaded
+    by static/admin/js/utils/autocomplete.js from the JSON endpoint named by
+    ``url_name``, so the page size no longer grows with the table.
+    """
+
+    # select2bs4 is what the form validation scripts look for to place
+    # errors next to the Select2 control instead of the hidden <select>
+    css_class = "form-control select2bs4 select2-autocomplete"
+
+    def __init__(self, url_name, attrs=None, placeholder=None):
+        self.url_name = url_name
+        self.placeholder = placeholder
+        super().__init__(attrs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["class"] = f"{self.css_class} {attrs.get('class', '')}".strip()
+        attrs["data-autocomplete-url"] = reverse(self.url_name)
+        if self.placeholder:
+            attrs["data-placeholder"] = self.placeholder
+        return attrs
+
+    def get_selected_objects(self, value):
+        selected = [item for item in value if item not in ("", None)]
+        if not selected:
+            return []
+        try:
+            return list(self.choices.queryset.filter(pk__in=selected))
+        except (ValueError, ValidationError):
+            # Invalid submitted values; the form field reports the error
+            return []
+
+    def optgroups(self, name, value, attrs=None):
+        options = []
+        if not self.allow_multiple_selected:
+            options.append(self.create_option(name, "", "", False, 0))
+
+        field = self.choices.field
+        for obj in self.get_selected_objects(value):
+            options.append(
+                self.create_option(
+                    name,
+                    field.prepare_value(obj),
+                    field.label_from_instance(obj),
+                    True,
+                    len(options),
+                    attrs=attrs,
+                )
+            )
+        return [(None, options, 0)]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
@@ -18,6 +18,10 @@ class Course(BaseModel):
     description = models.TextField(blank=True)
     metadata = models.ManyToManyField("MetaData", blank=True, related_name="courses")
 
+    # Full-text search, see utilities.search
+    SEARCH_VECTOR_FIELDS = ("name", "course_code", "description")
+    SEARCH_TRIGRAM_FIELDS = ("name", "course_code")
+
     class Meta:
         db_table = 'courses'
         indexes = [
@@ -12,6 +12,10 @@ class Instructor(BaseModel):
     phone_number = models.CharField(max_length=15, blank=True)
     courses = models.ManyToManyField(Course, related_name='instructors', blank=True)
     metadata = models.ManyToManyField("MetaData", blank=True, related_name='instructors')
+
+    # Full-text search, see utilities.search
+    SEARCH_VECTOR_FIELDS = ('first_name', 'last_name', 'email')
+    SEARCH_TRIGRAM_FIELDS = ('first_name', 'last_name', 'email')
     
     class Meta:
         db_table = 'instructors'
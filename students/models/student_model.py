@@ -9,6 +9,10 @@ class Student(BaseModel):
     date_of_birth = models.DateField()
     metadata = models.ManyToManyField("MetaData", blank=True, related_name="students")
 
+    # Full-text search, see utilities.search
+    SEARCH_VECTOR_FIELDS = ("first_name", "last_name", "email")
+    SEARCH_TRIGRAM_FIELDS = ("first_name", "last_name", "email")
+
     class Meta:
         db_table = "students"
         indexes = [
@@ -0,0 +1,7 @@
+"""Reference lists shared by the students views, cached per process"""
+from students.models.course_model import Course
+from students.models.metadata_model import MetaData
+from utilities.reference_cache import ReferenceList
+
+metadata_list = ReferenceList(MetaData.objects.order_by("key", "id"))
+active_courses = ReferenceList(Course.objects.filter(is_active=True))
@@ -1,3 +1,571 @@
-from django.test import TestCase
+import base64
+import io
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+
+from students.enrollment_import import EnrollmentImporter
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+from students.views.course_views import CourseView
+from students.views.enrollment_views import CheckEnrollmentView, EnrollmentView
+from students.views.instructor_views import InstructorView
+from students.views.student_views import StudentView
+from utilities.models import BaseQuerySet
+from utilities.test_mixins import ListQueryCountMixin
+
+
+class ListQueryCountTests(ListQueryCountMixin, TestCase):
+    """List pages must cost the same number of queries whatever their size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        metadata = [
+            MetaData.objects.create(key=f"key{index}", value=f"value{index}")
+            for index in range(3)
+        ]
+        courses = []
+        for index in range(25):
+            course = Course.objects.create(name=f"Course {index}", course_code=f"CS{100 + index}")
+            course.metadata.set(metadata)
+            courses.append(course)
+        for index in range(25):
+            student = Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+            )
+            student.metadata.set(metadata)
+            enrollment = Enrollment.objects.create(student=student, course=courses[index])
+            enrollment.metadata.set(metadata)
+            instructor = Instructor.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"instructor{index}@example.com",
+            )
+            instructor.courses.set(courses[:3])
+            instructor.metadata.set(metadata)
+
+    def test_student_list(self):
+        self.assertConstantQueries(StudentView, "/students/")
+
+    def test_course_list(self):
+        self.assertConstantQueries(CourseView, "/courses/")
+
+    def test_instructor_list(self):
+        self.assertConstantQueries(InstructorView, "/instructors/")
+
+    def test_enrollment_list(self):
+        self.assertConstantQueries(EnrollmentView, "/enrollments/")
+
+
+class AuditStampTests(TestCase):
+    """BaseQuerySet's bulk writes keep the audit fields that save() maintains"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("clerk", "clerk@example.com", "pw")
+        cls.other = User.objects.create_user("other", "other@example.com", "pw")
+        cls.course = Course.objects.create(name="Course", course_code="CS100")
+        cls.students = [
+            Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+            )
+            for index in range(2)
+        ]
+
+    def setUp(self):
+        patcher = mock.patch("utilities.models.get_current_user", return_value=self.user)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.past = datetime(2001, 1, 1, tzinfo=timezone.utc)
+        Student._base_manager.update(updated_at=self.past, updated_by=None)
+
+    def test_update_stamps(self):
+        Student.objects.update(remarks="updated")
+        for student in Student.objects.all():
+            self.assertEqual(student.updated_by, self.user)
+            self.assertGreater(student.updated_at, self.past)
+
+    def test_update_keeps_explicit_fields(self):
+        Student.objects.update(updated_by=self.other, updated_at=self.past)
+        for student in Student.objects.all():
+            self.assertEqual(student.updated_by, self.other)
+            self.assertEqual(student.updated_at, self.past)
+
+    def test_bulk_update_stamps(self):
+        students = list(Student.objects.all())
+        for student in students:
+            student.remarks = "updated"
+        Student.objects.bulk_update(students, ["remarks"])
+        for student in Student.objects.all():
+            self.assertEqual(student.remarks, "updated")
+            self.assertEqual(student.updated_by, self.user)
+            self.assertGreater(student.updated_at, self.past)
+
+    def test_bulk_update_keeps_explicit_fields(self):
+        students = list(Student.objects.all())
+        for student in students:
+            student.updated_by = self.other
+        Student.objects.bulk_update(students, ["updated_by"])
+        for student in Student.objects.all():
+            self.assertEqual(student.updated_by, self.other)
+            self.assertGreater(student.updated_at, self.past)
+
+    def test_partial_save_stamps(self):
+        student = Student.objects.get(pk=self.students[0].pk)
+        student.remarks = "updated"
+        student.save(update_fields=["remarks"])
+        student = Student.objects.get(pk=student.pk)
+        self.assertEqual(student.remarks, "updated")
+        self.assertEqual(student.updated_by, self.user)
+        self.assertGreater(student.updated_at, self.past)
+
+    def test_bulk_create_stamps_created_by(self):
+        created = Enrollment.objects.bulk_create([
+            Enrollment(student=self.students[0], course=self.course),
+            Enrollment(student=self.students[1], course=self.course, created_by=self.other),
+        ])
+        self.assertEqual(
+            [Enrollment.objects.get(pk=enrollment.pk).created_by for enrollment in created],
+            [self.user, self.other],
+        )
+
+    def test_upsert_stamps_updated_rows(self):
+        existing = Enrollment.objects.create(student=self.students[0], course=self.course)
+        Enrollment.objects.filter(pk=existing.pk).update(updated_at=self.past, updated_by=None)
+        Enrollment.objects.bulk_create(
+            [Enrollment(student=self.students[0], course=self.course, grade="A")],
+            update_conflicts=True,
+            update_fields=["grade"],
+            unique_fields=["student", "course"],
+        )
+        existing.refresh_from_db()
+        self.assertEqual(existing.grade, "A")
+        self.assertEqual(existing.updated_by, self.user)
+        self.assertGreater(existing.updated_at, self.past)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages walk the list both ways, and bad cursors mean page one"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        for index in range(7):
+            Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+            )
+
+    def setUp(self):
+        self.view = StudentView()
+        self.view.paginate_by = 3
+
+    def page(self, cursor=None):
+        params = {"cursor": cursor} if cursor else {}
+        return self.view.paginate_keyset(
+            RequestFactory().get("/students/", params), Student.objects.all()
+        )
+
+    def ids(self, page):
+        return [student.pk for student in page]
+
+    def test_next_and_previous_round_trip(self):
+        expected = list(Student.objects.order_by("-created_at", "id").values_list("pk", flat=True))
+
+        pages = [self.page()]
+        while pages[-1].has_next():
+            pages.append(self.page(pages[-1].next_cursor))
+        self.assertEqual([pk for page in pages for pk in self.ids(page)], expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([page.start_index() for page in pages], [1, 4, 7])
+        self.assertFalse(pages[0].has_previous())
+
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = self.page(page.previous_cursor)
+            self.assertEqual(self.ids(page), self.ids(previous))
+            self.assertEqual(page.start_index(), previous.start_index())
+        self.assertFalse(page.has_previous())
+
+    def test_tampered_cursor_serves_first_page(self):
+        first_page = self.ids(self.page())
+        payloads = [
+            {"v": ["notadate", "x"], "p": 0},
+            {"v": ["2024-01-01T00:00:00Z", "abc"]},
+            {"v": [None, 1]},
+            {"v": ["2024-01-01T00:00:00Z"]},
+            {"v": {"a": 1}},
+            {"v": ["2024-01-01T00:00:00Z", 1], "p": "x"},
+            [1, 2],
+        ]
+        tokens = [
+            base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            for payload in payloads
+        ] + ["not base64!", base64.urlsafe_b64encode(b"\xff\xfe").decode()]
+
+        self.client.force_login(self.user)
+        for token in tokens:
+            with self.subTest(token=token):
+                self.assertIsNone(self.view.decode_cursor(token, Student))
+                self.assertEqual(self.ids(self.page(token)), first_page)
+                response = self.client.get("/students/", {"cursor": token})
+                self.assertEqual(response.status_code, 200)
+
+
+class GradebookTests(TestCase):
+    """The gradebook writes the edited rows only, unless they went stale"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.course = Course.objects.create(name="Course", course_code="CS100")
+        cls.enrollments = [
+            Enrollment.objects.create(
+                student=Student.objects.create(
+                    first_name=f"First{index}",
+                    last_name=f"Last{index}",
+                    email=f"student{index}@example.com",
+                    date_of_birth=date(2000, 1, 1),
+                ),
+                course=cls.course,
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = f"/courses/{self.course.pk}/gradebook/"
+
+    def render_grid(self):
+        """The POST data of the grid as rendered, like a browser would send it"""
+        formset = self.client.get(self.url).context["formset"]
+        data = {
+            f"{formset.prefix}-{name}": value
+            for name, value in formset.management_form.initial.items()
+        }
+        for form in formset:
+            for field in form:
+                value = field.value()
+                value = "" if value is None else str(value)
+                data[field.html_name] = value
+                if field.field.show_hidden_initial:
+                    data[field.html_initial_name] = value
+        return data
+
+    def save(self, data):
+        return self.client.post(self.url, data, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+
+    def grades(self):
+        return [
+            Enrollment.objects.get(pk=enrollment.pk).grade for enrollment in self.enrollments
+        ]
+
+    def test_save_edited_rows(self):
+        data = self.render_grid()
+        data["rows-0-grade"] = "A"
+        data["rows-2-score"] = "88.50"
+        with mock.patch.object(
+            BaseQuerySet, "bulk_update", autospec=True, side_effect=BaseQuerySet.bulk_update
+        ) as bulk_update:
+            response = self.save(data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["saved"], 2)
+        self.assertEqual(bulk_update.call_count, 1)
+        self.assertEqual(self.grades(), ["A", "", ""])
+
+    def test_edited_row_changed_meanwhile_is_a_conflict(self):
+        data = self.render_grid()
+        Enrollment.objects.filter(pk=self.enrollments[0].pk).update(grade="B")
+        data["rows-0-grade"] = "A"
+        response = self.save(data)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            [conflict["id"] for conflict in response.json()["conflicts"]],
+            [self.enrollments[0].pk],
+        )
+        self.assertEqual(self.grades(), ["B", "", ""])
+
+    def test_untouched_stale_row_is_not_a_conflict(self):
+        data = self.render_grid()
+        Enrollment.objects.filter(pk=self.enrollments[0].pk).update(grade="B")
+        data["rows-1-grade"] = "A"
+        response = self.save(data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["conflicts"], [])
+        self.assertEqual(self.grades(), ["B", "A", ""])
+
+    def test_nothing_edited(self):
+        with mock.patch.object(BaseQuerySet, "bulk_update") as bulk_update:
+            response = self.save(self.render_grid())
+        self.assertEqual(response.json()["saved"], 0)
+        bulk_update.assert_not_called()
+
+
+class EnrollmentImportTests(TestCase):
+    """CSV imports upsert the valid rows and report the others by line"""
+
+    HEADER = "student_email,course_code,grade,score,completion_date,active"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("clerk", "clerk@example.com", "pw")
+        cls.other = User.objects.create_user("other", "other@example.com", "pw")
+        for index, is_active in enumerate([True, True, False]):
+            Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+                is_active=is_active,
+            )
+            Course.objects.create(
+                name=f"Course {index}", course_code=f"CS10{index}", is_active=is_active
+            )
+        cls.existing = Enrollment.objects.create(
+            student=Student.objects.get(email="student0@example.com"),
+            course=Course.objects.get(course_code="CS100"),
+            created_by=cls.other,
+        )
+
+    def setUp(self):
+        patcher = mock.patch("utilities.models.get_current_user", return_value=self.user)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_import(self, *lines, header=HEADER, batch_size=500):
+        upload = io.BytesIO("\n".join([header, *lines]).encode())
+        return EnrollmentImporter(batch_size=batch_size).import_file(upload)
+
+    def errors(self, result):
+        return {error["line"]: error["errors"] for error in result.errors}
+
+    def test_created_and_updated(self):
+        result = self.run_import(
+            "student0@example.com,CS100,A,91.5,2025-01-31,true",
+            "student1@example.com,CS100,b,,,false",
+        )
+        self.assertEqual((result.rows, result.created, result.updated), (2, 1, 1))
+        self.assertEqual(result.errors, [])
+
+        self.existing.refresh_from_db()
+        self.assertEqual(
+            (self.existing.grade, self.existing.score, self.existing.completion_date),
+            ("A", Decimal("91.50"), date(2025, 1, 31)),
+        )
+        self.assertEqual(self.existing.created_by, self.other)
+        self.assertEqual(self.existing.updated_by, self.user)
+
+        created = Enrollment.objects.get(student__email="student1@example.com")
+        self.assertEqual((created.grade, created.is_active), ("B", False))
+        self.assertEqual(created.created_by, self.user)
+
+    def test_duplicate_lines(self):
+        for batch_size in (500, 1):
+            with self.subTest(batch_size=batch_size):
+                result = self.run_import(
+                    "student1@example.com,CS101,A,,,",
+                    "student1@example.com,CS101,B,,,",
+                    batch_size=batch_size,
+                )
+                self.assertEqual(result.imported, 1)
+                self.assertEqual(self.errors(result), {3: ["Duplicate of line 2."]})
+
+    def test_unknown_and_inactive_references(self):
+        result = self.run_import(
+            "nobody@example.com,CS100,,,,",
+            "student2@example.com,CS100,,,,",
+            "student1@example.com,CS999,,,,",
+            "student1@example.com,CS102,,,,",
+            ",,,,,",
+            "student1@example.com,,,,,",
+        )
+        self.assertEqual(result.imported, 0)
+        self.assertEqual(
+            self.errors(result),
+            {
+                2: ["Student 'nobody@example.com' does not exist."],
+                3: ["Student 'student2@example.com' is inactive."],
+                4: ["Course 'CS999' does not exist."],
+                5: ["Course 'CS102' is inactive."],
+                7: ["course_code is required."],
+            },
+        )
+
+    def test_invalid_values(self):
+        result = self.run_import(
+            "student1@example.com,CS100,Z,,,",
+            "student1@example.com,CS100,,abc,,",
+            "student1@example.com,CS100,,150,,",
+            "student1@example.com,CS100,A,,2025-13-01,",
+            "student1@example.com,CS100,,,2025-01-31,",
+            "student1@example.com,CS100,,,,maybe",
+        )
+        self.assertEqual(result.imported, 0)
+        self.assertEqual(
+            self.errors(result),
+            {
+                2: ["Unknown grade 'Z'."],
+                3: ["Score 'abc' is not a number."],
+                4: ["Score must be between 0 and 100."],
+                5: ["Completion date '2025-13-01' is not a YYYY-MM-DD date."],
+                6: ["A grade is required when a completion date is provided."],
+                7: ["Active must be true or false, got 'maybe'."],
+            },
+        )
+
+    def test_missing_required_column(self):
+        with self.assertRaisesMessage(ValidationError, "Missing required column(s): course_code"):
+            self.run_import("student1@example.com", header="student_email")
+
+    def test_not_utf8(self):
+        upload = io.BytesIO(f"{self.HEADER}\nstudént1@example.com,CS101,,,,".encode("latin-1"))
+        with self.assertRaisesMessage(ValidationError, "UTF-8"):
+            EnrollmentImporter().import_file(upload)
+
+
+class MetaDataKeyAutocompleteTests(TestCase):
+    """?field=key lists the distinct keys that start with the query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        for key, value in [
+            ("color", "red"), ("color", "blue"), ("region", "north"),
+            ("rank", "1"), ("reference", "x"),
+        ]:
+            MetaData.objects.create(key=key, value=value)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def keys(self, **params):
+        data = self.client.get("/autocomplete/metadata/", {"field": "key", **params}).json()
+        return [result["id"] for result in data["results"]], data["next_cursor"]
+
+    def test_matches_keys_only(self):
+        self.assertEqual(self.keys(q="re")[0], ["reference", "region"])
+        self.assertEqual(self.keys(q="red")[0], [])
+
+    def test_pages(self):
+        pages, cursor = [], None
+        while True:
+            keys, cursor = self.keys(limit=2, **({"cursor": cursor} if cursor else {}))
+            pages.append(keys)
+            if not cursor:
+                break
+        self.assertEqual(pages, [["color", "rank"], ["reference", "region"]])
+
+    def test_invalid_cursor_serves_first_page(self):
+        self.assertEqual(self.keys(limit=2, cursor="rank")[0], ["color", "rank"])
+
+
+class CheckEnrollmentTests(TestCase):
+    """/check-enrollment/ answers one pair or many with a single query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.students = [
+            Student.objects.create(
+                first_name=f"First{index}",
+                last_name=f"Last{index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2000, 1, 1),
+            )
+            for index in range(2)
+        ]
+        cls.courses = [
+            Course.objects.create(name=f"Course {index}", course_code=f"CS10{index}")
+            for index in range(3)
+        ]
+        cls.enrollment = Enrollment.objects.create(student=cls.students[0], course=cls.courses[0])
+        Enrollment.objects.create(student=cls.students[1], course=cls.courses[1])
+        Enrollment.objects.create(student=cls.students[1], course=cls.courses[2], is_active=False)
+
+    async def check(self, **params):
+        request = AsyncRequestFactory().get("/check-enrollment/", params)
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        return await CheckEnrollmentView.as_view()(request)
+
+    def pairs(self, *pairs):
+        return ",".join(
+            f"{self.students[student].pk}:{self.courses[course].pk}" for student, course in pairs
+        )
+
+    def test_pairs(self):
+        # (0, 1) and (1, 0) are in the cross product of the ids, not enrolled
+        pairs = self.pairs((1, 1), (0, 1), (1, 1), (0, 0), (1, 0), (1, 2))
+        with self.assertNumQueries(1):
+            response = async_to_sync(self.check)(pairs=pairs)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertTrue(data["exists"])
+        self.assertEqual(
+            [
+                (result["student"], result["course"], result["exists"])
+                for result in data["results"]
+            ],
+            [
+                (self.students[student].pk, self.courses[course].pk, exists)
+                for student, course, exists in [
+                    (1, 1, True), (0, 1, False), (0, 0, True), (1, 0, False), (1, 2, False),
+                ]
+            ],
+        )
+        self.assertEqual(
+            data["results"][0]["enrollment_details"],
+            {"student_name": "First1 Last1", "course_name": "Course 1", "status": "Active"},
+        )
+
+    async def test_single_pair(self):
+        response = await self.check(student=self.students[0].pk, course=self.courses[0].pk)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "exists": True,
+                "enrollment_details": {
+                    "student_name": "First0 Last0", "course_name": "Course 0", "status": "Active",
+                },
+            },
+        )
+
+    async def test_exclude(self):
+        response = await self.check(
+            student=self.students[0].pk, course=self.courses[0].pk, exclude=self.enrollment.pk
+        )
+        self.assertEqual(json.loads(response.content), {"exists": False, "enrollment_details": None})
+
+    async def test_max_pairs(self):
+        with mock.patch.object(CheckEnrollmentView, "max_pairs", 2):
+            response = await self.check(pairs=self.pairs((0, 0), (0, 1), (0, 2)))
+        self.assertEqual(response.status_code, 400)
+
+    async def test_malformed(self):
+        for params in (
+            {"pairs": "1:x"}, {"pairs": "12"}, {"pairs": "1:2:3"},
+            {"student": "a", "course": "1"}, {"student": "1"}, {},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual((await self.check(**params)).status_code, 400)
@@ -1,7 +1,14 @@
 from django.urls import path
 
+from students.views.autocomplete_views import (
+    CourseAutocompleteView,
+    InstructorAutocompleteView,
+    MetaDataAutocompleteView,
+    StudentAutocompleteView,
+)
 from students.views.course_views import CourseView
 from students.views.enrollment_views import CheckEnrollmentView, EnrollmentView
+from students.views.gradebook_views import GradebookView
 from students.views.instructor_views import InstructorView
 from students.views.metadata_views import MetaDataView
 from students.views.student_views import StudentView
@@ -14,31 +21,44 @@ urlpatterns = [
     path("metadata/add/", MetaDataView.as_view(), name="metadata-add"),
     path("metadata/<int:pk>/edit/", MetaDataView.as_view(), name="metadata-edit"),
     path("metadata/<int:pk>/delete/", MetaDataView.as_view(), name="metadata-delete"),
+    path("metadata/export/", MetaDataView.as_view(), name="metadata-export"),
     
     # ==================== STUDENT URLS ====================
     path("students/", StudentView.as_view(), name="students"),
     path("students/add/", StudentView.as_view(), name="student-add"),
     path("students/<int:pk>/edit/", StudentView.as_view(), name="student-edit"),
     path("students/<int:pk>/delete/", StudentView.as_view(), name="student-delete"),
+    path("students/export/", StudentView.as_view(), name="student-export"),
     
     # ==================== INSTRUCTOR URLS ====================
     path("instructors/", InstructorView.as_view(), name="instructors"),
     path("instructors/add/", InstructorView.as_view(), name="instructor-add"),
     path("instructors/<int:pk>/edit/", InstructorView.as_view(), name="instructor-edit"),
     path("instructors/<int:pk>/delete/", InstructorView.as_view(), name="instructor-delete"),
+    path("instructors/export/", InstructorView.as_view(), name="instructor-export"),
     
     # ==================== COURSE URLS ====================
     path("courses/", CourseView.as_view(), name="courses"),
     path("courses/add/", CourseView.as_view(), name="course-add"),
     path("courses/<int:pk>/edit/", CourseView.as_view(), name="course-edit"),
     path("courses/<int:pk>/delete/", CourseView.as_view(), name="course-delete"),
+    path("courses/export/", CourseView.as_view(), name="course-export"),
+    path("courses/<int:pk>/gradebook/", GradebookView.as_view(), name="course-gradebook"),
     
     # ==================== ENROLLMENT URLS ====================
     path("enrollments/", EnrollmentView.as_view(), name="enrollments"),
     path("enrollments/add/", EnrollmentView.as_view(), name="enrollment-add"),
     path("enrollments/<int:pk>/edit/", EnrollmentView.as_view(), name="enrollment-edit"),
     path("enrollments/<int:pk>/delete/", EnrollmentView.as_view(), name="enrollment-delete"),
+    path("enrollments/export/", EnrollmentView.as_view(), name="enrollment-export"),
+    path("enrollments/import/", EnrollmentView.as_view(), name="enrollment-import"),
     
     # ==================== CHECK ENROLLMENT URL ====================
     path("check-enrollment/", CheckEnrollmentView.as_view(), name="check-enrollment"),
+
+    # ==================== AUTOCOMPLETE URLS ====================
+    path("autocomplete/students/", StudentAutocompleteView.as_view(), name="autocomplete-students"),
+    path("autocomplete/courses/", CourseAutocompleteView.as_view(), name="autocomplete-courses"),
+    path("autocomplete/instructors/", InstructorAutocompleteView.as_view(), name="autocomplete-instructors"),
+    path("autocomplete/metadata/", MetaDataAutocompleteView.as_view(), name="autocomplete-metadata"),
 ]
\ No newline at end of file
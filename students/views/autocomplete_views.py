@@ -0,0 +1,182 @@
+import logging
+from django.http import JsonResponse
+from django.views import View
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Q
+
+from students.models.course_model import Course
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+from utilities.pagination_mixin import PaginatedListMixin
+
+logger = logging.getLogger(__name__)
+
+
+class AutocompleteView(LoginRequiredMixin, PaginatedListMixin, View):
+    """
+    Base JSON endpoint for Select2 remote options.
+
+    GET parameters: ``q`` (every word must prefix one of search_fields),
+    ``limit`` (page size, capped at max_limit) and ``cursor`` (the
+    ``next_cursor`` of the previous page). Pages are keyset paginated.
+    """
+
+    login_url = "/login/"
+    redirect_field_name = "next"
+    pagination_mode = "keyset"
+
+    model = None
+    search_fields = ()
+    only_fields = None
+    # Having any one of these permissions is enough, so forms that pick
+    # related rows keep working for users who cannot open the list itself
+    permissions = ()
+    default_limit = 20
+    max_limit = 50
+
+    def has_permission(self, user):
+        return any(user.has_perm(permission) for permission in self.permissions)
+
+    def get_paginate_by(self):
+        try:
+            limit = int(self.request.GET.get("limit", self.default_limit))
+        except (TypeError, ValueError):
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_queryset(self):
+        """Get base queryset of selectable rows"""
+        queryset = self.model.objects.filter(is_active=True)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        return queryset
+
+    def get_filtered_queryset(self, request):
+        """Apply the prefix search to the queryset"""
+        queryset = self.get_queryset()
+        for word in request.GET.get("q", "").split():
+            word_filter = Q()
+            for field in self.search_fields:
+                word_filter |= Q(**{f"{field}__istartswith": word})
+            queryset = queryset.filter(word_filter)
+        return queryset
+
+    def get_result(self, obj):
+        """Serialize one option"""
+        return {"id": obj.pk, "text": str(obj)}
+
+    def get(self, request):
+        if not self.has_permission(request.user):
+            return JsonResponse(
+                {"success": False, "error": "Permission denied"}, status=403
+            )
+
+        page = self.paginate_keyset(request, self.get_filtered_queryset(request))
+        return JsonResponse(
+            {
+                "results": [self.get_result(obj) for obj in page],
+                "pagination": {"more": page.has_next()},
+                "next_cursor": page.next_cursor,
+            }
+        )
+
+
+class StudentAutocompleteView(AutocompleteView):
+    """Active students by first name, last name or email prefix"""
+
+    model = Student
+    search_fields = ("first_name", "last_name", "email")
+    only_fields = ("id", "first_name", "last_name", "email")
+    keyset_ordering = ("last_name", "first_name", "id")
+    permissions = (
+        "students.view_student",
+        "students.view_enrollment",
+        "students.add_enrollment",
+        "students.change_enrollment",
+    )
+
+
+class CourseAutocompleteView(AutocompleteView):
+    """Active courses by name or course code prefix"""
+
+    model = Course
+    search_fields = ("name", "course_code")
+    only_fields = ("id", "name", "course_code")
+    keyset_ordering = ("course_code", "id")
+    permissions = (
+        "students.view_course",
+        "students.view_enrollment",
+        "students.add_enrollment",
+        "students.change_enrollment",
+        "students.view_instructor",
+        "students.add_instructor",
+        "students.change_instructor",
+    )
+
+
+class InstructorAutocompleteView(AutocompleteView):
+    """Active instructors by first name, last name or email prefix"""
+
+    model = Instructor
+    search_fields = ("first_name", "last_name", "email")
+    only_fields = ("id", "first_name", "last_name", "email")
+    keyset_ordering = ("last_name", "first_name", "id")
+    permissions = (
+        "students.view_instructor",
+        "students.view_course",
+        "students.change_course",
+    )
+
+
+class MetaDataAutocompleteView(AutocompleteView):
+    """
+    Active metadata by key or value prefix. With ``?field=key`` it returns
+    the distinct keys starting with ``q`` instead, as used by the list
+    filters, paged by key.
+    """
+
+    model = MetaData
+    search_fields = ("key", "value")
+    keyset_ordering = ("key", "id")
+    permissions = (
+        "students.view_metadata",
+        "students.view_student",
+        "students.view_course",
+        "students.view_instructor",
+        "students.view_enrollment",
+    )
+
+    def get(self, request):
+        if request.GET.get("field") != "key":
+            return super().get(request)
+
+        if not self.has_permission(request.user):
+            return JsonResponse(
+                {"success": False, "error": "Permission denied"}, status=403
+            )
+
+        limit = self.get_paginate_by()
+        # Keys only: a value matching the prefix doesn't make its key match
+        queryset = (
+            self.get_queryset()
+            .filter(key__istartswith=request.GET.get("q", "").strip())
+            .order_by("key")
+            .values_list("key", flat=True)
+            .distinct()
+        )
+        cursor = self.decode_cursor(request.GET.get(self.cursor_kwarg), self.model, ("key",))
+        if cursor:
+            (last_key,), _, _ = cursor
+            queryset = queryset.filter(key__gt=last_key)
+
+        keys = list(queryset[: limit + 1])
+        has_more = len(keys) > limit
+        keys = keys[:limit]
+        return JsonResponse(
+            {
+                "results": [{"id": key, "text": key.title()} for key in keys],
+                "pagination": {"more": has_more},
+                "next_cursor": self.encode_cursor(keys[-1:], 0) if has_more else None,
+            }
+        )
@@ -5,24 +5,39 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Prefetch
 
 from students.forms.course_form import CourseForm
-from students.models.metadata_model import MetaData
 from students.models.course_model import Course
+from students.models.metadata_model import MetaData
+from utilities.export_mixin import ExportMixin
+from utilities.filters import filter_relation
 from utilities.pagination_mixin import PaginatedListMixin
+from utilities.search import search_queryset
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
 
 logger = logging.getLogger(__name__)
 
 
-class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
+class CourseView(LoginRequiredMixin, PaginatedListMixin, ExportMixin, View):
     """Course view for listing, adding, editing, and deleting courses"""
 
     login_url = "/login/"
     redirect_field_name = "next"
     paginate_by = 15  # Override default pagination
+    list_prefetch = (Prefetch("metadata", queryset=MetaData.objects.only("key")),)
+    export_filename = "courses"
+    export_fields = [
+        ("ID", "id"),
+        ("Course Code", "course_code"),
+        ("Name", "name"),
+        ("Description", "description"),
+        ("Active", "is_active"),
+        ("Created At", "created_at"),
+        ("Metadata", "metadata"),
+    ]
+    export_related_format = {"metadata": "{key}={value}"}
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -32,6 +47,8 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_course(request, pk)
         elif request.resolver_match.url_name == "course-delete" and pk:
             return self.delete_course(request, pk)
+        elif request.resolver_match.url_name == "course-export":
+            return self.export_courses(request)
 
         else:
             return self.course_list(request)
@@ -63,18 +80,14 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
         # Metadata filter
         metadata_filter = request.GET.get("metadata")
         if metadata_filter:
-            queryset = queryset.filter(metadata__key=metadata_filter)
+            queryset = filter_relation(queryset, "metadata__key", metadata_filter)
 
         # Search filter
         search_query = request.GET.get("search")
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query)
-                | Q(course_code__icontains=search_query)
-                | Q(description__icontains=search_query)
-            )
+            queryset = search_queryset(queryset, search_query)
 
-        return queryset.distinct().order_by("course_code")
+        return queryset.order_by("course_code")
 
     @method_decorator(permission_required("students.view_course", raise_exception=True))
     def course_list(self, request):
@@ -85,12 +98,8 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
         # Get pagination context
         pagination_context = self.get_pagination_context(request, filtered_queryset)
 
-        # Additional context
-        metadata_list = MetaData.objects.all()
-
         context = {
             **pagination_context,
-            "metadata_list": metadata_list,
             "current_filters": {
                 "metadata": request.GET.get("metadata", ""),
                 "search": request.GET.get("search", ""),
@@ -99,15 +108,20 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
 
         return render(request, "students/courses/courses_list.html", context)
 
+    @method_decorator(
+        permission_required("students.view_course", raise_exception=True)
+    )
+    def export_courses(self, request):
+        """Stream the filtered course list as CSV or JSON Lines"""
+        return self.export_response(request)
+
     @method_decorator(permission_required("students.add_course", raise_exception=True))
     def add_course(self, request):
         """Display add course form"""
         form = CourseForm()
-        metadata_list = MetaData.objects.all()
 
         context = {
             "form": form,
-            "metadata_list": metadata_list,
             "is_adding": True,
             "page_title": "Add Course",
         }
@@ -175,10 +189,8 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            metadata_list = MetaData.objects.all()
             context = {
                 "form": form,
-                "metadata_list": metadata_list,
                 "is_adding": True,
                 "page_title": "Add Course",
             }
@@ -192,11 +204,9 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
         course = get_object_or_404(Course, pk=pk)
 
         form = CourseForm(instance=course)
-        metadata_list = MetaData.objects.all()
 
         context = {
             "form": form,
-            "metadata_list": metadata_list,
             "course_obj": course,
             "is_editing": True,
             "page_title": f"Edit Course: {course.name}",
@@ -266,10 +276,8 @@ class CourseView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            metadata_list = MetaData.objects.all()
             context = {
                 "form": form,
-                "metadata_list": metadata_list,
                 "course_obj": course,
                 "is_editing": True,
                 "page_title": f"Edit Course: {course.name}",
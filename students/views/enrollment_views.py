@@ -5,26 +5,55 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models import Count, Prefetch, Q
 
-from students.forms.enrollment_form import EnrollmentForm
+from students.enrollment_import import EnrollmentImporter
+from students.forms.enrollment_form import EnrollmentForm, EnrollmentImportForm
 from students.models.enrollment_model import Enrollment
-from students.models.student_model import Student
-from students.models.course_model import Course
 from students.models.metadata_model import MetaData
+from students.models.student_model import Student
+from students.reference_data import active_courses
+from utilities.async_mixins import AsyncLoginRequiredMixin
+from utilities.export_mixin import ExportMixin
+from utilities.filters import filter_relation
 from utilities.pagination_mixin import PaginatedListMixin
+from utilities.paginators import queryset_cache_key
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
 
 logger = logging.getLogger(__name__)
 
 
-class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
+class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, ExportMixin, View):
     """Enrollment view for listing, adding, editing, and deleting enrollments"""
 
     login_url = "/login/"
     redirect_field_name = "next"
     paginate_by = 15  # Override default pagination
+    pagination_mode = "keyset"  # Seek pagination keeps deep pages cheap
+    keyset_ordering = ("-created_at", "id")
+    count_strategy = "exact"  # The total comes from the cached stats aggregate
+    list_select_related = ("student", "course")
+    list_prefetch = (Prefetch("metadata", queryset=MetaData.objects.only("key")),)
+    stats_cache_timeout = 300
+    export_filename = "enrollments"
+    export_fields = [
+        ("ID", "id"),
+        ("Student", "student__full_name"),
+        ("Student Email", "student__email"),
+        ("Course Code", "course__course_code"),
+        ("Course", "course__name"),
+        ("Grade", "grade"),
+        ("Score", "score"),
+        ("Completion Date", "completion_date"),
+        ("Active", "is_active"),
+        ("Created At", "created_at"),
+        ("Metadata", "metadata"),
+    ]
+    export_related_format = {"metadata": "{key}={value}"}
+    import_error_display_limit = 200  # Rows of the error report shown on the page
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -34,6 +63,10 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_enrollment(request, pk)
         elif request.resolver_match.url_name == "enrollment-delete" and pk:
             return self.delete_enrollment(request, pk)
+        elif request.resolver_match.url_name == "enrollment-export":
+            return self.export_enrollments(request)
+        elif request.resolver_match.url_name == "enrollment-import":
+            return self.import_enrollments(request)
 
         else:
             return self.enrollment_list(request)
@@ -46,6 +79,8 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_enrollment_submit(request, pk)
         elif request.resolver_match.url_name == "enrollment-delete" and pk:
             return self.delete(request, pk)
+        elif request.resolver_match.url_name == "enrollment-import":
+            return self.import_enrollments_submit(request)
         return redirect("students:enrollments")
 
     def delete(self, request, pk=None):
@@ -56,9 +91,7 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
 
     def get_queryset(self):
         """Get base queryset for enrollments"""
-        return Enrollment.objects.select_related("student", "course").prefetch_related(
-            "metadata"
-        )
+        return Enrollment.objects.all()
 
     def get_filtered_queryset(self, request):
         """Apply filters to the queryset"""
@@ -95,7 +128,7 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
         # Metadata filter
         metadata_filter = request.GET.get("metadata")
         if metadata_filter:
-            queryset = queryset.filter(metadata__key=metadata_filter)
+            queryset = filter_relation(queryset, "metadata__key", metadata_filter)
 
         # Search filter
         search_query = request.GET.get("search")
@@ -108,7 +141,32 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
                 | Q(grade__icontains=search_query)
             )
 
-        return queryset.distinct().order_by("-created_at")
+        return queryset.order_by("-created_at")
+
+    def get_enrollment_stats(self, queryset):
+        """
+        Count total, active, completed and in-progress enrollments in one
+        query, cached per filter combination until enrollments change.
+        """
+        aggregates = {
+            "total_enrollments": Count("pk"),
+            "active_enrollments": Count("pk", filter=Q(is_active=True)),
+            "completed_enrollments": Count("pk", filter=Q(completion_date__isnull=False)),
+            "in_progress_enrollments": Count(
+                "pk", filter=Q(completion_date__isnull=True, is_active=True)
+            ),
+        }
+        try:
+            key = queryset_cache_key("enrollment_stats", queryset)
+        except EmptyResultSet:
+            # The filters can never match anything
+            return dict.fromkeys(aggregates, 0)
+
+        stats = cache.get(key)
+        if stats is None:
+            stats = queryset.order_by().aggregate(**aggregates)
+            cache.set(key, stats, self.stats_cache_timeout)
+        return stats
 
     @method_decorator(
         permission_required("students.view_enrollment", raise_exception=True)
@@ -117,33 +175,29 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
         """Display paginated list of enrollments"""
         filtered_queryset = self.get_filtered_queryset(request)
 
-        pagination_context = self.get_pagination_context(request, filtered_queryset)
+        # One aggregate gives the stats and the paginator's total
+        stats = self.get_enrollment_stats(filtered_queryset)
+        pagination_context = self.get_pagination_context(
+            request, filtered_queryset, count=stats["total_enrollments"]
+        )
 
-        student_list = Student.objects.filter(is_active=True).order_by(
-            "first_name", "last_name"
+        # The filter selects load their options remotely, only the current
+        # selections are rendered
+        student_id = request.GET.get("student", "")
+        course_id = request.GET.get("course", "")
+        selected_student = (
+            Student.objects.filter(pk=student_id).first()
+            if student_id.isdigit()
+            else None
         )
-        course_list = Course.objects.filter(is_active=True).order_by("name")
-        metadata_list = MetaData.objects.all()
+        selected_course = active_courses.get(course_id)
 
         grade_choices = Enrollment.GRADE_CHOICES
 
-        # Get some statistics
-        stats = {
-            "total_enrollments": filtered_queryset.count(),
-            "active_enrollments": filtered_queryset.filter(is_active=True).count(),
-            "completed_enrollments": filtered_queryset.filter(
-                completion_date__isnull=False
-            ).count(),
-            "in_progress_enrollments": filtered_queryset.filter(
-                completion_date__isnull=True, is_active=True
-            ).count(),
-        }
-
         context = {
             **pagination_context,
-            "student_list": student_list,
-            "course_list": course_list,
-            "metadata_list": metadata_list,
+            "selected_student": selected_student,
+            "selected_course": selected_course,
             "grade_choices": grade_choices,
             "stats": stats,
             "current_filters": {
@@ -159,21 +213,99 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
 
         return render(request, "students/enrollments/enrollments_list.html", context)
 
+    @method_decorator(
+        permission_required("students.view_enrollment", raise_exception=True)
+    )
+    def export_enrollments(self, request):
+        """Stream the filtered enrollment list as CSV or JSON Lines"""
+        return self.export_response(request)
+
+    @method_decorator(
+        permission_required(
+            ("students.add_enrollment", "students.change_enrollment"), raise_exception=True
+        )
+    )
+    def import_enrollments(self, request):
+        """Display the enrollment CSV upload form"""
+        context = {
+            "form": EnrollmentImportForm(),
+            "page_title": "Import Enrollments",
+        }
+        return render(request, "students/enrollments/enrollments_import.html", context)
+
+    @method_decorator(
+        permission_required(
+            ("students.add_enrollment", "students.change_enrollment"), raise_exception=True
+        )
+    )
+    def import_enrollments_submit(self, request):
+        """Upsert enrollments from an uploaded CSV and report the rejected rows"""
+        form = EnrollmentImportForm(request.POST, request.FILES)
+        is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
+        result = None
+
+        if form.is_valid():
+            try:
+                result = EnrollmentImporter().import_file(form.cleaned_data["file"])
+            except ValidationError as e:
+                form.add_error("file", e)
+            except Exception as e:
+                error_message = f"Error importing enrollments: {str(e)}"
+                logger.error(f"Error importing enrollments: {e}")
+
+                if is_ajax:
+                    return JsonResponse(
+                        {"success": False, "error": error_message}, status=500
+                    )
+                messages.error(request, error_message)
+
+        if result is not None:
+            success_message = (
+                f"Imported {result.imported} of {result.rows} rows: "
+                f"{result.created} created, {result.updated} updated, "
+                f"{len(result.errors)} rejected."
+            )
+            if is_ajax:
+                return JsonResponse(
+                    {"success": True, "message": success_message, **result.as_dict()}
+                )
+            if result.errors:
+                messages.warning(request, success_message)
+            else:
+                messages.success(request, success_message)
+        elif is_ajax:
+            errors = {}
+            for field_name, field_errors in form.errors.items():
+                errors[field_name] = [str(error) for error in field_errors]
+
+            return JsonResponse(
+                {
+                    "success": False,
+                    "errors": errors,
+                    "message": "Please correct the errors below.",
+                },
+                status=400,
+            )
+
+        context = {
+            "form": EnrollmentImportForm() if result is not None else form,
+            "result": result,
+            "import_errors": (
+                result.errors[: self.import_error_display_limit] if result else []
+            ),
+            "page_title": "Import Enrollments",
+        }
+        return render(request, "students/enrollments/enrollments_import.html", context)
+
     @method_decorator(
         permission_required("students.add_enrollment", raise_exception=True)
     )
     def add_enrollment(self, request):
         """Display add enrollment form"""
         form = EnrollmentForm()
-        student_list = Student.objects.filter(is_active=True).order_by(
-            "first_name", "last_name"
-        )
-        metadata_list = MetaData.objects.all()
 
         context = {
             "form": form,
-            "student_list": student_list,
-            "metadata_list": metadata_list,
             "is_adding": True,
             "page_title": "Add Enrollment",
         }
@@ -242,16 +374,8 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            student_list = Student.objects.filter(is_active=True).order_by(
-                "first_name", "last_name"
-            )
-            course_list = Course.objects.filter(is_active=True).order_by("name")
-            metadata_list = MetaData.objects.all()
             context = {
                 "form": form,
-                "student_list": student_list,
-                "course_list": course_list,
-                "metadata_list": metadata_list,
                 "is_adding": True,
                 "page_title": "Add Enrollment",
             }
@@ -267,17 +391,9 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
         enrollment = get_object_or_404(Enrollment, pk=pk)
 
         form = EnrollmentForm(instance=enrollment)
-        student_list = Student.objects.filter(is_active=True).order_by(
-            "first_name", "last_name"
-        )
-        course_list = Course.objects.filter(is_active=True).order_by("name")
-        metadata_list = MetaData.objects.all()
 
         context = {
             "form": form,
-            "student_list": student_list,
-            "course_list": course_list,
-            "metadata_list": metadata_list,
             "enrollment_obj": enrollment,
             "is_editing": True,
             "page_title": f"Edit Enrollment: {enrollment.student.full_name} - {enrollment.course.course_code}",
@@ -345,16 +461,8 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            student_list = Student.objects.filter(is_active=True).order_by(
-                "first_name", "last_name"
-            )
-            course_list = Course.objects.filter(is_active=True).order_by("name")
-            metadata_list = MetaData.objects.all()
             context = {
                 "form": form,
-                "student_list": student_list,
-                "course_list": course_list,
-                "metadata_list": metadata_list,
                 "enrollment_obj": enrollment,
                 "is_editing": True,
                 "page_title": f"Edit Enrollment: {enrollment.student.full_name} - {enrollment.course.course_code}",
@@ -404,21 +512,46 @@ class EnrollmentView(LoginRequiredMixin, PaginatedListMixin, View):
 
 
 
-class CheckEnrollmentView(LoginRequiredMixin, View):
-    """View to check for duplicate enrollments"""
+class CheckEnrollmentView(AsyncLoginRequiredMixin, View):
+    """
+    View to check for duplicate enrollments. Async: the enrollment form
+    calls it on every student or course change.
+
+    Checks one pair (?student=1&course=2) or many at once
+    (?pairs=1:2,3:2,...), answering all of them with a single query.
+    """
 
     login_url = "/login/"
     redirect_field_name = "next"
-
-    def get(self, request):
-        """Check if a student is already enrolled in a course"""
+    max_pairs = 500
+
+    def get_pairs(self, request):
+        """Requested (student id, course id) pairs, in order and without repeats"""
+        pairs = []
+        for item in request.GET.get("pairs", "").split(","):
+            if item.strip():
+                student_id, course_id = item.split(":")
+                pairs.append((int(student_id), int(course_id)))
         student_id = request.GET.get("student")
         course_id = request.GET.get("course")
+        if student_id and course_id:
+            pairs.append((int(student_id), int(course_id)))
+        return list(dict.fromkeys(pairs))
+
+    async def get(self, request):
+        """Check if students are already enrolled in courses"""
         exclude_id = request.GET.get(
             "exclude"
         )  # For edit mode, exclude current enrollment
 
-        if not student_id or not course_id:
+        try:
+            pairs = self.get_pairs(request)
+        except ValueError:
+            return JsonResponse(
+                {"exists": False, "error": "Invalid student or course ID"}, status=400
+            )
+
+        if not pairs:
             return JsonResponse(
                 {
                     "exists": False,
@@ -426,31 +559,60 @@ class CheckEnrollmentView(LoginRequiredMixin, View):
                 },
                 status=400,
             )
+        if len(pairs) > self.max_pairs:
+            return JsonResponse(
+                {"exists": False, "error": f"At most {self.max_pairs} pairs can be checked at once"},
+                status=400,
+            )
 
         try:
-            # Check for existing enrollment
+            # Check for existing enrollments of exactly the requested pairs
             queryset = Enrollment.objects.filter(
-                student_id=student_id,
-                course_id=course_id,
+                Q(
+                    *(
+                        Q(student_id=student_id, course_id=course_id)
+                        for student_id, course_id in pairs
+                    ),
+                    _connector=Q.OR,
+                ),
                 is_active=True,  # Only check active enrollments
             )
 
             if exclude_id:
                 queryset = queryset.exclude(id=exclude_id)
 
-            exists = queryset.exists()
-
-            enrollment_details = None
-            if exists:
-                enrollment = queryset.first()
-                enrollment_details = {
+            # One query for every pair, names included
+            found = {}
+            async for enrollment in queryset.order_by().select_related(
+                "student", "course"
+            ).only(
+                "student_id", "course_id", "is_active",
+                "student__first_name", "student__last_name", "course__name",
+            ):
+                found[enrollment.student_id, enrollment.course_id] = {
                     "student_name": enrollment.student.full_name,
                     "course_name": enrollment.course.name,
                     "status": "Active" if enrollment.is_active else "Inactive",
                 }
 
+            results = [
+                {
+                    "student": student_id,
+                    "course": course_id,
+                    "exists": (student_id, course_id) in found,
+                    "enrollment_details": found.get((student_id, course_id)),
+                }
+                for student_id, course_id in pairs
+            ]
+
+            if "pairs" not in request.GET:
+                # Single pair, the response the enrollment form expects
+                result = results[0]
+                return JsonResponse(
+                    {"exists": result["exists"], "enrollment_details": result["enrollment_details"]}
+                )
             return JsonResponse(
-                {"exists": exists, "enrollment_details": enrollment_details}
+                {"exists": any(result["exists"] for result in results), "results": results}
             )
 
         except ValueError:
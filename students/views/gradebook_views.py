@@ -0,0 +1,215 @@
+import logging
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views import View
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db import transaction
+
+from students.forms.gradebook_form import GradebookFormSet
+from students.models.course_model import Course
+from students.models.enrollment_model import Enrollment
+from utilities.cache_versions import bump_model_version
+from django.contrib.auth.decorators import permission_required
+from django.utils.decorators import method_decorator
+
+logger = logging.getLogger(__name__)
+
+GRADEBOOK_FIELDS = ["grade", "score", "completion_date"]
+
+
+def row_version(enrollment):
+    """Token identifying the state of a row the grid was rendered from"""
+    return enrollment.updated_at.isoformat()
+
+
+class GradebookView(LoginRequiredMixin, View):
+    """
+    Every enrollment of a course in one grid. The edited grade, score and
+    completion date cells are saved with a single bulk_update; edited rows
+    changed by someone else since the grid was rendered are not overwritten.
+    """
+
+    login_url = "/login/"
+    redirect_field_name = "next"
+    paginate_by = 500  # Enough for a whole course on one page
+    formset_prefix = "rows"
+
+    def get_enrollments(self, course):
+        return (
+            Enrollment.objects.filter(course=course)
+            .select_related("student")
+            .only(
+                "id", "grade", "score", "completion_date", "is_active", "updated_at",
+                "student__first_name", "student__last_name", "student__email",
+            )
+            .order_by("student__last_name", "student__first_name", "id")
+        )
+
+    def get_page(self, request, course):
+        paginator = Paginator(self.get_enrollments(course), self.paginate_by)
+        return paginator.get_page(request.GET.get("page"))
+
+    def render_gradebook(self, request, course, page, formset=None, status=200):
+        enrollments = list(page)
+        if formset is None:
+            formset = GradebookFormSet(
+                prefix=self.formset_prefix,
+                initial=[
+                    {
+                        "id": enrollment.pk,
+                        "version": row_version(enrollment),
+                        **{field: getattr(enrollment, field) for field in GRADEBOOK_FIELDS},
+                    }
+                    for enrollment in enrollments
+                ],
+            )
+        context = {
+            "course": course,
+            "page_obj": page,
+            "paginator": page.paginator,
+            "is_paginated": page.has_other_pages(),
+            "formset": formset,
+            "rows": list(zip(formset.forms, enrollments)),
+            "grade_choices": Enrollment.GRADE_CHOICES,
+            "page_title": f"Gradebook: {course.course_code}",
+        }
+        return render(
+            request, "students/courses/course_gradebook.html", context, status=status
+        )
+
+    @method_decorator(
+        permission_required("students.view_enrollment", raise_exception=True)
+    )
+    def get(self, request, pk):
+        """Display the gradebook of a course"""
+        course = get_object_or_404(Course, pk=pk)
+        return self.render_gradebook(request, course, self.get_page(request, course))
+
+    @method_decorator(
+        permission_required("students.change_enrollment", raise_exception=True)
+    )
+    def post(self, request, pk):
+        """Save the changed cells of the gradebook"""
+        course = get_object_or_404(Course, pk=pk)
+        formset = GradebookFormSet(request.POST, prefix=self.formset_prefix)
+        is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
+        page_url = reverse("students:course-gradebook", kwargs={"pk": course.pk})
+        if request.GET.get("page"):
+            page_url += f"?page={request.GET['page']}"
+
+        if not formset.is_valid():
+            if is_ajax:
+                errors = {
+                    form["id"].value(): {
+                        field_name: [str(error) for error in field_errors]
+                        for field_name, field_errors in form.errors.items()
+                    }
+                    for form in formset.forms
+                    if form.errors
+                }
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "errors": errors,
+                        "non_form_errors": [str(error) for error in formset.non_form_errors()],
+                        "message": "Please correct the errors below.",
+                    },
+                    status=400,
+                )
+            messages.error(request, "Please correct the errors below.")
+            page = self.get_page(request, course)
+            return self.render_gradebook(request, course, page, formset=formset, status=400)
+
+        try:
+            saved, conflicts = self.save_grades(course, formset)
+        except Exception as e:
+            error_message = f"Error saving grades: {str(e)}"
+            logger.error(f"Error saving grades for course {course.pk}: {e}")
+
+            if is_ajax:
+                return JsonResponse({"success": False, "error": error_message}, status=500)
+            messages.error(request, error_message)
+            return redirect(page_url)
+
+        success_message = f"{saved} enrollment(s) updated."
+        conflict_message = None
+        if conflicts:
+            conflict_message = (
+                f"{len(conflicts)} row(s) were changed by someone else after the gradebook "
+                f"was opened and were not saved: {', '.join(conflicts.values())}. "
+                "The gradebook now shows their current values."
+            )
+
+        if is_ajax:
+            return JsonResponse(
+                {
+                    "success": not conflicts,
+                    "message": success_message,
+                    "saved": saved,
+                    "conflicts": [
+                        {"id": enrollment_id, "student": name}
+                        for enrollment_id, name in conflicts.items()
+                    ],
+                    "conflict_message": conflict_message,
+                    "redirect_url": request.build_absolute_uri(page_url),
+                },
+                status=409 if conflicts else 200,
+            )
+
+        messages.success(request, success_message)
+        if conflict_message:
+            messages.warning(request, conflict_message)
+        return redirect(page_url)
+
+    def save_grades(self, course, formset):
+        """
+        Write the rows the user edited in one bulk_update. Returns (rows
+        saved, {enrollment id: student name} of the edited rows that
+        changed since they were rendered). Rows left alone are not
+        compared, however stale their rendered values are.
+        """
+        submitted = {
+            form.cleaned_data["id"]: form.cleaned_data
+            for form in formset.forms
+            if form.has_changed()
+        }
+        changed, conflicts = [], {}
+        if not submitted:
+            return 0, conflicts
+
+        with transaction.atomic():
+            current = (
+                Enrollment.objects.select_for_update(of=("self",))
+                .filter(course=course, pk__in=submitted)
+                .select_related("student")
+                .only(
+                    "id", *GRADEBOOK_FIELDS, "updated_at",
+                    "student__first_name", "student__last_name",
+                )
+            )
+            current = list(current)
+            # Rows deleted or moved to another course meanwhile
+            for enrollment_id in submitted.keys() - {enrollment.pk for enrollment in current}:
+                conflicts[enrollment_id] = f"enrollment #{enrollment_id} (removed)"
+            for enrollment in current:
+                values = submitted[enrollment.pk]
+                if all(getattr(enrollment, field) == values[field] for field in GRADEBOOK_FIELDS):
+                    continue
+                if row_version(enrollment) != values["version"]:
+                    conflicts[enrollment.pk] = enrollment.student.full_name
+                    continue
+                for field in GRADEBOOK_FIELDS:
+                    setattr(enrollment, field, values[field])
+                changed.append(enrollment)
+
+            if changed:
+                # Also stamps updated_at and updated_by, see BaseQuerySet
+                Enrollment.objects.bulk_update(changed, GRADEBOOK_FIELDS)
+
+        if changed:
+            # bulk_update sends no signals
+            bump_model_version(Enrollment)
+        return len(changed), conflicts
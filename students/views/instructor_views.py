@@ -5,25 +5,46 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Prefetch
 
 from students.forms.instructor_form import InstructorForm
-from students.models.metadata_model import MetaData
-from students.models.instructor_model import Instructor
 from students.models.course_model import Course
+from students.models.instructor_model import Instructor
+from students.models.metadata_model import MetaData
+from students.reference_data import active_courses
+from utilities.export_mixin import ExportMixin
+from utilities.filters import filter_relation
 from utilities.pagination_mixin import PaginatedListMixin
+from utilities.search import search_queryset
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
 
 logger = logging.getLogger(__name__)
 
 
-class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
+class InstructorView(LoginRequiredMixin, PaginatedListMixin, ExportMixin, View):
     """Instructor view for listing, adding, editing, and deleting instructors"""
 
     login_url = "/login/"
     redirect_field_name = "next"
     paginate_by = 15  # Override default pagination
+    list_prefetch = (
+        Prefetch("courses", queryset=Course.objects.only("name")),
+        Prefetch("metadata", queryset=MetaData.objects.only("key")),
+    )
+    export_filename = "instructors"
+    export_fields = [
+        ("ID", "id"),
+        ("First Name", "first_name"),
+        ("Last Name", "last_name"),
+        ("Email", "email"),
+        ("Phone Number", "phone_number"),
+        ("Active", "is_active"),
+        ("Created At", "created_at"),
+        ("Courses", "courses"),
+        ("Metadata", "metadata"),
+    ]
+    export_related_format = {"courses": "{course_code}", "metadata": "{key}={value}"}
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -33,6 +54,8 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_instructor(request, pk)
         elif request.resolver_match.url_name == "instructor-delete" and pk:
             return self.delete_instructor(request, pk)
+        elif request.resolver_match.url_name == "instructor-export":
+            return self.export_instructors(request)
 
         else:
             return self.instructor_list(request)
@@ -63,7 +86,7 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
 
         metadata_filter = request.GET.get("metadata")
         if metadata_filter:
-            queryset = queryset.filter(metadata__key=metadata_filter)
+            queryset = filter_relation(queryset, "metadata__key", metadata_filter)
 
         status_filter = request.GET.get("active_status")
         if status_filter:
@@ -72,17 +95,13 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
 
         course_filter = request.GET.get("course")
         if course_filter:
-            queryset = queryset.filter(courses__id=course_filter)
+            queryset = filter_relation(queryset, "courses__id", course_filter)
 
         search_query = request.GET.get("search")
         if search_query:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_query)
-                | Q(last_name__icontains=search_query)
-                | Q(email__icontains=search_query)
-            )
+            queryset = search_queryset(queryset, search_query)
 
-        return queryset.distinct().order_by("-created_at")
+        return queryset.order_by("-created_at")
 
     @method_decorator(
         permission_required("students.view_instructor", raise_exception=True)
@@ -93,14 +112,13 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
 
         pagination_context = self.get_pagination_context(request, filtered_queryset)
 
-        # Additional context
-        metadata_list = MetaData.objects.all()
-        course_list = Course.objects.filter(is_active=True)
+        # The course filter loads its options remotely
+        course_id = request.GET.get("course", "")
+        selected_course = active_courses.get(course_id)
 
         context = {
             **pagination_context,
-            "metadata_list": metadata_list,
-            "course_list": course_list,
+            "selected_course": selected_course,
             "current_filters": {
                 "metadata": request.GET.get("metadata", ""),
                 "active_status": request.GET.get("active_status", ""),
@@ -111,19 +129,22 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
 
         return render(request, "students/instructors/instructors_list.html", context)
 
+    @method_decorator(
+        permission_required("students.view_instructor", raise_exception=True)
+    )
+    def export_instructors(self, request):
+        """Stream the filtered instructor list as CSV or JSON Lines"""
+        return self.export_response(request)
+
     @method_decorator(
         permission_required("students.add_instructor", raise_exception=True)
     )
     def add_instructor(self, request):
         """Display add instructor form"""
         form = InstructorForm()
-        metadata_list = MetaData.objects.all()
-        course_list = Course.objects.filter(is_active=True)
 
         context = {
             "form": form,
-            "metadata_list": metadata_list,
-            "course_list": course_list,
             "is_adding": True,
             "page_title": "Add Instructor",
         }
@@ -199,12 +220,8 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            metadata_list = MetaData.objects.all()
-            course_list = Course.objects.filter(is_active=True)
             context = {
                 "form": form,
-                "metadata_list": metadata_list,
-                "course_list": course_list,
                 "is_adding": True,
                 "page_title": "Add Instructor",
             }
@@ -220,12 +237,8 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
         instructor = get_object_or_404(Instructor, pk=pk)
 
         form = InstructorForm(instance=instructor)
-        metadata_list = MetaData.objects.all()
-        course_list = Course.objects.filter(is_active=True)
         context = {
             "form": form,
-            "metadata_list": metadata_list,
-            "course_list": course_list,
             "instructor_obj": instructor,
             "is_editing": True,
             "page_title": f"Edit Instructor: {instructor.full_name}",
@@ -294,12 +307,8 @@ class InstructorView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            metadata_list = MetaData.objects.all()
-            course_list = Course.objects.filter(is_active=True)
             context = {
                 "form": form,
-                "metadata_list": metadata_list,
-                "course_list": course_list,
                 "instructor_obj": instructor,
                 "is_editing": True,
                 "page_title": f"Edit Instructor: {instructor.full_name}",
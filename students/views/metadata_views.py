@@ -8,6 +8,7 @@ from django.contrib import messages
 from django.db.models import Q
 from students.forms.metadata_forms import MetaDataForm
 from students.models.metadata_model import MetaData
+from utilities.export_mixin import ExportMixin
 from utilities.pagination_mixin import PaginatedListMixin
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
@@ -16,11 +17,19 @@ from django.utils.decorators import method_decorator
 logger = logging.getLogger(__name__)
 
 
-class MetaDataView(LoginRequiredMixin, PaginatedListMixin, View):
+class MetaDataView(LoginRequiredMixin, PaginatedListMixin, ExportMixin, View):
     """MetaData view for listing, adding, editing, and deleting metadata"""
     login_url = '/login/'           
     redirect_field_name = 'next'            
     paginate_by = 15  # Override default pagination
+    export_filename = "metadata"
+    export_fields = [
+        ("ID", "id"),
+        ("Key", "key"),
+        ("Value", "value"),
+        ("Active", "is_active"),
+        ("Created At", "created_at"),
+    ]
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -30,6 +39,8 @@ class MetaDataView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_metadata(request, pk)
         elif request.resolver_match.url_name == 'metadata-delete' and pk:
             return self.delete_metadata(request, pk)
+        elif request.resolver_match.url_name == 'metadata-export':
+            return self.export_metadata(request)
       
         else:
             return self.metadata_list(request)
@@ -78,7 +89,7 @@ class MetaDataView(LoginRequiredMixin, PaginatedListMixin, View):
                 | Q(value__icontains=search_query)
             )
 
-        return queryset.distinct().order_by("-created_at")
+        return queryset.order_by("-created_at")
     @method_decorator(permission_required("students.view_metadata", raise_exception=True))
 
     def metadata_list(self, request):
@@ -99,6 +110,11 @@ class MetaDataView(LoginRequiredMixin, PaginatedListMixin, View):
         }
 
         return render(request, "students/metadata/metadata_list.html", context)
+    @method_decorator(permission_required("students.view_metadata", raise_exception=True))
+    def export_metadata(self, request):
+        """Stream the filtered metadata list as CSV or JSON Lines"""
+        return self.export_response(request)
+
     @method_decorator(permission_required("students.add_metadata", raise_exception=True))
 
     def add_metadata(self, request):
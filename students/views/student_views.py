@@ -5,24 +5,43 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Prefetch
 
 from students.forms.student_form import StudentForm
 from students.models.metadata_model import MetaData
 from students.models.student_model import Student
+from utilities.export_mixin import ExportMixin
+from utilities.filters import filter_relation
 from utilities.pagination_mixin import PaginatedListMixin
+from utilities.search import search_queryset
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
 
 logger = logging.getLogger(__name__)
 
 
-class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
+class StudentView(LoginRequiredMixin, PaginatedListMixin, ExportMixin, View):
     """Student view for listing, adding, editing, and deleting students"""
 
     login_url = "/login/"
     redirect_field_name = "next"
     paginate_by = 15  # Override default pagination
+    pagination_mode = "keyset"  # Seek pagination keeps deep pages cheap
+    keyset_ordering = ("-created_at", "id")
+    count_strategy = "estimate"  # Planner estimate when unfiltered, cached count otherwise
+    list_prefetch = (Prefetch("metadata", queryset=MetaData.objects.only("key")),)
+    export_filename = "students"
+    export_fields = [
+        ("ID", "id"),
+        ("First Name", "first_name"),
+        ("Last Name", "last_name"),
+        ("Email", "email"),
+        ("Date of Birth", "date_of_birth"),
+        ("Active", "is_active"),
+        ("Created At", "created_at"),
+        ("Metadata", "metadata"),
+    ]
+    export_related_format = {"metadata": "{key}={value}"}
 
     def get(self, request, pk=None):
         """Handle GET requests based on URL name"""
@@ -32,6 +51,8 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_student(request, pk)
         elif request.resolver_match.url_name == "student-delete" and pk:
             return self.delete_student(request, pk)
+        elif request.resolver_match.url_name == "student-export":
+            return self.export_students(request)
 
         else:
             return self.student_list(request)
@@ -62,7 +83,7 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
 
         metadata_filter = request.GET.get("metadata")
         if metadata_filter:
-            queryset = queryset.filter(metadata__key=metadata_filter)
+            queryset = filter_relation(queryset, "metadata__key", metadata_filter)
         # Status filter (active/inactive)
         status_filter = request.GET.get("active_status")
         if status_filter:
@@ -71,19 +92,8 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
 
         search_query = request.GET.get("search")
         if search_query:
-            search_parts = search_query.split()
-            
-            query_filter = Q()
-            
-            for part in search_parts:
-                query_filter &= (
-                    Q(first_name__icontains=part) |
-                    Q(last_name__icontains=part) |
-                    Q(email__icontains=part)
-                )
-            
-            queryset = queryset.filter(query_filter)
-        return queryset.distinct().order_by("-created_at")
+            queryset = search_queryset(queryset, search_query)
+        return queryset.order_by("-created_at")
 
     @method_decorator(
         permission_required("students.view_student", raise_exception=True)
@@ -96,11 +106,8 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
         # Get pagination context
         pagination_context = self.get_pagination_context(request, filtered_queryset)
 
-        # Additional context
-        metadata_list = MetaData.objects.filter(is_active=True)
         context = {
             **pagination_context,
-            "metadata_list": metadata_list,
             "current_filters": {
                 "metadata": request.GET.get("metadata", ""),
                 "active_status": request.GET.get("active_status", ""),
@@ -110,15 +117,20 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
 
         return render(request, "students/students/students_list.html", context)
 
+    @method_decorator(
+        permission_required("students.view_student", raise_exception=True)
+    )
+    def export_students(self, request):
+        """Stream the filtered student list as CSV or JSON Lines"""
+        return self.export_response(request)
+
     @method_decorator(permission_required("students.add_student", raise_exception=True))
     def add_student(self, request):
         """Display add student form"""
         form = StudentForm()
-        metadata_list = MetaData.objects.all()
 
         context = {
             "form": form,
-            "metadata_list": metadata_list,
             "is_adding": True,
             "page_title": "Add Student",
         }
@@ -184,10 +196,8 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            metadata_list = MetaData.objects.all()
             context = {
                 "form": form,
-                "metadata_list": metadata_list,
                 "is_adding": True,
                 "page_title": "Add Student",
             }
@@ -201,11 +211,9 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
         student = get_object_or_404(Student, pk=pk)
 
         form = StudentForm(instance=student)
-        metadata_list = MetaData.objects.all()
 
         context = {
             "form": form,
-            "metadata_list": metadata_list,
             "student_obj": student,
             "is_editing": True,
             "page_title": f"Edit Student: {student.full_name}",
@@ -272,10 +280,8 @@ class StudentView(LoginRequiredMixin, PaginatedListMixin, View):
                 messages.error(request, "Please correct the errors below.")
 
         if not is_ajax:
-            metadata_list = MetaData.objects.all()
             context = {
                 "form": form,
-                "metadata_list": metadata_list,
                 "student_obj": student,
                 "is_editing": True,
                 "page_title": f"Edit Student: {student.full_name}",
@@ -0,0 +1,19 @@
+from django.contrib.auth.mixins import AccessMixin
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    LoginRequiredMixin for views whose handlers are coroutines. The lazy
+    request.user can't query the database from async code, so the user is
+    resolved with request.auser() and put in its place.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def ahas_perms(self, *perms):
+        """Whether the user holds every permission, checked without blocking"""
+        return await self.request.user.ahas_perms(perms)
@@ -0,0 +1,148 @@
+"""
+Bulk loader for large inserts such as the sample-data commands.
+
+Rows are inserted in batches of ``batch_size``. On PostgreSQL they are
+streamed with ``COPY ... FROM STDIN``, with the primary keys reserved from
+the table's sequence first so the caller can still link the rows. Other
+backends fall back to batched bulk_create. Many-to-many links are written
+straight into the through table from (source pk, target pk) pairs.
+
+Like bulk_create, the loader sends no model signals. It bumps the cache
+versions of the models it writes; anything else maintained by signals
+(e.g. the dashboard counters) must be reconciled by the caller.
+"""
+import io
+from itertools import islice
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from utilities.cache_versions import bump_model_version
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def copy_text_value(value):
+    """Format one value for COPY's text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class BulkLoader:
+    """Batched inserts of model rows and many-to-many links"""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, using=DEFAULT_DB_ALIAS, use_copy=None):
+        self.batch_size = max(int(batch_size), 1)
+        self.using = using
+        self.connection = connections[using]
+        supports_copy = self.connection.vendor == "postgresql"
+        self.use_copy = supports_copy if use_copy is None else bool(use_copy) and supports_copy
+
+    def copy_rows(self, table, columns, rows):
+        """Stream rows into a table with COPY FROM STDIN, one batch at a time"""
+        quote = self.connection.ops.quote_name
+        sql = (
+            f"COPY {quote(table)} ({', '.join(quote(column) for column in columns)}) "
+            "FROM STDIN"
+        )
+        with self.connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            for batch in batched(rows, self.batch_size):
+                buffer = io.StringIO()
+                for row in batch:
+                    buffer.write("\t".join(copy_text_value(value) for value in row))
+                    buffer.write("\n")
+                buffer.seek(0)
+                if hasattr(raw_cursor, "copy_expert"):
+                    # psycopg2
+                    raw_cursor.copy_expert(sql, buffer)
+                else:
+                    # psycopg 3
+                    with raw_cursor.copy(sql) as copy:
+                        copy.write(buffer.getvalue())
+
+    def reserve_pks(self, model, count):
+        """Take ``count`` primary key values from the table's sequence"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+                [model._meta.db_table, model._meta.pk.column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def create(self, model, objs):
+        """
+        Insert unsaved instances and set their primary keys. Returns the
+        instances, like bulk_create.
+        """
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        with transaction.atomic(using=self.using):
+            if self.use_copy:
+                for obj, pk in zip(objs, self.reserve_pks(model, len(objs))):
+                    obj.pk = pk
+                fields = model._meta.concrete_fields
+                rows = (
+                    [
+                        field.get_db_prep_save(field.pre_save(obj, True), self.connection)
+                        for field in fields
+                    ]
+                    for obj in objs
+                )
+                self.copy_rows(model._meta.db_table, [field.column for field in fields], rows)
+                for obj in objs:
+                    obj._state.adding = False
+                    obj._state.db = self.using
+            else:
+                model._base_manager.using(self.using).bulk_create(objs, batch_size=self.batch_size)
+
+        bump_model_version(model)
+        return objs
+
+    def add_m2m(self, model, field_name, pairs):
+        """
+        Link rows through ``model.field_name`` from (model pk, related pk)
+        pairs. The pairs must not already be linked.
+        """
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        pairs = list(pairs)
+        if not pairs:
+            return 0
+
+        with transaction.atomic(using=self.using):
+            if self.use_copy:
+                self.copy_rows(
+                    through._meta.db_table,
+                    [field.m2m_column_name(), field.m2m_reverse_name()],
+                    pairs,
+                )
+            else:
+                through._base_manager.using(self.using).bulk_create(
+                    (
+                        through(**{f"{source}_id": source_pk, f"{target}_id": target_pk})
+                        for source_pk, target_pk in pairs
+                    ),
+                    batch_size=self.batch_size,
+                )
+
+        bump_model_version(model)
+        bump_model_version(field.related_model)
+        return len(pairs)
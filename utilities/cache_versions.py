@@ -0,0 +1,76 @@
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+VERSION_KEY_PREFIX = "version"
+
+
+def _version_key(name):
+    return f"{VERSION_KEY_PREFIX}:{name}"
+
+
+def _fresh_version():
+    # Seed new counters from the clock so that a counter evicted from the
+    # cache never restarts at a value that older cache entries still use.
+    return int(time.time() * 1000)
+
+
+def get_version(name):
+    """Return the current value of a shared version counter"""
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key) or _fresh_version()
+    return version
+
+
+def bump_version(name):
+    """Invalidate everything cached against a version counter"""
+    key = _version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_model_version(model):
+    """Return the write version of a model"""
+    return get_version(model._meta.label_lower)
+
+
+def bump_model_version(model):
+    """Mark a model as written"""
+    return bump_version(model._meta.label_lower)
+
+
+def get_models_version(models):
+    """Return a combined version string for several models"""
+    return ".".join(str(get_model_version(model)) for model in models)
+
+
+def _bump_sender_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def _bump_m2m_versions(sender, instance, action, model, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_model_version(type(instance))
+        bump_model_version(model)
+
+
+def track_model_versions(*models):
+    """Bump a model's version whenever it or one of its M2M relations is written"""
+    for model in models:
+        uid = f"cache_versions:{model._meta.label_lower}"
+        post_save.connect(_bump_sender_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_sender_version, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _bump_m2m_versions,
+                sender=field.remote_field.through,
+                dispatch_uid=f"{uid}:{field.name}",
+            )
@@ -6,8 +6,10 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
 from utilities.pagination_mixin import PaginatedListMixin
+from utilities.export_mixin import ExportMixin
+from utilities.filters import filter_relation
+from utilities.search import search_queryset
 from django.contrib.auth.decorators import permission_required
 from django.utils.decorators import method_decorator
 
@@ -15,7 +17,7 @@ from django.utils.decorators import method_decorator
 logger = logging.getLogger(__name__)
 
 
-class BaseCRUDView(LoginRequiredMixin, PaginatedListMixin, View):
+class BaseCRUDView(LoginRequiredMixin, PaginatedListMixin, ExportMixin, View):
     """Base CRUD view with common functionality"""
     
     # Class attributes that must be overridden in subclasses
@@ -60,6 +62,7 @@ class BaseCRUDView(LoginRequiredMixin, PaginatedListMixin, View):
             'add': f"{base}-add",
             'edit': f"{base}-edit",
             'delete': f"{base}-delete",
+            'export': f"{base}-export",
         }
     
     def get_templates(self):
@@ -96,7 +99,7 @@ class BaseCRUDView(LoginRequiredMixin, PaginatedListMixin, View):
         permissions = self.get_permissions()
         # Determine which permission is needed
         required_permission = None
-        if url_name == url_names['list']:
+        if url_name in [url_names['list'], url_names['export']]:
             required_permission = permissions['view']
         elif url_name == url_names['add']:
             required_permission = permissions['add']
@@ -122,6 +125,8 @@ class BaseCRUDView(LoginRequiredMixin, PaginatedListMixin, View):
             return self.edit_view(request, pk)
         elif url_name == url_names['delete'] and pk:
             return self.delete_view(request, pk)
+        elif url_name == url_names['export']:
+            return self.export_view(request)
         else:
             return self.list_view(request)
     
@@ -208,6 +213,10 @@ class BaseCRUDView(LoginRequiredMixin, PaginatedListMixin, View):
         templates = self.get_templates()
         return render(request, templates['list'], context)
     
+    def export_view(self, request):
+        """Stream the filtered list as CSV or JSON Lines"""
+        return self.export_response(request)
+    
     def add_view(self, request):
         """Display add form"""
         form = self.form_class()
@@ -391,15 +400,8 @@ class FilterMixin:
     filter_fields = {}  # {filter_param: field_lookup}
     
     def apply_search_filter(self, queryset, search_query):
-        """Apply search filter across specified fields"""
-        if not search_query or not self.search_fields:
-            return queryset
-        
-        search_q = Q()
-        for field in self.search_fields:
-            search_q |= Q(**{f"{field}__icontains": search_query})
-        
-        return queryset.filter(search_q)
+        """Apply search filter, using the model's full-text search when it has one"""
+        return search_queryset(queryset, search_query, self.search_fields)
     
     def apply_field_filters(self, queryset, request):
         """Apply field-specific filters"""
@@ -409,7 +411,7 @@ class FilterMixin:
                 # Handle boolean filters
                 if value.lower() in ['true', 'false']:
                     value = value.lower() == 'true'
-                queryset = queryset.filter(**{field_lookup: value})
+                queryset = filter_relation(queryset, field_lookup, value)
         
         return queryset
     
@@ -424,7 +426,8 @@ class FilterMixin:
         search_query = request.GET.get("search")
         queryset = self.apply_search_filter(queryset, search_query)
         
-        return queryset.distinct().order_by(self.get_default_ordering())
+        # Relation filters are EXISTS subqueries, so rows are never duplicated
+        return queryset.order_by(self.get_default_ordering())
     
     def get_default_ordering(self):
         """Get default ordering for queryset"""
@@ -446,8 +449,8 @@ class MetadataMixin:
         
         # Add metadata list if the model has metadata field
         if hasattr(self.model, 'metadata'):
-            from students.models.metadata_model import MetaData
-            context['metadata_list'] = MetaData.objects.all()
+            from students.reference_data import metadata_list
+            context['metadata_list'] = metadata_list.all()
         
         return context
 
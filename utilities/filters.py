@@ -0,0 +1,80 @@
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.core.exceptions import FieldDoesNotExist
+
+
+def is_multi_valued(field):
+    """True for relations that can match several rows (M2M and reverse FK)"""
+    return field.is_relation and (field.many_to_many or field.one_to_many)
+
+
+def _split_multi_valued(model, lookup):
+    """
+    Split a lookup at its first multi-valued relation.
+
+    Returns (prefix, field, rest) where prefix is the single-valued path to
+    the relation, or None when the lookup never crosses a multi-valued one.
+    """
+    parts = lookup.split(LOOKUP_SEP)
+    current = model
+    for index, part in enumerate(parts):
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if is_multi_valued(field):
+            return parts[:index], field, LOOKUP_SEP.join(parts[index + 1:])
+        if not field.is_relation:
+            return None
+        current = field.related_model
+    return None
+
+
+def _relation_rows(field, outer_ref, rest, value):
+    """Rows of the relation belonging to the outer row and matching rest=value"""
+    if field.many_to_many:
+        # Query the through table so plain id filters need no further join
+        if field.auto_created:
+            m2m = field.remote_field
+            through = m2m.remote_field.through
+            source, target = m2m.m2m_reverse_field_name(), m2m.m2m_field_name()
+        else:
+            through = field.remote_field.through
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        rows = through._base_manager.filter(**{source: outer_ref})
+        if rest is not None:
+            rows = rows.filter(**{LOOKUP_SEP.join(filter(None, [target, rest])): value})
+        return rows
+
+    rows = field.related_model._base_manager.filter(**{field.field.name: outer_ref})
+    if rest is not None:
+        rows = rows.filter(**{rest or "pk": value})
+    return rows
+
+
+def relation_q(model, lookup, value):
+    """
+    Build a Q for ``lookup=value`` that never duplicates rows of ``model``.
+
+    Lookups crossing a many-to-many or reverse foreign key relation become an
+    EXISTS semi-join instead of a JOIN, so the queryset needs no DISTINCT.
+    Other lookups are returned as a plain Q.
+    """
+    split = _split_multi_valued(model, lookup)
+    if split is None:
+        return Q(**{lookup: value})
+
+    prefix, field, rest = split
+    outer_ref = OuterRef(LOOKUP_SEP.join(prefix + ["pk"]))
+
+    # relation__isnull=True/False means "has no/some related rows"
+    if rest == "isnull":
+        exists = Exists(_relation_rows(field, outer_ref, None, None))
+        return Q(~exists) if value else Q(exists)
+
+    return Q(Exists(_relation_rows(field, outer_ref, rest, value)))
+
+
+def filter_relation(queryset, lookup, value):
+    """Filter a queryset on ``lookup=value`` using relation_q"""
+    return queryset.filter(relation_q(queryset.model, lookup, value))
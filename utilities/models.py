@@ -1,14 +1,151 @@
 import logging
 from django.db import models
+from django.db.models.signals import pre_save
+from django.dispatch import Signal
 from django.conf import settings
+from django.utils import timezone
 from typing import TypeVar, Optional, Type
 
+from accounts.middleware import get_current_user
 
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound="BaseModel")
 
+# Sent by BaseQuerySet.bulk_update after the write, with the updated ``objs``
+# and the ``fields`` written (audit stamps included); Django sends no
+# signals for bulk writes.
+post_bulk_update = Signal()
+
+# Instance attribute holding {attname: value} as last read from or written
+# to the database, what the save and delete handlers diff against
+LOADED_VALUES_ATTR = "_loaded_values"
+
+
+def current_user():
+    """The authenticated user of the current request, or None"""
+    user = get_current_user()
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+def loaded_values(instance):
+    """{attname: value} of an instance as stored, empty if not known"""
+    return instance.__dict__.get(LOADED_VALUES_ATTR, {})
+
+
+def _fetch_loaded_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Models that can't override from_db read the stored row back instead,
+    # only the fields about to be written
+    if raw or instance._state.adding:
+        return
+    attnames = [
+        field.attname
+        for field in sender._meta.concrete_fields
+        if update_fields is None
+        or field.name in update_fields
+        or field.attname in update_fields
+    ]
+    stored = (
+        sender._base_manager.using(instance._state.db)
+        .filter(pk=instance.pk)
+        .values(*attnames)
+        .first()
+    )
+    instance.__dict__[LOADED_VALUES_ATTR] = stored or {}
+
+
+def track_loaded_values(model):
+    """
+    Make loaded_values() work for a model. BaseModel subclasses remember
+    their values when loaded; other models (auth.User) pay one query per
+    save of an existing row.
+    """
+    if not issubclass(model, BaseModel):
+        pre_save.connect(
+            _fetch_loaded_values,
+            sender=model,
+            dispatch_uid=f"loaded_values:{model._meta.label_lower}",
+        )
+
+
+class BaseQuerySet(models.QuerySet):
+    """
+    QuerySet whose set-based writes keep the audit trail that
+    BaseModel.save() maintains. update() and bulk_update() stamp updated_at
+    and updated_by, bulk_create() stamps created_by (and updated_by on
+    upserts). Fields the caller writes explicitly are left alone.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault("updated_at", timezone.now())
+        user = current_user()
+        # bulk_update() comes through here with the attname
+        if user is not None and "updated_by_id" not in kwargs:
+            kwargs.setdefault("updated_by", user)
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        fields = list(fields)
+        user = current_user()
+        stamps = {}
+        if "updated_at" not in fields:
+            stamps["updated_at"] = timezone.now()
+        if user is not None and "updated_by" not in fields:
+            stamps["updated_by"] = user
+        for obj in objs:
+            for field_name, value in stamps.items():
+                setattr(obj, field_name, value)
+        fields += list(stamps)
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        post_bulk_update.send(sender=self.model, objs=objs, fields=fields)
+        for obj in objs:
+            obj._remember_loaded_values(fields)
+        return rows
+
+    bulk_update.alters_data = True
+
+    def bulk_create(
+        self,
+        objs,
+        batch_size=None,
+        ignore_conflicts=False,
+        update_conflicts=False,
+        update_fields=None,
+        unique_fields=None,
+    ):
+        objs = list(objs)
+        user = current_user()
+        if update_conflicts and update_fields:
+            # Rows updated by the upsert get the same stamps as update()
+            update_fields = list(update_fields)
+            stamped = ["updated_at"] + (["updated_by"] if user is not None else [])
+            update_fields += [name for name in stamped if name not in update_fields]
+        if user is not None:
+            for obj in objs:
+                if obj.created_by_id is None:
+                    obj.created_by = user
+                if update_conflicts and obj.updated_by_id is None:
+                    obj.updated_by = user
+        return super().bulk_create(
+            objs,
+            batch_size=batch_size,
+            ignore_conflicts=ignore_conflicts,
+            update_conflicts=update_conflicts,
+            update_fields=update_fields,
+            unique_fields=unique_fields,
+        )
+
+    bulk_create.alters_data = True
+
+
+BaseManager = models.Manager.from_queryset(BaseQuerySet)
+
 
 class BaseModel(models.Model):
     """
@@ -40,6 +177,8 @@ class BaseModel(models.Model):
 
     remarks = models.CharField(max_length=300, blank=True, null=True)
 
+    objects = BaseManager()
+
     class Meta:
         abstract = True
         ordering = ["-created_at"]
@@ -48,25 +187,44 @@ class BaseModel(models.Model):
             models.Index(fields=["created_by", "is_active"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered here rather than in a post_init handler, which would run
+        # for every instance built and cost more than the load itself
+        instance.__dict__[LOADED_VALUES_ATTR] = dict(zip(field_names, values))
+        return instance
+
+    def _remember_loaded_values(self, fields=None):
+        """Remember the current values of ``fields`` (all loaded fields by default) as stored"""
+        current = self.__dict__
+        stored = current.setdefault(LOADED_VALUES_ATTR, {})
+        for field in self._meta.concrete_fields:
+            if field.attname in current and (
+                fields is None or field.name in fields or field.attname in fields
+            ):
+                stored[field.attname] = current[field.attname]
+
     def save(self, *args, **kwargs):
         """
         Override save method to automatically set created_by and updated_by
         using thread-local storage from middleware.
         """
-        try:
-            # Importing to avoid circular imports
-            from accounts.middleware import get_current_user
-            
-            current_user = get_current_user()
-            if current_user and current_user.is_authenticated:
-                if not self.pk:  # New instance being created
-                    self.created_by = current_user
-                else:    
-                    self.updated_by = current_user
-                
-        except ImportError:
-            logger.warning("Middleware not available for user tracking")
-        except Exception as e:
-            logger.error(f"Error setting audit fields: {e}")
-        
-        super().save(*args, **kwargs)
\ No newline at end of file
+        user = current_user()
+        if user is not None:
+            if not self.pk:  # New instance being created
+                self.created_by = user
+            else:
+                self.updated_by = user
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields and self.pk:
+            # A partial save writes the stamps too, like BaseQuerySet.update()
+            stamps = ["updated_at"] + (["updated_by"] if user is not None else [])
+            kwargs["update_fields"] = [
+                *update_fields, *(name for name in stamps if name not in update_fields)
+            ]
+
+        super().save(*args, **kwargs)
+        # The post_save handlers have seen the previous values by now
+        self._remember_loaded_values(kwargs.get("update_fields"))
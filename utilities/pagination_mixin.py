@@ -1,31 +1,133 @@
+import base64
+import datetime
+import json
 
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from utilities.paginators import (
+    CachedCountPaginator,
+    EstimatedCountPaginator,
+    WindowCountPaginator,
+)
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps full datetime precision for cursor values"""
+
+    def default(self, o):
+        # DjangoJSONEncoder truncates to milliseconds, which would make
+        # rows sharing a millisecond fall between two pages.
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPage:
+    """A single page of a keyset (seek) paginated list"""
+
+    def __init__(self, object_list, position, has_next, has_previous,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.position = position  # zero-based offset of the first row, display only
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def start_index(self):
+        return self.position + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self.position + len(self.object_list)
+
 
 class PaginatedListMixin:
     """Mixin to provide pagination functionality for list views"""
-    
+
     paginate_by = 10  # Default items per page
     page_kwarg = 'page'
-    
+
+    # Keyset pagination (opt-in). The ordering must be unique, so always end
+    # it with the primary key, e.g. ("-created_at", "id").
+    pagination_mode = 'offset'  # 'offset' or 'keyset'
+    keyset_ordering = None
+    cursor_kwarg = 'cursor'
+
+    # How the total row count is obtained, see utilities.paginators
+    count_strategy = 'exact'  # 'exact', 'cached', 'estimate' or 'window'
+    count_strategies = {
+        'exact': Paginator,
+        'cached': CachedCountPaginator,
+        'estimate': EstimatedCountPaginator,
+        'window': WindowCountPaginator,
+    }
+
+    # Relations the list template reads on every row, loaded in a fixed
+    # number of queries per page. list_prefetch accepts lookups and Prefetch
+    # objects, e.g. Prefetch("metadata", queryset=MetaData.objects.only("key"))
+    list_select_related = ()
+    list_prefetch = ()
+
     def get_paginate_by(self):
         """Return the number of items to paginate by"""
         return getattr(self, 'paginate_by', 10)
-    
+
+    def get_keyset_ordering(self):
+        """Return the ordering used for keyset pagination"""
+        if self.keyset_ordering:
+            return tuple(self.keyset_ordering)
+        return ("id",)
+
+    def get_paginator(self, queryset, per_page, count=None):
+        """Return a paginator implementing the view's count strategy"""
+        paginator_class = self.count_strategies.get(self.count_strategy, Paginator)
+        paginator = paginator_class(queryset, per_page)
+        if count is not None:
+            # Total already known (e.g. from an aggregate), skip the COUNT query
+            paginator.__dict__['count'] = count
+        return paginator
+
     def get_queryset(self):
         """Override this method in subclasses to provide the queryset"""
         raise NotImplementedError("Subclasses must implement get_queryset method")
-    
+
     def get_filtered_queryset(self, request):
         """Override this method in subclasses to provide filtering logic"""
         return self.get_queryset()
-    
-    def paginate_queryset(self, request, queryset):
+
+    def get_list_queryset(self, queryset):
+        """Apply list_select_related and list_prefetch to a list queryset"""
+        if self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        if self.list_prefetch:
+            queryset = queryset.prefetch_related(*self.list_prefetch)
+        return queryset
+
+    def paginate_queryset(self, request, queryset, count=None):
         """Paginate the queryset"""
         paginate_by = self.get_paginate_by()
-        paginator = Paginator(queryset, paginate_by)
-        
+        paginator = self.get_paginator(queryset, paginate_by, count=count)
+
         page = request.GET.get(self.page_kwarg)
-        
+
         try:
             page_obj = paginator.page(page)
         except PageNotAnInteger:
@@ -34,13 +136,144 @@ class PaginatedListMixin:
         except EmptyPage:
             # If page is out of range, deliver last page of results
             page_obj = paginator.page(paginator.num_pages)
-        
+
         return page_obj, paginator
-    
-    def get_pagination_context(self, request, queryset):
-        """Get pagination context for templates"""
-        page_obj, paginator = self.paginate_queryset(request, queryset)
-        
+
+    def encode_cursor(self, values, position, reverse=False):
+        """Encode ordering values into an opaque, URL-safe cursor token"""
+        payload = json.dumps(
+            {"v": list(values), "p": position, "r": reverse},
+            cls=CursorJSONEncoder,
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def get_keyset_fields(self, model, ordering=None):
+        """The model fields of the (keyset) ordering, following relations"""
+        fields = []
+        for name in ordering or self.get_keyset_ordering():
+            opts = model._meta
+            *relations, field_name = name.lstrip("-").split("__")
+            for relation in relations:
+                opts = opts.get_field(relation).related_model._meta
+            fields.append(opts.pk if field_name == "pk" else opts.get_field(field_name))
+        return fields
+
+    def decode_cursor(self, token, model, ordering=None):
+        """
+        Decode a cursor token, returning None if it is missing or invalid.
+        The values are converted by the fields of ``model`` in the ordering
+        (the keyset ordering by default): the token comes from the URL, so
+        it is validated before reaching a query.
+        """
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload["v"]
+            fields = self.get_keyset_fields(model, ordering)
+            if not isinstance(values, list) or len(values) != len(fields):
+                return None
+            values = [field.to_python(value) for field, value in zip(fields, values)]
+            if None in values:
+                return None  # Orderings are on non-null fields
+            position = max(int(payload.get("p", 0)), 0)
+            return values, position, bool(payload.get("r", False))
+        except (ValidationError, ValueError, KeyError, TypeError):
+            return None
+
+    def _keyset_filter(self, ordering, values, reverse):
+        """Build the "row comes after the cursor" predicate for the ordering"""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            descending = field.startswith("-")
+            if reverse:
+                descending = not descending
+            name = field.lstrip("-")
+
+            clause = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+            for previous_field, previous_value in zip(ordering[:index], values[:index]):
+                clause &= Q(**{previous_field.lstrip("-"): previous_value})
+            condition |= clause
+        return condition
+
+    def _keyset_values(self, obj, ordering):
+        """Read the ordering values from a row"""
+        values = []
+        for field in ordering:
+            value = obj
+            for part in field.lstrip("-").split("__"):
+                value = getattr(value, part)
+            values.append(value)
+        return values
+
+    def paginate_keyset(self, request, queryset):
+        """Seek-paginate the queryset; each page costs the same whatever its depth"""
+        paginate_by = self.get_paginate_by()
+        ordering = self.get_keyset_ordering()
+        cursor = self.decode_cursor(request.GET.get(self.cursor_kwarg), queryset.model)
+
+        position, reverse = 0, False
+        if cursor:
+            values, position, reverse = cursor
+            queryset = queryset.filter(self._keyset_filter(ordering, values, reverse))
+
+        if reverse:
+            reversed_ordering = [
+                field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+            ]
+            rows = list(queryset.order_by(*reversed_ordering)[: paginate_by + 1])
+            has_more = len(rows) > paginate_by
+            rows = rows[:paginate_by][::-1]
+            has_next, has_previous = True, has_more
+            position = max(position - len(rows), 0)
+        else:
+            rows = list(queryset.order_by(*ordering)[: paginate_by + 1])
+            has_more = len(rows) > paginate_by
+            rows = rows[:paginate_by]
+            has_next, has_previous = has_more, cursor is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(
+                self._keyset_values(rows[-1], ordering), position + len(rows)
+            )
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(
+                self._keyset_values(rows[0], ordering), position, reverse=True
+            )
+
+        return KeysetPage(
+            rows,
+            position,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+
+    def get_pagination_context(self, request, queryset, count=None):
+        """
+        Get pagination context for templates. Pass ``count`` when the total
+        is already known to save the paginator's COUNT query.
+        """
+        queryset = self.get_list_queryset(queryset)
+
+        if self.pagination_mode == 'keyset':
+            page_obj = self.paginate_keyset(request, queryset)
+            # The paginator is only kept for its (lazy) count used in templates
+            paginator = self.get_paginator(queryset, self.get_paginate_by(), count=count)
+            return {
+                'page_obj': page_obj,
+                'paginator': paginator,
+                'is_paginated': page_obj.has_other_pages(),
+                'is_keyset': True,
+                'queryset': page_obj.object_list,
+            }
+
+        page_obj, paginator = self.paginate_queryset(request, queryset, count=count)
+
         return {
             'page_obj': page_obj,
             'paginator': paginator,
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections
+from django.db.models import Count, Window
+from django.utils.functional import cached_property
+
+from utilities.cache_versions import get_models_version
+
+logger = logging.getLogger(__name__)
+
+AUDIT_FIELDS = ("created_by", "updated_by")
+
+
+def count_dependencies(model):
+    """Models whose writes can change a filtered count of ``model``"""
+    models = [model]
+    for field in model._meta.get_fields():
+        if (
+            field.is_relation
+            and not field.auto_created
+            and field.related_model is not None
+            and field.name not in AUDIT_FIELDS
+            and field.related_model not in models
+        ):
+            models.append(field.related_model)
+    return models
+
+
+def queryset_cache_key(prefix, queryset):
+    """
+    Cache key for a value computed from ``queryset``, built from its SQL and
+    the versions of the models it depends on. Raises EmptyResultSet when the
+    queryset can never match anything.
+    """
+    query = queryset.query
+    sql, params = query.sql_with_params()
+    digest = hashlib.md5(f"{sql}|{params!r}".encode()).hexdigest()
+    version = get_models_version(count_dependencies(query.model))
+    return f"{prefix}:{query.model._meta.label_lower}:{version}:{digest}"
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches exact counts per filter combination"""
+
+    cache_timeout = 300
+
+    def get_count_cache_key(self):
+        """Cache key built from the count SQL and the dependent model versions"""
+        return queryset_cache_key("count", self.object_list)
+
+    def get_exact_count(self):
+        return super().count
+
+    @cached_property
+    def count(self):
+        try:
+            key = self.get_count_cache_key()
+        except EmptyResultSet:
+            return 0
+
+        count = cache.get(key)
+        if count is None:
+            count = self.get_exact_count()
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+    """
+    Paginator that reads the planner's row estimate for unfiltered lists and
+    falls back to cached exact counts for filtered ones.
+    """
+
+    # Below this the estimate is too coarse and an exact count is cheap anyway
+    estimate_threshold = 10000
+
+    def get_estimated_count(self):
+        """Return the Postgres planner estimate for the table, or None"""
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor != "postgresql" or query.where:
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [query.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        if not row or row[0] < self.estimate_threshold:
+            return None
+        return row[0]
+
+    @cached_property
+    def estimated_count(self):
+        try:
+            return self.get_estimated_count()
+        except DatabaseError as e:
+            logger.warning(f"Row estimate unavailable: {e}")
+            return None
+
+    @property
+    def is_estimated(self):
+        return self.estimated_count is not None
+
+    @cached_property
+    def count(self):
+        if self.is_estimated:
+            return self.estimated_count
+        return super().count
+
+
+class WindowCountPaginator(Paginator):
+    """
+    Paginator that fetches the total with ``COUNT(*) OVER()`` alongside the
+    page rows, so a page costs a single query.
+    """
+
+    count_annotation = "_window_total_count"
+
+    def page(self, number):
+        query = self.object_list.query
+        # DISTINCT is applied after window functions, so the window total
+        # would count duplicates; use the regular COUNT in that case.
+        if "count" in self.__dict__ or query.distinct:
+            return super().page(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+
+        bottom = (number - 1) * self.per_page
+        rows = list(
+            self.object_list.annotate(
+                **{self.count_annotation: Window(expression=Count("pk"))}
+            )[bottom:bottom + self.per_page]
+        )
+
+        if rows:
+            self.__dict__["count"] = getattr(rows[0], self.count_annotation)
+        elif number == 1 and self.allow_empty_first_page:
+            self.__dict__["count"] = 0
+        else:
+            return super().page(number)
+
+        return self._get_page(rows, number, self)
@@ -0,0 +1,56 @@
+"""
+In-process cache for small, rarely written reference lists.
+
+A ReferenceList keeps the rows of a queryset in process memory together with
+the shared write version of the models it depends on (see cache_versions).
+Each read compares that version with the shared counter, a single cache
+lookup, and reloads the rows only after one of the models was written, so
+every worker sees a write on its next request without any cross-process
+invalidation.
+
+The cached instances are shared between requests and threads: treat them as
+read-only.
+"""
+import threading
+
+from utilities.cache_versions import get_models_version
+
+
+class ReferenceList:
+    """A queryset whose rows are cached per process until its models change"""
+
+    def __init__(self, queryset, depends_on=None):
+        self.queryset = queryset
+        self.depends_on = tuple(depends_on or (queryset.model,))
+        self._lock = threading.Lock()
+        self._version = None
+        self._rows = ()
+        self._by_pk = {}
+
+    def _load(self, version):
+        rows = tuple(self.queryset.all())
+        with self._lock:
+            self._rows = rows
+            self._by_pk = {row.pk: row for row in rows}
+            self._version = version
+
+    def all(self):
+        """Return the cached rows, reloading them after a write"""
+        version = get_models_version(self.depends_on)
+        if version != self._version:
+            self._load(version)
+        return self._rows
+
+    def get(self, pk):
+        """Return the cached row with this primary key, or None"""
+        self.all()
+        try:
+            return self._by_pk.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def __len__(self):
+        return len(self.all())
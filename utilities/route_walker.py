@@ -0,0 +1,70 @@
+"""
+Walk the named routes of an app and record what each GET request costs.
+
+Used by the query-count budget tests: every route is requested once to warm
+the caches and once under CaptureQueriesContext, and the second request's
+status and query count are recorded. Routes whose GET has side effects
+(deletes, logout, toggles) are skipped.
+"""
+import json
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver, reverse
+
+# GET on these routes writes or logs out, never walk them
+SKIPPED_ROUTE_PATTERNS = (r"-delete$", r"^logout$", r"^generic_toggle_field$", r"^generic_bulk_toggle$")
+
+
+def is_skipped(name):
+    return any(re.search(pattern, name) for pattern in SKIPPED_ROUTE_PATTERNS)
+
+
+def iter_named_routes(urlconf):
+    """Yield (name, argument names) for each named route of a urls module"""
+    for pattern in get_resolver(urlconf).url_patterns:
+        if isinstance(pattern, URLPattern) and pattern.name and not is_skipped(pattern.name):
+            yield pattern.name, tuple(pattern.pattern.converters)
+
+
+def fetch(client, url):
+    """GET a url, consuming streamed responses so their queries are counted"""
+    response = client.get(url)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def walk_routes(client, urlconf, namespace, route_kwargs):
+    """
+    Request every walkable route of ``urlconf`` with ``client``.
+
+    ``route_kwargs(name, arguments)`` returns the reverse() kwargs for a
+    route that takes arguments, or None to skip it. Returns
+    {name: {"url", "status", "queries"}}.
+    """
+    report = {}
+    for name, arguments in iter_named_routes(urlconf):
+        kwargs = route_kwargs(name, arguments) if arguments else {}
+        if kwargs is None:
+            continue
+        url = reverse(f"{namespace}:{name}", kwargs=kwargs)
+
+        fetch(client, url)
+        with CaptureQueriesContext(connection) as queries:
+            response = fetch(client, url)
+
+        report[name] = {
+            "url": url,
+            "status": response.status_code,
+            "queries": len(queries),
+        }
+    return report
+
+
+def write_report(path, report):
+    """Write a report as sorted, indented JSON so releases diff cleanly"""
+    with open(path, "w") as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+        report_file.write("\n")
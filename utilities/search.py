@@ -0,0 +1,148 @@
+import logging
+
+from django.contrib.postgres.search import SearchQuery, SearchVectorField
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Upper
+
+from utilities.filters import relation_q
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+
+def get_search_fields(model):
+    """Return the (vector_fields, trigram_fields) a model declares for search"""
+    vector_fields = tuple(getattr(model, "SEARCH_VECTOR_FIELDS", ()))
+    trigram_fields = tuple(getattr(model, "SEARCH_TRIGRAM_FIELDS", ()))
+    return vector_fields, trigram_fields
+
+
+def _tsquery_term(word):
+    """Quote a word as a prefix-matching tsquery lexeme"""
+    escaped = word.replace("\\", "\\\\").replace("'", "''")
+    return f"'{escaped}':*"
+
+
+def _contains_filter(model, words, fields):
+    """Every word must appear in at least one of the fields"""
+    condition = Q()
+    for word in words:
+        word_q = Q()
+        for field in fields:
+            word_q |= relation_q(model, f"{field}__icontains", word)
+        condition &= word_q
+    return condition
+
+
+def search_queryset(queryset, search_query, fields=None):
+    """
+    Filter a queryset by a free-text search.
+
+    ``fields`` are searched with icontains for models that declare no search
+    fields of their own.
+
+    On PostgreSQL models that declare SEARCH_VECTOR_FIELDS are matched against
+    their generated ``search_vector`` column (GIN indexed) with prefix terms,
+    and SEARCH_TRIGRAM_FIELDS add substring and fuzzy matches served by
+    trigram indexes. Elsewhere every word must be contained in one of the
+    fields, the same behaviour the list views always had.
+    """
+    words = search_query.split() if search_query else []
+    if not words:
+        return queryset
+
+    model = queryset.model
+    vector_fields, trigram_fields = get_search_fields(model)
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql" or not (vector_fields or trigram_fields):
+        fields = fields or (vector_fields + trigram_fields)
+        if not fields:
+            return queryset
+        return queryset.filter(_contains_filter(model, words, fields))
+
+    condition = Q()
+    if vector_fields:
+        column = f"{connection.ops.quote_name(model._meta.db_table)}.{SEARCH_VECTOR_COLUMN}"
+        queryset = queryset.alias(
+            _search_vector=RawSQL(column, [], output_field=SearchVectorField())
+        )
+        tsquery = " & ".join(_tsquery_term(word) for word in words)
+        condition |= Q(
+            _search_vector=SearchQuery(tsquery, config=SEARCH_CONFIG, search_type="raw")
+        )
+
+    if trigram_fields:
+        # icontains compiles to UPPER(column) LIKE ..., so the fuzzy match is
+        # made on UPPER(column) as well and both use the same trigram index.
+        queryset = queryset.alias(
+            **{f"_search_upper_{field}": Upper(field) for field in trigram_fields}
+        )
+        fuzzy = Q()
+        for word in words:
+            word_q = Q()
+            for field in trigram_fields:
+                word_q |= Q(**{f"{field}__icontains": word})
+                word_q |= Q(**{f"_search_upper_{field}__trigram_word_similar": word.upper()})
+            fuzzy &= word_q
+        condition |= fuzzy
+
+    return queryset.filter(condition)
+
+
+def search_index_statements(model):
+    """DDL that maintains the search column and indexes for a model"""
+    vector_fields, trigram_fields = get_search_fields(model)
+    table = model._meta.db_table
+    statements = []
+
+    if vector_fields:
+        columns = [model._meta.get_field(name).column for name in vector_fields]
+        document = " || ' ' || ".join(f'coalesce("{column}", \'\')' for column in columns)
+        statements += [
+            f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector '
+            f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}'::regconfig, {document})) STORED",
+            f'CREATE INDEX IF NOT EXISTS "{table}_search_vector_gin" '
+            f'ON "{table}" USING gin ({SEARCH_VECTOR_COLUMN})',
+        ]
+
+    for name in trigram_fields:
+        column = model._meta.get_field(name).column
+        # Indexed on UPPER(...) because that is what icontains compiles to
+        statements.append(
+            f'CREATE INDEX IF NOT EXISTS "{table}_{column}_trgm" '
+            f'ON "{table}" USING gin (UPPER("{column}") gin_trgm_ops)'
+        )
+
+    return statements
+
+
+def install_search_indexes(app_config, using="default", **kwargs):
+    """
+    post_migrate handler creating the search column and indexes on PostgreSQL.
+
+    The statements are idempotent. The generated column is only created once,
+    so after changing SEARCH_VECTOR_FIELDS drop ``search_vector`` and migrate
+    again to rebuild it.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+
+    models = [model for model in app_config.get_models() if any(get_search_fields(model))]
+    if not models:
+        return
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for model in models:
+                for statement in search_index_statements(model):
+                    cursor.execute(statement)
+    except DatabaseError as e:
+        logger.error(f"Could not install search indexes: {e}")
+        raise
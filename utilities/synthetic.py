@@ -0,0 +1,106 @@
+"""
+Vectorized synthetic data for the sample-data commands.
+
+Every generator draws a whole column at once with NumPy instead of calling
+Faker or ``random`` once per row, which keeps generation cheap well past a
+million rows. Text values come from vocabularies pooled once from Faker.
+The same seed always produces the same data, so benchmark datasets can be
+reproduced exactly.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from faker import Faker
+
+NAME_POOL_SIZE = 2000
+
+
+class SyntheticData:
+    """Seeded column generators"""
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.faker = Faker()
+        if seed is not None:
+            self.faker.seed_instance(seed)
+        self._pools = {}
+
+    def pool(self, provider, size=NAME_POOL_SIZE):
+        """Distinct values of a Faker provider, drawn once and reused"""
+        if provider not in self._pools:
+            generate = getattr(self.faker, provider)
+            values = list(dict.fromkeys(generate() for _ in range(size)))
+            self._pools[provider] = np.array(values, dtype=object)
+        return self._pools[provider]
+
+    def pick(self, values, size, weights=None):
+        """``size`` draws from ``values``, optionally weighted"""
+        probabilities = None
+        if weights is not None:
+            probabilities = np.asarray(weights, dtype=float)
+            probabilities /= probabilities.sum()
+        indexes = self.rng.choice(len(values), size=size, p=probabilities)
+        return np.asarray(values, dtype=object)[indexes]
+
+    def names(self, size):
+        """(first names, last names) drawn from pooled vocabularies"""
+        return self.pick(self.pool("first_name"), size), self.pick(self.pool("last_name"), size)
+
+    def booleans(self, size, true_fraction):
+        return self.rng.random(size) < true_fraction
+
+    def dates_between(self, size, start, end):
+        """Uniform dates in [start, end]"""
+        offsets = self.rng.integers(0, (end - start).days + 1, size=size)
+        return [start + timedelta(days=int(offset)) for offset in offsets]
+
+    def dates_of_birth(self, size, min_age, max_age, today=None):
+        today = today or date.today()
+        return self.dates_between(
+            size, today - timedelta(days=max_age * 365), today - timedelta(days=min_age * 365)
+        )
+
+    def phone_numbers(self, size):
+        digits = self.rng.integers(0, 10_000_000_000, size=size, dtype=np.int64)
+        return [
+            f"{number // 10_000_000:03d}-{number // 10_000 % 1000:03d}-{number % 10_000:04d}"
+            for number in digits
+        ]
+
+    def grades_and_scores(self, size, grade_score_map):
+        """
+        Grades drawn uniformly from ``grade_score_map`` with a score inside
+        each grade's (low, high) range, rounded to two places.
+        """
+        grades = list(grade_score_map)
+        bounds = np.array([grade_score_map[grade] for grade in grades], dtype=float)
+        indexes = self.rng.integers(0, len(grades), size=size)
+        low, high = bounds[indexes, 0], bounds[indexes, 1]
+        scores = np.round(low + self.rng.random(size) * (high - low), 2)
+        return np.array(grades, dtype=object)[indexes], scores
+
+    def unique_pairs(self, size, left, right):
+        """
+        Up to ``size`` distinct (left, right) pairs, e.g. (student, course).
+        Returns two aligned arrays.
+        """
+        left, right = np.asarray(left), np.asarray(right)
+        total = len(left) * len(right)
+        size = min(size, total)
+        codes = self.rng.choice(total, size=size, replace=False)
+        return left[codes // len(right)], right[codes % len(right)]
+
+    def subsets(self, size, pool_size, count_weights):
+        """
+        For each of ``size`` rows, a random subset of range(pool_size) whose
+        length is drawn with ``count_weights`` (index = subset length).
+        Returns (row indexes, pool indexes) of every selected pair.
+        """
+        probabilities = np.asarray(count_weights[: pool_size + 1], dtype=float)
+        probabilities /= probabilities.sum()
+        counts = self.rng.choice(len(probabilities), size=size, p=probabilities)
+        # A random permutation per row; its first `count` items are the subset
+        order = self.rng.random((size, pool_size)).argsort(axis=1)
+        rows, positions = np.nonzero(np.arange(pool_size) < counts[:, None])
+        return rows, order[rows, positions]
@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class ListQueryCountMixin:
+    """
+    For TestCase subclasses: list pages must cost the same number of queries
+    whatever their size. Subclasses create ``cls.user`` and enough rows for
+    the largest page size in setUpTestData.
+    """
+
+    page_sizes = (2, 20)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def count_queries(self, view, url, page_size):
+        with mock.patch.object(view, "paginate_by", page_size):
+            cache.clear()
+            # Warm the session, permission and reference caches first
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page_obj"]), page_size)
+        return len(queries)
+
+    def assertConstantQueries(self, view, url):
+        counts = [self.count_queries(view, url, size) for size in self.page_sizes]
+        self.assertEqual(len(set(counts)), 1, f"{url} query counts by page size: {counts}")